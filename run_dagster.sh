@@ -16,26 +16,14 @@ for var in SNOWFLAKE_ACCOUNT SNOWFLAKE_USER SNOWFLAKE_PASSWORD SNOWFLAKE_DATABAS
     echo "$var=${!var:0:2}...${!var: -2}"
 done
 
-# Go to the weather project directory and compile dbt
-echo "Compiling dbt project..."
-cd weather_project
-
-# Ensure target directory exists
-mkdir -p target
-
-# Generate the manifest
-dbt deps
-dbt compile
-
-# Verify manifest was created
-if [ ! -f "target/manifest.json" ]; then
-    echo "Error: Failed to generate manifest.json"
-    exit 1
+# Generate the dbt manifest from the project files if dbt has not compiled one.
+# This needs no warehouse connection; run `python scripts/generate_manifest.py --compile`
+# for a fully compiled manifest.
+if [ ! -f "weather_project/target/manifest.json" ]; then
+    echo "Generating dbt manifest..."
+    python scripts/generate_manifest.py || exit 1
 fi
 
-# Go back to the project root
-cd ..
-
 # Run dagster
 echo "Starting Dagster..."
 dagster dev
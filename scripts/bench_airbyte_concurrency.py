@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""Check that concurrent multi-connection syncs take about as long as the slowest sync.
+
+Runs `sync_connections` against a local fake Airbyte API with one job per
+connection, then compares the total wall-clock time with the longest single
+job and with the sum of all jobs.
+
+    python -m scripts.bench_airbyte_concurrency --connections 8 --max-in-flight 8
+"""
+import argparse
+import asyncio
+import logging
+import random
+import sys
+import time
+
+from scripts.fake_airbyte import FakeAirbyteServer
+from weather.airbyte_async import AirbyteMultiSyncConfig, AsyncAirbyteClient, sync_connections
+from weather.resources import AirbyteClientResource
+
+
+async def run_syncs(client, connection_ids, config, log):
+    finished = []
+    async for connection_id, job_info, _, error in sync_connections(client, connection_ids, config, log):
+        finished.append((connection_id, "error" if error else job_info["status"]))
+    return finished
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--connections", type=int, default=8)
+    parser.add_argument("--max-in-flight", type=int, default=8)
+    parser.add_argument("--min-duration", type=float, default=1.0)
+    parser.add_argument("--max-duration", type=float, default=3.0)
+    parser.add_argument("--tolerance", type=float, default=1.5,
+                        help="Fail if total time exceeds the longest job by more than this many seconds")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.WARNING)
+    log = logging.getLogger("bench_airbyte_concurrency")
+
+    rng = random.Random(0)
+    durations = {
+        f"connection-{i}": rng.uniform(args.min_duration, args.max_duration)
+        for i in range(args.connections)
+    }
+    config = AirbyteMultiSyncConfig(
+        max_in_flight=args.max_in_flight,
+        first_poll_seconds=0.1,
+        max_poll_interval_seconds=0.5,
+        timeout_seconds=60,
+    )
+
+    with FakeAirbyteServer(job_durations=durations) as server:
+        client = AsyncAirbyteClient(AirbyteClientResource(host=server.url, pool_maxsize=args.max_in_flight), args.max_in_flight)
+        start = time.perf_counter()
+        try:
+            finished = asyncio.run(run_syncs(client, list(durations), config, log))
+        finally:
+            client.close()
+        total = time.perf_counter() - start
+
+    longest = max(durations.values())
+    serial = sum(durations.values())
+    print(f"connections:      {len(finished)} ({sum(status == 'succeeded' for _, status in finished)} succeeded)")
+    print(f"total wall clock: {total:.2f}s")
+    print(f"longest job:      {longest:.2f}s")
+    print(f"sum of jobs:      {serial:.2f}s")
+    print(f"requests:         {server.request_counts}")
+    print(f"token requests:   {server.token_requests}, TCP connections: {server.connections_opened}")
+
+    # With enough slots every job runs at once, so only the slowest one should count
+    if args.max_in_flight >= args.connections and total > longest + args.tolerance:
+        print("FAIL: total time is not close to the longest single sync", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
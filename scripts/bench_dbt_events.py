@@ -0,0 +1,147 @@
+#!/usr/bin/env python3
+"""Stream a synthetic dbt log through dagster-dbt's `stream()` and through `stream_dbt_events`.
+
+A child process prints `--events` dbt JSON log lines: for every node run a
+start line, debug lines (SQL, timings, ...) and a result line, with a
+warning now and then, cycling through `--models` models so that the
+project size and the number of events can be varied separately. Both consumers read it as the stdout of a dbt
+invocation. The script reports wall time, peak Python memory (tracemalloc),
+bytes written to stdout, the number of run log messages, and the Dagster
+events yielded.
+
+    python -m scripts.bench_dbt_events --events 100000
+"""
+import argparse
+import copy
+import io
+import logging
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from contextlib import redirect_stdout
+from pathlib import Path
+
+from dagster_dbt import DagsterDbtTranslator, DbtCliInvocation
+from packaging import version
+
+from weather.dbt_events import stream_dbt_events
+from weather.manifest_generator import generate_manifest
+
+LINES_PER_MODEL = 10
+
+EMITTER = '''
+import json, sys
+runs, models, lines_per_model = int(sys.argv[1]), int(sys.argv[2]), int(sys.argv[3])
+write = sys.stdout.write
+def event(name, level, msg, node_info=None, **data):
+    if node_info:
+        data["node_info"] = node_info
+    write(json.dumps({"info": {"name": name, "level": level, "msg": msg, "ts": "2026-01-01T00:00:00Z", "invocation_id": "bench"}, "data": data}) + "\\n")
+for run in range(runs):
+    i = run % models
+    node = {"unique_id": f"model.weather_project.bench_{i}", "node_status": "started", "materialized": "table",
+            "node_started_at": "2026-01-01T00:00:00", "node_finished_at": ""}
+    event("LogStartLine", "info", f"{run + 1} of {runs} START sql table model bench_{i}", node)
+    for j in range(lines_per_model - 2):
+        event("SQLQuery", "debug", f"On model.weather_project.bench_{i}: select {j} /* synthetic */", node)
+    if run % 1000 == 999:
+        event("Note", "warn", f"bench_{i} has a deprecated config")
+    done = dict(node, node_status="success", node_finished_at="2026-01-01T00:00:01")
+    event("LogModelResult", "info", f"{run + 1} of {runs} OK created sql table model bench_{i} [OK in 1.00s]",
+          done, status="success", execution_time=1.0)
+'''
+
+
+class CountingLog(logging.Logger):
+    def __init__(self):
+        super().__init__("bench")
+        self.messages = 0
+
+    def _log(self, *args, **kwargs):
+        self.messages += 1
+
+
+class CountingStdout(io.TextIOBase):
+    def __init__(self):
+        self.bytes = 0
+
+    def write(self, text):
+        self.bytes += len(text)
+        return len(text)
+
+
+def synthetic_manifest(models: int):
+    manifest = generate_manifest()
+    template = manifest["nodes"]["model.weather_project.weather_trends"]
+    nodes = {}
+    for i in range(models):
+        node = copy.deepcopy(template)
+        node.update(
+            name=f"bench_{i}",
+            unique_id=f"model.weather_project.bench_{i}",
+            fqn=["weather_project", f"bench_{i}"],
+            depends_on={"nodes": [], "macros": []},
+            refs=[],
+        )
+        nodes[node["unique_id"]] = node
+    return {**manifest, "nodes": nodes, "parent_map": {}, "child_map": {}}
+
+
+def invocation(manifest, runs: int, models: int, target_path: Path) -> DbtCliInvocation:
+    process = subprocess.Popen(
+        [sys.executable, "-c", EMITTER, str(runs), str(models), str(LINES_PER_MODEL)],
+        stdout=subprocess.PIPE,
+    )
+    return DbtCliInvocation(
+        process=process,
+        manifest=manifest,
+        dagster_dbt_translator=DagsterDbtTranslator(),
+        project_dir=target_path,
+        target_path=target_path,
+        raise_on_error=True,
+        cli_version=version.Version("1.9.0"),
+    )
+
+
+def measure(consume):
+    stdout, log = CountingStdout(), CountingLog()
+    tracemalloc.start()
+    start = time.perf_counter()
+    with redirect_stdout(stdout):
+        events = sum(1 for _ in consume(log))
+    seconds = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {"seconds": seconds, "peak_mb": peak / 2**20, "stdout_mb": stdout.bytes / 2**20, "log_messages": log.messages, "events": events}
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--events", type=int, default=100_000, help="dbt log lines to stream")
+    parser.add_argument("--models", type=int, default=100, help="Distinct models in the project")
+    parser.add_argument("--verbosity", default="info")
+    args = parser.parse_args()
+
+    runs = max(1, args.events // LINES_PER_MODEL)
+    manifest = synthetic_manifest(args.models)
+    with tempfile.TemporaryDirectory() as tmp:
+        target_path = Path(tmp)
+        results = {
+            "dagster-dbt stream()": measure(lambda log: invocation(manifest, runs, args.models, target_path).stream()),
+            f"stream_dbt_events ({args.verbosity})": measure(
+                lambda log: stream_dbt_events(invocation(manifest, runs, args.models, target_path), log, verbosity=args.verbosity)
+            ),
+        }
+
+    print(f"{runs * LINES_PER_MODEL + runs // 1000} dbt log lines, {runs} node results over {args.models} models")
+    print(f"{'':>28} {'seconds':>8} {'peak MB':>8} {'stdout MB':>10} {'log msgs':>9} {'events':>7}")
+    for label, result in results.items():
+        print(f"{label:>28} {result['seconds']:8.2f} {result['peak_mb']:8.1f} {result['stdout_mb']:10.1f} "
+              f"{result['log_messages']:9d} {result['events']:7d}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
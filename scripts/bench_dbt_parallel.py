@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+"""Compare a serial dbt build with one concurrent invocation per independent subgraph.
+
+Builds a throwaway dbt-duckdb project with the same models and refs as
+weather_project. Each model is a Python model that sleeps for --model-seconds,
+standing in for a warehouse query. The project is then built three ways:
+  - serial: one invocation, 1 thread (the current profile)
+  - threaded: one invocation, threads = graph width
+  - subgraphs: one concurrent invocation per independent subgraph, as
+    `weather_project_dbt_assets` runs them
+Each invocation writes to its own DuckDB file, like separate warehouse sessions.
+
+    python -m scripts.bench_dbt_parallel --model-seconds 2
+"""
+import argparse
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from weather.dbt_selection import graph_width, plan_subgraph_runs
+from weather.manifest_generator import generate_manifest
+
+MODEL_TEMPLATE = '''import time
+
+
+def model(dbt, session):
+    dbt.config(materialized="table")
+{refs}    time.sleep({seconds})
+    return session.sql("select 1 as n")
+'''
+
+PROFILE = """bench:
+  target: dev
+  outputs:
+    dev:
+      type: duckdb
+      path: "{{ env_var('BENCH_DUCKDB_PATH') }}"
+"""
+
+
+def write_project(project_dir: Path, manifest, model_ids, seconds: float) -> None:
+    (project_dir / "models").mkdir(parents=True)
+    (project_dir / "dbt_project.yml").write_text("name: bench\nversion: '1.0'\nconfig-version: 2\nprofile: bench\n")
+    (project_dir / "profiles.yml").write_text(PROFILE)
+    for unique_id in model_ids:
+        node = manifest["nodes"][unique_id]
+        # dbt only parses literal arguments to dbt.ref() in Python models
+        refs = "".join(
+            f'    dbt.ref("{manifest["nodes"][parent]["name"]}")\n'
+            for parent in node["depends_on"]["nodes"] if parent in model_ids
+        )
+        (project_dir / "models" / f"{node['name']}.py").write_text(MODEL_TEMPLATE.format(refs=refs, seconds=seconds))
+
+
+def start_build(project_dir: Path, run_dir: Path, name: str, args):
+    env = {
+        **os.environ,
+        "BENCH_DUCKDB_PATH": str(run_dir / f"{name}.duckdb"),
+        "DBT_TARGET_PATH": str(run_dir / f"target_{name}"),
+        "DBT_LOG_PATH": str(run_dir / f"target_{name}"),
+        "DBT_SEND_ANONYMOUS_USAGE_STATS": "false",
+    }
+    return subprocess.Popen(
+        ["dbt", "build", "--project-dir", str(project_dir), "--profiles-dir", str(project_dir), *args],
+        env=env, stdout=subprocess.DEVNULL, stderr=subprocess.STDOUT,
+    )
+
+
+def timed(processes) -> float:
+    start = time.perf_counter()
+    codes = [process.wait() for process in processes]
+    if any(codes):
+        raise SystemExit(f"dbt build failed with exit codes {codes}")
+    return time.perf_counter() - start
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--model-seconds", type=float, default=2.0, help="Time each model takes")
+    parser.add_argument("--max-threads", type=int, default=8)
+    args = parser.parse_args()
+
+    manifest = generate_manifest()
+    model_ids = [unique_id for unique_id, node in manifest["nodes"].items() if node["resource_type"] == "model"]
+    runs = plan_subgraph_runs(manifest, model_ids, args.max_threads)
+    width = min(args.max_threads, graph_width(manifest, model_ids))
+    names = {unique_id: manifest["nodes"][unique_id]["name"] for unique_id in model_ids}
+
+    with tempfile.TemporaryDirectory() as tmp:
+        project_dir = Path(tmp) / "project"
+        write_project(project_dir, manifest, model_ids, args.model_seconds)
+
+        results = {}
+        for label in ("serial", "threaded", "subgraphs"):
+            run_dir = Path(tmp) / label
+            run_dir.mkdir()
+            if label == "serial":
+                processes = [start_build(project_dir, run_dir, "all", ["--threads", "1"])]
+            elif label == "threaded":
+                processes = [start_build(project_dir, run_dir, "all", ["--threads", str(width)])]
+            else:
+                processes = []
+                for index, (models, threads) in enumerate(runs):
+                    others = sorted(names[unique_id] for unique_id in model_ids if unique_id not in models)
+                    exclude = ["--exclude", " ".join(others)] if others else []
+                    processes.append(start_build(project_dir, run_dir, f"group{index}", [*exclude, "--threads", str(threads)]))
+            results[label] = timed(processes)
+
+    print(f"models: {len(model_ids)}, {args.model_seconds:.1f}s each, graph width {width}")
+    for models, threads in runs:
+        print(f"  subgraph of {len(models)} models, {threads} threads: {', '.join(sorted(names[m] for m in models))}")
+    for label, seconds in results.items():
+        print(f"{label:>10}: {seconds:6.2f}s  ({results['serial'] / seconds:.1f}x)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
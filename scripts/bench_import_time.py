@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+"""Measure how long a fresh interpreter takes to import `weather.definitions`.
+
+This is what a code-location (re)load pays. Each run imports the module in a
+new process. The first run starts from an empty manifest cache and the
+others reuse it.
+
+    python -m scripts.bench_import_time --runs 5 --top 15
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).parent.parent
+
+IMPORT_SNIPPET = """
+import json, time
+start = time.perf_counter()
+import {module}
+print(json.dumps({{"seconds": time.perf_counter() - start}}))
+"""
+
+
+def time_import(module: str, env: dict, importtime: bool = False):
+    command = [sys.executable]
+    if importtime:
+        command += ["-X", "importtime"]
+    command += ["-c", IMPORT_SNIPPET.format(module=module)]
+    result = subprocess.run(command, cwd=PROJECT_ROOT, env=env, capture_output=True, text=True, check=True)
+    seconds = json.loads(result.stdout.strip().splitlines()[-1])["seconds"]
+    return seconds, result.stderr
+
+
+def slowest_imports(importtime_output: str, top: int):
+    """(self microseconds, cumulative microseconds, module) of the slowest imports, by self time."""
+    rows = []
+    for line in importtime_output.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, module = line[len("import time:"):].split("|")
+        rows.append((int(self_us), int(cumulative_us), module.rstrip()))
+    return sorted(rows, reverse=True)[:top]
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--module", default="weather.definitions")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--top", type=int, default=0, help="Also list the N slowest modules (python -X importtime)")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as state_dir:
+        env = {**os.environ, "WEATHER_STATE_DIR": state_dir, "PYTHONPATH": str(PROJECT_ROOT)}
+        cold, _ = time_import(args.module, env)
+        warm = [time_import(args.module, env)[0] for _ in range(args.runs)]
+        importtime_output = time_import(args.module, env, importtime=True)[1] if args.top else ""
+
+    print(f"import {args.module}")
+    print(f"  cold manifest cache: {cold:.3f}s")
+    print(f"  warm, median of {len(warm)}:  {statistics.median(warm):.3f}s (min {min(warm):.3f}s)")
+    if args.top:
+        print(f"\nslowest modules (self / cumulative):")
+        for self_us, cumulative_us, module in slowest_imports(importtime_output, args.top):
+            print(f"  {self_us / 1000:8.1f}ms {cumulative_us / 1000:8.1f}ms {module}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,169 @@
+#!/usr/bin/env python3
+"""Time each stage of `combined_weather_job` and compare the timings with a stored baseline.
+
+Stages:
+  - import: a fresh interpreter importing `weather.definitions`, median of --import-runs
+  - airbyte_sync: the `airbyte_sync_asset` step against the local fake Airbyte API,
+    with jobs taking --job-seconds and optional failure injection
+  - dbt_build: the `weather_project_dbt_assets` step on the offline duckdb target
+  - job: the whole in-process run of the job
+The job runs --runs times, each from an empty state directory and DuckDB
+database, so every run does the same work; a stage's time is the median.
+
+The timings are written as JSON to --output. With a baseline file (by
+default the one --save-baseline wrote), a stage is slower when its median
+exceeds the baseline's by more than --threshold (a fraction, overridden per
+stage by the baseline's "thresholds") plus --min-seconds; the script then
+exits with 1.
+
+    python -m scripts.bench_pipeline --runs 3 --save-baseline
+    python -m scripts.bench_pipeline --runs 3
+"""
+import argparse
+import json
+import os
+import platform
+import statistics
+import shutil
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from scripts.bench_import_time import PROJECT_ROOT, time_import
+from scripts.fake_airbyte import FakeAirbyteServer
+
+DEFAULT_BASELINE = Path(os.environ.get("WEATHER_STATE_DIR", PROJECT_ROOT / ".weather_state")) / "benchmarks" / "pipeline_baseline.json"
+STAGE_STEPS = {
+    "airbyte__airbyte_sync_asset": "airbyte_sync",
+    "weather_project_dbt_assets": "dbt_build",
+}
+
+
+def run_job(server_url: str, job_seconds: float, dbt_backend: str):
+    """Step durations of one in-process run of `combined_weather_job`, and whether it succeeded."""
+    # Imported here, after main() pointed the state directory and the dbt target at the scratch ones
+    from dagster import DagsterEventType
+
+    from weather.definitions import dbt_resource, defs
+    from weather.resources import AirbyteClientResource
+
+    run_config = {
+        "ops": {
+            "airbyte__airbyte_sync_asset": {"config": {"force": True, "first_poll_seconds": min(1.0, job_seconds)}},
+            "weather_project_dbt_assets": {"config": {"backend": dbt_backend}},
+        },
+        "loggers": {"console": {"config": {"log_level": "ERROR"}}},
+    }
+    start = time.perf_counter()
+    result = defs.resolve_job_def("combined_weather_job").execute_in_process(
+        run_config=run_config,
+        resources={"airbyte": AirbyteClientResource(host=server_url), "dbt": dbt_resource},
+        raise_on_error=False,
+    )
+    seconds = {"job": time.perf_counter() - start}
+    for event in result.all_events:
+        # Failure events carry no duration; the run is counted in failed_runs instead
+        if event.event_type == DagsterEventType.STEP_SUCCESS and event.step_key in STAGE_STEPS:
+            seconds[STAGE_STEPS[event.step_key]] = event.event_specific_data.duration_ms / 1000
+    return seconds, result.success
+
+
+def summarize(samples):
+    return {"median": statistics.median(samples), "min": min(samples), "max": max(samples), "samples": samples}
+
+
+def compare(results, baseline, threshold: float, min_seconds: float):
+    """(stage, baseline, current, limit, slower) for the stages timed in both."""
+    thresholds = baseline.get("thresholds", {})
+    rows = []
+    for stage, timing in results["stages"].items():
+        if stage not in baseline.get("stages", {}):
+            continue
+        base = baseline["stages"][stage]["median"]
+        limit = base * (1 + thresholds.get(stage, threshold)) + min_seconds
+        rows.append((stage, base, timing["median"], limit, timing["median"] > limit))
+    return rows
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=3, help="Runs of the job")
+    parser.add_argument("--import-runs", type=int, default=5)
+    parser.add_argument("--job-seconds", type=float, default=2.0, help="Time each fake Airbyte job takes")
+    parser.add_argument("--job-failure-rate", type=float, default=0.0)
+    parser.add_argument("--request-error-rate", type=float, default=0.0)
+    parser.add_argument("--dbt-backend", default="cli")
+    parser.add_argument("--output", default="bench_pipeline.json", help="Where to write the timings")
+    parser.add_argument("--baseline", type=Path, default=DEFAULT_BASELINE)
+    parser.add_argument("--save-baseline", action="store_true", help="Write the timings to --baseline instead of comparing")
+    parser.add_argument("--threshold", type=float, default=0.25, help="Allowed slowdown over the baseline, as a fraction")
+    parser.add_argument("--min-seconds", type=float, default=0.5, help="Allowed slowdown over the baseline, in seconds")
+    args = parser.parse_args()
+
+    scratch = Path(tempfile.mkdtemp(prefix="bench_pipeline_"))
+    state_dir = scratch / "state"
+    env = {**os.environ, "WEATHER_STATE_DIR": str(state_dir), "PYTHONPATH": str(PROJECT_ROOT)}
+    try:
+        time_import("weather.definitions", env)
+        imports = [time_import("weather.definitions", env)[0] for _ in range(args.import_runs)]
+
+        os.environ.update(
+            WEATHER_STATE_DIR=str(state_dir),
+            WEATHER_DUCKDB_PATH=str(scratch / "weather.duckdb"),
+            DBT_TARGET="duckdb",
+        )
+        stages = {"import": imports}
+        failed_runs = 0
+        with FakeAirbyteServer(
+            default_duration=args.job_seconds,
+            job_failure_rate=args.job_failure_rate,
+            request_error_rate=args.request_error_rate,
+            seed=0,
+        ) as server:
+            for _ in range(args.runs):
+                shutil.rmtree(state_dir, ignore_errors=True)
+                for path in scratch.glob("weather.duckdb*"):
+                    path.unlink()
+                seconds, success = run_job(server.url, args.job_seconds, args.dbt_backend)
+                failed_runs += not success
+                for stage, value in seconds.items():
+                    stages.setdefault(stage, []).append(value)
+    finally:
+        shutil.rmtree(scratch, ignore_errors=True)
+
+    results = {
+        "created_at": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+        "machine": {"python": platform.python_version(), "platform": platform.platform(), "cpus": os.cpu_count()},
+        "parameters": {key: value for key, value in vars(args).items() if key not in ("output", "baseline", "save_baseline")},
+        "failed_runs": failed_runs,
+        "stages": {stage: summarize(samples) for stage, samples in stages.items()},
+    }
+    Path(args.output).write_text(json.dumps(results, indent=2))
+
+    print(f"{args.runs} runs of combined_weather_job ({failed_runs} failed), timings in {args.output}")
+    for stage, timing in results["stages"].items():
+        print(f"  {stage:>12}: {timing['median']:7.2f}s  (min {timing['min']:.2f}s, max {timing['max']:.2f}s)")
+
+    if args.save_baseline:
+        args.baseline.parent.mkdir(parents=True, exist_ok=True)
+        args.baseline.write_text(json.dumps(results, indent=2))
+        print(f"Saved as the baseline in {args.baseline}")
+        return 0
+    if not args.baseline.exists():
+        print(f"No baseline at {args.baseline}, run with --save-baseline to create one")
+        return 0
+
+    rows = compare(results, json.loads(args.baseline.read_text()), args.threshold, args.min_seconds)
+    print(f"\ncompared with {args.baseline}:")
+    for stage, base, current, limit, slower in rows:
+        change = (current - base) / base * 100 if base else 0.0
+        print(f"  {stage:>12}: {base:7.2f}s -> {current:7.2f}s ({change:+.0f}%, limit {limit:.2f}s){'  SLOWER' if slower else ''}")
+    if any(slower for *_, slower in rows):
+        print("FAIL: some stages are slower than the baseline allows", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""Measure how the cost of a daily dbt run grows with the raw history.
+
+For each --history-days, a DuckDB database gets that many days of synthetic
+raw PALMA rows (scripts/generate_raw_weather.py) and a first `dbt run` on the
+offline duckdb target. One more day of rows is then appended and `dbt run`
+is timed again, as the daily build after a sync. The script reports the
+time dbt spent in the models of each run, summed from run_results.json, for
+the staging layer and for all models, and the daily run's time of each
+--models model.
+
+Run it before and after a change to the models to compare them:
+
+    python -m scripts.bench_staging_history --history-days 30 365 1095 --stations 10
+"""
+import argparse
+import datetime
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import duckdb
+
+from scripts.generate_raw_weather import generate, raw_rows_query
+from weather.constants import DAILY_PARTITIONS_START_DATE, DBT_PROJECT_DIR
+
+RAW_TABLE = "palma_synthetic"
+
+
+def dbt_run(database: Path, target_path: Path):
+    """Wall time of `dbt run`, and the seconds its models took, per model name."""
+    env = {**os.environ, "WEATHER_DUCKDB_PATH": str(database), "DBT_SEND_ANONYMOUS_USAGE_STATS": "false"}
+    start = time.perf_counter()
+    subprocess.run(
+        ["dbt", "run", "--target", "duckdb", "--project-dir", DBT_PROJECT_DIR, "--profiles-dir", DBT_PROJECT_DIR,
+         "--target-path", str(target_path), "--log-path", str(target_path), "--vars", json.dumps({"raw_palma_table": RAW_TABLE})],
+        env=env, stdout=subprocess.DEVNULL, stderr=subprocess.STDOUT, check=True,
+    )
+    wall = time.perf_counter() - start
+    results = json.loads((target_path / "run_results.json").read_text())["results"]
+    return wall, {result["unique_id"].split(".")[-1]: result["execution_time"] for result in results}
+
+
+def measure(history_days: int, stations: int, tmp: Path):
+    database = tmp / f"history_{history_days}.duckdb"
+    start_date = datetime.date.fromisoformat(DAILY_PARTITIONS_START_DATE)
+    rows = generate(raw_rows_query(start_date, history_days, stations), "duckdb", str(database), RAW_TABLE)
+    first = dbt_run(database, tmp / f"target_{history_days}_first")
+
+    next_day = raw_rows_query(start_date + datetime.timedelta(days=history_days), 1, stations)
+    with duckdb.connect(str(database)) as connection:
+        connection.execute(f"INSERT INTO {RAW_TABLE} {next_day}")
+    daily = dbt_run(database, tmp / f"target_{history_days}_daily")
+    return rows, first, daily
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--history-days", type=int, nargs="+", default=[30, 365, 1095])
+    parser.add_argument("--stations", type=int, default=10)
+    parser.add_argument("--models", nargs="*", default=[], help="Models whose daily run time to show on their own")
+    args = parser.parse_args()
+
+    print(f"{'days':>6} {'raw rows':>9} | {'first run: staging':>18} {'all models':>10} | {'daily run: staging':>18} {'all models':>10} {'wall':>7}"
+          + "".join(f" | {model:>{max(len(model), 7)}}" for model in args.models))
+    with tempfile.TemporaryDirectory() as tmp:
+        for history_days in args.history_days:
+            rows, (_, first), (daily_wall, daily) = measure(history_days, args.stations, Path(tmp))
+            staging = lambda timings: sum(seconds for name, seconds in timings.items() if name.startswith("stg_"))
+            print(f"{history_days:>6} {rows:>9} | {staging(first):>17.2f}s {sum(first.values()):>9.2f}s | "
+                  f"{staging(daily):>17.2f}s {sum(daily.values()):>9.2f}s {daily_wall:>6.1f}s"
+                  + "".join(f" | {daily.get(model, 0.0):>{max(len(model), 7) - 1}.2f}s" for model in args.models))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
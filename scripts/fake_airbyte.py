@@ -0,0 +1,168 @@
+#!/usr/bin/env python3
+"""Local fake of the Airbyte v1 API, for exercising the sync assets without a real server.
+
+Sync jobs finish after a configurable duration. Failures can be injected
+either as failed jobs or as HTTP 500 responses to individual requests.
+"""
+import argparse
+import itertools
+import json
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Optional
+
+
+class FakeAirbyteServer:
+    """In-process fake Airbyte server; use as a context manager and point the client at `url`."""
+
+    def __init__(
+        self,
+        job_durations: Optional[Dict[str, float]] = None,
+        default_duration: float = 1.0,
+        job_failure_rate: float = 0.0,
+        request_error_rate: float = 0.0,
+        records_per_job: int = 24,
+        seed: Optional[int] = None,
+        port: int = 0,
+    ):
+        self.job_durations = job_durations or {}
+        self.default_duration = default_duration
+        self.job_failure_rate = job_failure_rate
+        self.request_error_rate = request_error_rate
+        self.records_per_job = records_per_job
+        self.random = random.Random(seed)
+        self.jobs = {}
+        self.request_counts: Dict[str, int] = {}
+        self.token_requests = 0
+        self.connections_opened = 0
+        self._ids = itertools.count(1)
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer(("127.0.0.1", port), self._handler())
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+
+    @property
+    def url(self) -> str:
+        return f"http://127.0.0.1:{self._server.server_port}"
+
+    def __enter__(self) -> "FakeAirbyteServer":
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+    def _job_view(self, job):
+        now = time.time()
+        if job["status"] == "running" and now >= job["finishes_at"]:
+            job["status"] = "failed" if job["will_fail"] else "succeeded"
+            job["updatedAt"] = int(job["finishes_at"])
+        view = {key: job[key] for key in ("id", "configId", "status", "createdAt", "updatedAt")}
+        stream_stats = []
+        if job["status"] == "succeeded":
+            stream_stats = [{"streamName": "PALMA", "stats": {"recordsEmitted": self.records_per_job}}]
+        return {"job": view, "attempts": [{"attempt": {"status": job["status"], "streamStats": stream_stats}}]}
+
+    def _handle(self, endpoint: str, body: dict):
+        with self._lock:
+            self.request_counts[endpoint] = self.request_counts.get(endpoint, 0) + 1
+            if endpoint == "applications/token":
+                self.token_requests += 1
+                return {"access_token": "fake-token", "token_type": "Bearer", "expires_in": 180}
+            if endpoint == "connections/sync":
+                connection_id = body["connectionId"]
+                now = time.time()
+                job = {
+                    "id": next(self._ids),
+                    "configId": connection_id,
+                    "status": "running",
+                    "createdAt": int(now),
+                    "updatedAt": int(now),
+                    "finishes_at": now + self.job_durations.get(connection_id, self.default_duration),
+                    "will_fail": self.random.random() < self.job_failure_rate,
+                }
+                self.jobs[job["id"]] = job
+                return self._job_view(job)
+            if endpoint == "jobs/get":
+                return self._job_view(self.jobs[body["id"]])
+            if endpoint == "jobs/cancel":
+                job = self.jobs[body["id"]]
+                job["status"] = "cancelled"
+                job["updatedAt"] = int(time.time())
+                return self._job_view(job)
+            if endpoint == "jobs/list":
+                jobs = [job for job in self.jobs.values() if job["configId"] == body.get("configId")]
+                jobs.sort(key=lambda job: job["id"], reverse=True)
+                page_size = body.get("pagination", {}).get("pageSize", 10)
+                return {"jobs": [self._job_view(job) for job in jobs[:page_size]]}
+            if endpoint == "workspaces/list":
+                return {"workspaces": [{"workspaceId": "fake-workspace", "name": "Fake workspace"}]}
+            if endpoint == "connections/list":
+                connection_ids = sorted(set(self.job_durations) | {job["configId"] for job in self.jobs.values()})
+                return {"connections": [{"connectionId": cid, "name": cid} for cid in connection_ids]}
+        return None
+
+    def _handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def log_message(self, *args):
+                pass
+
+            def setup(self):
+                super().setup()
+                with server._lock:
+                    server.connections_opened += 1
+
+            def _send(self, status: int, payload: dict):
+                body = json.dumps(payload).encode()
+                self.send_response(status)
+                self.send_header("content-type", "application/json")
+                self.send_header("content-length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def do_POST(self):
+                length = int(self.headers.get("content-length", 0))
+                body = json.loads(self.rfile.read(length) or b"{}")
+                endpoint = self.path.split("/api/v1/", 1)[-1]
+                if endpoint != "applications/token" and server.random.random() < server.request_error_rate:
+                    self._send(500, {"message": "injected failure"})
+                    return
+                payload = server._handle(endpoint, body)
+                if payload is None:
+                    self._send(404, {"message": f"unknown endpoint {endpoint}"})
+                else:
+                    self._send(200, payload)
+
+        return Handler
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--port", type=int, default=8001)
+    parser.add_argument("--duration", type=float, default=5.0, help="Seconds each sync job takes")
+    parser.add_argument("--job-failure-rate", type=float, default=0.0)
+    parser.add_argument("--request-error-rate", type=float, default=0.0)
+    args = parser.parse_args()
+
+    with FakeAirbyteServer(
+        default_duration=args.duration,
+        job_failure_rate=args.job_failure_rate,
+        request_error_rate=args.request_error_rate,
+        port=args.port,
+    ) as server:
+        print(f"Fake Airbyte API listening on {server.url} (set AIRBYTE_HOST to use it)")
+        try:
+            while True:
+                time.sleep(3600)
+        except KeyboardInterrupt:
+            pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,172 @@
+#!/usr/bin/env python3
+"""Generate synthetic Airbyte rows of the raw `PALMA` source, for scale-testing the dbt models.
+
+Each row is one extraction of one station, as Airbyte loads it: FECHA,
+TEMPERATURA_ACTUAL, HUMEDAD, VIENTO, the STATESKY object, the 7-day
+PROXIMOS_DIAS array, the PRONOSTICO hourly arrays for today and tomorrow, and
+_AIRBYTE_EXTRACTED_AT. Temperatures follow Palma's seasons and the time of
+day, with an offset per station and noise. Every value is derived from hashes
+of the station and time, so the same arguments give the same rows. Stations
+sync a few seconds apart, so no two rows share an extraction time.
+
+DuckDB generates the rows in one query, a few hundred thousand a minute, and
+writes them to a Parquet file or into a table of a DuckDB database, such as
+the one of the offline dbt target:
+
+    python -m scripts.generate_raw_weather --days 365 --stations 10 --format duckdb --output weather_project/weather.duckdb
+    cd weather_project && dbt build --target duckdb --vars '{"raw_palma_table": "palma_synthetic"}'
+"""
+import argparse
+import datetime
+import sys
+import time
+from pathlib import Path
+
+import duckdb
+
+from weather.constants import DAILY_PARTITIONS_START_DATE
+
+FORMATS = ("parquet", "duckdb")
+DEFAULT_OUTPUTS = {"parquet": "palma.parquet", "duckdb": "weather_project/weather.duckdb"}
+SKIES = ["Despejado", "Poco nuboso", "Intervalos nubosos", "Nuboso", "Muy nuboso", "Cubierto", "Nubes altas", "Lluvia escasa"]
+WIND_DIRECTIONS = ["N", "NE", "E", "SE", "S", "SO", "O", "NO"]
+FORECAST_DAYS = 7
+# Days with hourly forecasts in PRONOSTICO, as AEMET names them
+HOURLY_DAYS = ("hoy", "manana")
+
+
+def _sql_list(values) -> str:
+    return "[" + ", ".join(f"'{value}'" for value in values) + "]"
+
+
+def _noise(*keys: str) -> str:
+    """A value in [0, 1) that only depends on the station, the extraction and `keys`."""
+    return f"((hash(station, extraction, {', '.join(keys)}) % 10000) / 10000.0)"
+
+
+def _season(day: str) -> str:
+    """Mean temperature of a day of the year in Palma: about 10°C in January, 24°C in August."""
+    return f"(17 + 7 * sin(2 * pi() * (dayofyear({day}) - 110) / 365.0))"
+
+
+def _diurnal(hour: str) -> str:
+    return f"(4 * cos(2 * pi() * ({hour} - 15) / 24.0))"
+
+
+def raw_rows_query(
+    start_date: datetime.date,
+    days: int,
+    stations: int = 1,
+    extractions_per_day: int = 2,
+    station_column: bool = False,
+) -> str:
+    """SQL selecting the synthetic raw rows, `days * extractions_per_day * stations` of them."""
+    if days < 1 or stations < 1 or not 1 <= extractions_per_day <= 24:
+        raise ValueError("days and stations must be positive, extractions_per_day between 1 and 24")
+    skies, directions = _sql_list(SKIES), _sql_list(WIND_DIRECTIONS)
+    offset = "((hash(station) % 40) / 10.0 - 2)"
+    sky_noise = _noise("'sky'")
+    sky = f"{skies}[1 + CAST(floor({sky_noise} * {len(SKIES)}) AS INTEGER)]"
+    forecast_day = f"""json_object(
+            '@attributes', json_object('fecha', strftime(day + CAST(d AS INTEGER), '%Y-%m-%d')),
+            'prob_precipitacion', [CASE WHEN d < 5 THEN CAST(CAST(floor({_noise('d', "'rain'")} * 20) * 5 AS INTEGER) AS VARCHAR) END],
+            'estado_cielo_descripcion', [CASE WHEN d < 6 THEN {skies}[1 + CAST(floor({_noise('d', "'sky'")} * {len(SKIES)}) AS INTEGER)] END],
+            'temperatura', json_object(
+                'maxima', CAST(CAST(round({_season('day + CAST(d AS INTEGER)')} + {offset} + 4 + 3 * {_noise('d', "'max'")}) AS INTEGER) AS VARCHAR),
+                'minima', CAST(CAST(round({_season('day + CAST(d AS INTEGER)')} + {offset} - 5 + 2 * {_noise('d', "'min'")}) AS INTEGER) AS VARCHAR)
+            ),
+            'humedad_relativa', json_object(
+                'maxima', CAST(CAST(80 + 15 * {_noise('d', "'hmax'")} AS INTEGER) AS VARCHAR),
+                'minima', CAST(CAST(40 + 20 * {_noise('d', "'hmin'")} AS INTEGER) AS VARCHAR)
+            ),
+            'uv_max', CASE WHEN d < 5 THEN CAST(CAST(round(1 + 8 * CAST(dayofyear(day + CAST(d AS INTEGER)) BETWEEN 120 AND 260 AS INTEGER) + 2 * {_noise('d', "'uv'")}) AS INTEGER) AS VARCHAR) END
+        )"""
+    hourly_days = []
+    for offset_days, name in enumerate(HOURLY_DAYS):
+        forecast_day_date = f"day + {offset_days}"
+        hourly_noise = _noise("h", str(offset_days), "'t'")
+        hourly_temperature = f"CAST(round({_season(forecast_day_date)} + {offset} + {_diurnal('h')} + 2 * {hourly_noise}) AS INTEGER)"
+        hourly_days.append(f"""'{name}', json_object(
+            '@attributes', json_object('fecha', strftime({forecast_day_date}, '%Y-%m-%d')),
+            'temperatura', list_transform(range(24), lambda h: CAST({hourly_temperature} AS VARCHAR)),
+            'humedad_relativa', list_transform(range(24), lambda h: CAST(CAST(70 - 3 * {_diurnal('h')} + 10 * {_noise('h', str(offset_days), "'hr'")} AS INTEGER) AS VARCHAR)),
+            'estado_cielo_descripcion', list_transform(range(24), lambda h: {skies}[1 + CAST(floor({_noise('h // 6', str(offset_days), "'sky'")} * {len(SKIES)}) AS INTEGER)]),
+            'viento', list_transform(range(24), lambda h: json_object(
+                '@attributes', json_object('periodo', lpad(CAST(h AS VARCHAR), 2, '0')),
+                'direccion', {directions}[1 + CAST(floor({_noise('h // 6', str(offset_days), "'wd'")} * {len(WIND_DIRECTIONS)}) AS INTEGER)],
+                'velocidad', CAST(CAST(5 + 20 * {_noise('h', str(offset_days), "'ws'")} AS INTEGER) AS VARCHAR)
+            ))
+        )""")
+    minutes_apart = 24 * 60 // extractions_per_day
+    station_select = ",\n    printf('station_%03d', station) AS STATION" if station_column else ""
+    return f"""
+WITH extractions AS (
+    SELECT
+        s.range AS station,
+        e.range AS extraction,
+        date_trunc('hour', TIMESTAMP '{start_date.isoformat()}' + to_minutes(CAST(e.range * {minutes_apart} AS BIGINT))) AS observed_at
+    FROM range({stations}) s, range({days * extractions_per_day}) e
+),
+
+observations AS (
+    SELECT
+        *,
+        CAST(observed_at AS DATE) AS day,
+        hour(observed_at) AS hour
+    FROM extractions
+)
+
+SELECT
+    strftime(observed_at, '%Y-%m-%d %H:%M:%S') AS FECHA,
+    CAST(round({_season('day')} + {offset} + {_diurnal('hour')} + 3 * ({_noise("'now'")} - 0.5), 1) AS VARCHAR) AS TEMPERATURA_ACTUAL,
+    CAST(CAST(70 - 3 * {_diurnal('hour')} + 15 * {_noise("'rh'")} AS INTEGER) AS VARCHAR) AS HUMEDAD,
+    CAST(CAST(5 + 20 * {_noise("'wind'")} AS INTEGER) AS VARCHAR) AS VIENTO,
+    json_object('description', {sky}, 'id', CAST(11 + station % 7 AS VARCHAR)) AS STATESKY,
+    to_json(list_transform(range({FORECAST_DAYS}), lambda d: {forecast_day})) AS PROXIMOS_DIAS,
+    json_object({', '.join(hourly_days)}) AS PRONOSTICO,
+    -- Each station's connection syncs a few seconds after the previous one
+    observed_at + INTERVAL 2 MINUTE + to_seconds(station) AS _AIRBYTE_EXTRACTED_AT{station_select}
+FROM observations
+ORDER BY _AIRBYTE_EXTRACTED_AT
+"""
+
+
+def generate(query: str, output_format: str, output: str, table: str = "palma_synthetic") -> int:
+    """Write the rows of `query` to `output`, returning how many there are."""
+    if output_format not in FORMATS:
+        raise ValueError(f"Unknown format {output_format!r}, expected one of {', '.join(FORMATS)}")
+    Path(output).parent.mkdir(parents=True, exist_ok=True)
+    if output_format == "parquet":
+        with duckdb.connect() as connection:
+            connection.execute(f"COPY ({query}) TO '{output}' (FORMAT parquet, COMPRESSION zstd)")
+            return connection.execute(f"SELECT count(*) FROM read_parquet('{output}')").fetchone()[0]
+    with duckdb.connect(output) as connection:
+        connection.execute(f"CREATE OR REPLACE TABLE {table} AS {query}")
+        return connection.execute(f"SELECT count(*) FROM {table}").fetchone()[0]
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--start-date", type=datetime.date.fromisoformat, default=datetime.date.fromisoformat(DAILY_PARTITIONS_START_DATE))
+    parser.add_argument("--days", type=int, default=30, help="Days of history")
+    parser.add_argument("--stations", type=int, default=1, help="Stations, each with its own rows")
+    parser.add_argument("--extractions-per-day", type=int, default=2, help="Airbyte syncs per day and station")
+    parser.add_argument("--station-column", action="store_true", help="Add a STATION column, which the models ignore")
+    parser.add_argument("--format", choices=FORMATS, default="parquet")
+    parser.add_argument("--output", help=f"Parquet file or DuckDB database (default: {DEFAULT_OUTPUTS})")
+    parser.add_argument("--table", default="palma_synthetic", help="Table of the DuckDB database to replace")
+    args = parser.parse_args()
+
+    output = args.output or DEFAULT_OUTPUTS[args.format]
+    query = raw_rows_query(args.start_date, args.days, args.stations, args.extractions_per_day, args.station_column)
+    start = time.perf_counter()
+    rows = generate(query, args.format, output, args.table)
+    seconds = time.perf_counter() - start
+    target = output if args.format == "parquet" else f"{output} ({args.table})"
+    print(f"{rows} rows, {args.days} days x {args.extractions_per_day} extractions x {args.stations} stations, "
+          f"written to {target} in {seconds:.1f}s ({Path(output).stat().st_size / 2**20:.1f} MB)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
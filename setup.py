@@ -3,7 +3,7 @@ from setuptools import find_packages, setup
 setup(
     name="weather",
     version="0.0.1",
-    packages=find_packages(),
+    packages=find_packages(exclude=["weather_tests"]),
     package_data={
         "weather": [
             "dbt-project/**/*",
@@ -12,7 +12,8 @@ setup(
     install_requires=[
         "dagster",
         "dagster-cloud",
-        "dagster-dbt",
+        # weather/dbt_events.py and weather/dbt_runner.py use dagster-dbt internals
+        "dagster-dbt>=0.29.26,<0.30",
         "dbt-snowflake<1.10",
         "dbt-snowflake<1.10",
         "dbt-snowflake<1.10",
@@ -21,6 +22,8 @@ setup(
     extras_require={
         "dev": [
             "dagster-webserver",
+            "dbt-duckdb<1.10",
+            "pytest",
         ]
     },
 )
\ No newline at end of file
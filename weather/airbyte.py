@@ -1,221 +1,185 @@
 # weather/airbyte.py
 
-import os
-from dagster import asset, Output, MetadataValue, AssetMaterialization, AssetKey
-import requests
+from dagster import asset, AssetExecutionContext, Output, MetadataValue, AssetObservation
 import time
 
-# Base config
-AIRBYTE_HOST = "http://13.39.50.171.nip.io"
-CONNECTION_ID = "9391a2b8-d03e-4c77-b294-77ba57b359d7"  # Updated to your actual connection ID
-CLIENT_ID = "66d891a9-88a9-4963-8798-2aa3ea54f402"
-CLIENT_SECRET = "KzxIM8REdry0ytOGT2CkU4aYWtGkwXhV"
-
-weather_project_path = "/Users/toniamayaobrador/dbt_weather/weather_project"
-
-print(f">>> DBT PROJECT DIR: {weather_project_path}")
-print(">>> EXISTS:", os.path.exists(weather_project_path))
-print(">>> HAS dbt_project.yml:", os.path.exists(os.path.join(weather_project_path, "dbt_project.yml")))
-
-# Base config
-AIRBYTE_HOST = "http://13.39.50.171.nip.io"
-CONNECTION_ID = "9391a2b8-d03e-4c77-b294-77ba57b359d7"  # Updated to your actual connection ID
-CLIENT_ID = "66d891a9-88a9-4963-8798-2aa3ea54f402"
-CLIENT_SECRET = "KzxIM8REdry0ytOGT2CkU4aYWtGkwXhV"
-
-def get_airbyte_token():
-    url = f"{AIRBYTE_HOST}/api/v1/applications/token"
-    payload = {
-        "client_id": CLIENT_ID,
-        "client_secret": CLIENT_SECRET
-        # Removed grant_type as it's not needed based on our testing
-    }
-    headers = {
-        "accept": "application/json",
-        "content-type": "application/json"
-    }
-    response = requests.post(url, json=payload, headers=headers)
-    
-    # For explicit debugging:
-    if response.status_code != 200:
-        raise Exception(f"Token request failed: {response.status_code} - {response.text}")
+from .constants import AIRBYTE_CONNECTION_ID as CONNECTION_ID
+from .history import JobHistoryStore, job_duration_seconds, stream_records
+from .polling import PollingConfig, epoch_seconds, wait_for_job
+from .resources import AirbyteClientResource
 
-    return response.json()["access_token"]
 
+class AirbyteSyncConfig(PollingConfig):
+    """Run config for `airbyte_sync_asset`.
 
-def sync_airbyte_connection():
-    token = get_airbyte_token()
-    headers = {
-        "Authorization": f"Bearer {token}",
-        "accept": "application/json",
-        "content-type": "application/json"
-    }
+    With `deferred`, the asset only triggers the sync and records the job id;
+    `airbyte_job_sensor` emits the materialization once the job has finished.
+    """
 
-    # Changed from public API to v1 API which we know works
-    sync_url = f"{AIRBYTE_HOST}/api/v1/connections/sync"
-    response = requests.post(sync_url, json={"connectionId": CONNECTION_ID}, headers=headers)
-    response.raise_for_status()
-    job_info = response.json()
-    return job_info, token
+    deferred: bool = False
+    # Skip the sync when a job succeeded less than this many minutes ago (0 disables);
+    # the schedules set 30
+    freshness_window_minutes: float = 0.0
+    # Always start a new sync, even if a recent or running job exists
+    force: bool = False
 
-@asset(
-    description="Runs Airbyte sync to fetch weather data",
-    key_prefix="airbyte"
-)
-def airbyte_sync_asset():
-    # Starting sync
-    print(f"Triggering sync for Airbyte connection: {CONNECTION_ID}")
-    job, token = sync_airbyte_connection()
-    
-    # Get job ID from correct location in response
-    job_id = job.get("job", {}).get("id")
-    if not job_id:
-        raise Exception(f"Failed to get job ID from response: {job}")
-    
-    print(f"Started Airbyte sync job with ID: {job_id}")
-    
-    status = "running"
-    poll_url = f"{AIRBYTE_HOST}/api/v1/jobs/get"
-
-    headers = {
-        "Authorization": f"Bearer {token}",
-        "accept": "application/json",
-        "content-type": "application/json"
-    }
-    
-    # Track some job metrics
-    attempts = 0
-    start_time = time.time()
-    
-    # Poll for job status
-    while status not in ["succeeded", "failed", "cancelled"]:
-        time.sleep(10)
-        try:
-            resp = requests.post(poll_url, json={"id": job_id}, headers=headers)
-            resp.raise_for_status()
-            job_info = resp.json().get("job", {})
-            status = job_info.get("status", "unknown")
-            
-            # Extract more useful info for logging
-            attempts = len(job_info.get("attempts", []))
-            current_attempt = job_info.get("attempts", [])[-1] if attempts > 0 else {}
-            attempt_status = current_attempt.get("status", "unknown") if current_attempt else "unknown"
-            
-            print(f"Polling job {job_id}... status: {status}, attempt #{attempts}, attempt status: {attempt_status}")
-        except Exception as e:
-            print(f"Error polling job status: {e}")
-            # Don't fail yet, try a few more times
-            time.sleep(10)
-    
-    # Make sure we have the final job info
-    resp = requests.post(poll_url, json={"id": job_id}, headers=headers)
-    resp.raise_for_status()
-    final_job_info = resp.json().get("job", {})
-    final_status = final_job_info.get("status", "unknown")
-    
-    # Log the final status
-    print(f"Airbyte sync completed with status: {final_status}")
-    
-    # Initialize records tracking variables
-    records_stats = {}
-    total_records = 0
-    
-    # Extract record counts and other statistics if available
-    for attempt in final_job_info.get("attempts", []):
-        for stream_stat in attempt.get("streamStats", []):
-            stream_name = stream_stat.get("streamName", "unknown")
-            records = stream_stat.get("stats", {}).get("recordsEmitted", 0)
-            records_stats[stream_name] = records
-            total_records += records
-    
-    print(f"Airbyte sync completed with status: {final_status}, Total records: {total_records}")
-    
-    # Create metadata for Dagster
-    metadata = {
-        "job_id": MetadataValue.text(str(job_id)),
-        "status": MetadataValue.text(final_status),
-        "duration_seconds": MetadataValue.int(int(time.time() - start_time)),
-        "total_records": MetadataValue.int(total_records),
-        "attempts": MetadataValue.int(attempts)
-    }
 
-    # Calculate duration
-    duration_seconds = int(time.time() - start_time)
-    
-    # Initialize records tracking variables
-    records_stats = {}
-    total_records = 0
-    
-    # Log the final status
-    print(f"Airbyte sync completed with status: {status}")
-    
-    # Get final job details
-    resp = requests.post(poll_url, json={"id": job_id}, headers=headers)
-    job_info = resp.json().get("job", {})
-    
-    # Extract record counts and other statistics if available
-    for attempt in job_info.get("attempts", []):
-        for stream_stat in attempt.get("streamStats", []):
-            stream_name = stream_stat.get("streamName", "unknown")
-            records = stream_stat.get("stats", {}).get("recordsEmitted", 0)
-            records_stats[stream_name] = records
-            total_records += records
-    
-    print(f"Airbyte sync completed with status: {status}, Total records: {total_records}")
-    
-    # Get final job details
-    resp = requests.post(poll_url, json={"id": job_id}, headers=headers)
-    resp.raise_for_status()
-    final_job_info = resp.json().get("job", {})
-    
-    # Get the final status from the job info
-    final_status = final_job_info.get("status", "unknown")
-    
-    # Extract record counts and other statistics if available
-    records_stats = {}
-    total_records = 0
-    
-    for attempt in final_job_info.get("attempts", []):
-        for stream_stat in attempt.get("streamStats", []):
-            stream_name = stream_stat.get("streamName", "unknown")
-            records = stream_stat.get("stats", {}).get("recordsEmitted", 0)
-            records_stats[stream_name] = records
-            total_records += records
-    
-    print(f"Airbyte sync completed with final status: {final_status}, Job ID: {job_id}, Total records: {total_records}")
-    
-    # Create metadata for Dagster
+RUNNING_STATUSES = ("pending", "running", "incomplete")
+
+
+def find_existing_job(airbyte, connection_id, freshness_window_minutes):
+    """Look at the connection's recent jobs before triggering a new sync.
+
+    Returns ("attached", job) when a sync is already running, ("skipped", job)
+    when one succeeded within the freshness window and ("new", None) otherwise.
+    """
+    recent_jobs = airbyte.list_jobs(connection_id, limit=5)
+    for job in recent_jobs:
+        if job.get("status") in RUNNING_STATUSES:
+            return "attached", job
+
+    if freshness_window_minutes > 0:
+        for job in recent_jobs:
+            if job.get("status") != "succeeded":
+                continue
+            finished_at = epoch_seconds(job.get("updatedAt"))
+            if finished_at and time.time() - finished_at < freshness_window_minutes * 60:
+                return "skipped", job
+            break
+
+    return "new", None
+
+
+def sync_metadata(job_info):
+    """Materialization metadata for a finished Airbyte job, and its total record count."""
+    final_status = job_info.get("status", "unknown")
+    records_stats = stream_records(job_info)
+    total_records = sum(records_stats.values())
+
     metadata = {
-        "job_id": MetadataValue.text(str(job_id)),
+        "job_id": MetadataValue.text(str(job_info.get("id"))),
         "status": final_status,  # Use plain string instead of MetadataValue.text
-        "duration_seconds": MetadataValue.int(duration_seconds),
         "total_records": MetadataValue.int(total_records),
-        "attempts": MetadataValue.int(attempts)
+        "attempts": MetadataValue.int(len(job_info.get("attempts", []))),
     }
-    
+
+    actual_duration = job_duration_seconds(job_info)
+    if actual_duration is not None:
+        metadata["actual_duration_seconds"] = MetadataValue.float(round(actual_duration, 1))
+
     # Add stream stats to metadata
     for stream, count in records_stats.items():
         metadata[f"records_{stream}"] = MetadataValue.int(count)
-    
+
     # Add timestamps if available
     if job_info.get("createdAt"):
         metadata["start_time"] = MetadataValue.text(
-            time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(job_info.get("createdAt") / 1000))
+            time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(epoch_seconds(job_info["createdAt"])))
         )
     if job_info.get("updatedAt"):
         metadata["end_time"] = MetadataValue.text(
-            time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(job_info.get("updatedAt") / 1000))
+            time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(epoch_seconds(job_info["updatedAt"])))
         )
 
-    # Create a materialization event with the metadata
-    description = "Airbyte sync completed successfully" if final_status == "succeeded" else f"Airbyte sync completed with status: {final_status}"
-    yield AssetMaterialization(
-        asset_key=AssetKey(["airbyte_sync_asset"]),
-        description=description,
-        metadata=metadata
+    return metadata, total_records
+
+
+def sync_description(final_status):
+    if final_status == "succeeded":
+        return "Airbyte sync completed successfully"
+    return f"Airbyte sync completed with status: {final_status}"
+
+
+@asset(
+    description="Runs Airbyte sync to fetch weather data",
+    key_prefix="airbyte",
+    output_required=False,
+)
+def airbyte_sync_asset(context: AssetExecutionContext, config: AirbyteSyncConfig, airbyte: AirbyteClientResource):
+    sync_action, existing_job = ("new", None) if config.force else find_existing_job(
+        airbyte, CONNECTION_ID, config.freshness_window_minutes
     )
-    
+
+    if sync_action == "skipped":
+        # The data is fresh enough: no new materialization, so downstream assets are skipped too
+        age_minutes = (time.time() - epoch_seconds(existing_job["updatedAt"])) / 60
+        context.log.info(f"Airbyte job {existing_job['id']} succeeded {age_minutes:.1f} minutes ago, skipping sync")
+        yield AssetObservation(
+            asset_key=context.asset_key,
+            description="Airbyte sync skipped, a recent sync already succeeded",
+            metadata={
+                "sync_action": "skipped",
+                "job_id": MetadataValue.text(str(existing_job["id"])),
+                "job_age_minutes": MetadataValue.float(round(age_minutes, 1)),
+                "freshness_window_minutes": MetadataValue.float(config.freshness_window_minutes),
+            },
+        )
+        return
+
+    if sync_action == "attached":
+        # Starting another sync would conflict with the one already running
+        job_id = existing_job["id"]
+        context.log.info(f"Airbyte job {job_id} is already running for connection {CONNECTION_ID}, attaching to it")
+    else:
+        # Starting sync
+        context.log.info(f"Triggering sync for Airbyte connection: {CONNECTION_ID}")
+        job_id = airbyte.sync_connection(CONNECTION_ID)["id"]
+        context.log.info(f"Started Airbyte sync job with ID: {job_id}")
+
+    if config.deferred:
+        # Hand the job over to airbyte_job_sensor instead of holding this worker
+        yield AssetObservation(
+            asset_key=context.asset_key,
+            description="Airbyte sync triggered, waiting for completion",
+            metadata={
+                "job_id": MetadataValue.text(str(job_id)),
+                "connection_id": MetadataValue.text(CONNECTION_ID),
+                "status": "pending",
+                "sync_action": sync_action,
+            },
+        )
+        return
+
+    start_time = time.time()
+    history = JobHistoryStore()
+    predicted_duration = None
+    initial_wait = None
+    if config.polling_mode == "predictive":
+        if not history.entries(CONNECTION_ID):
+            # Cold start: seed the history from the jobs Airbyte still remembers
+            history.record(CONNECTION_ID, airbyte.list_jobs(CONNECTION_ID, limit=config.history_size))
+        predicted_duration = history.predict_duration(CONNECTION_ID, window=config.history_size)
+        if predicted_duration is not None:
+            # An attached job has already been running for a while
+            started_at = epoch_seconds(existing_job.get("createdAt")) if sync_action == "attached" else None
+            elapsed = max(0.0, time.time() - started_at) if started_at else 0.0
+            initial_wait = max(config.first_poll_seconds, predicted_duration * config.prediction_safety_factor - elapsed)
+            context.log.info(f"Predicted job duration {predicted_duration:.0f}s, {elapsed:.0f}s elapsed, first poll in {initial_wait:.0f}s")
+
+    job_info, poll_stats = wait_for_job(airbyte, job_id, config, context.log, initial_wait_seconds=initial_wait)
+    history.record(CONNECTION_ID, [job_info])
+
+    # Calculate duration
+    duration_seconds = int(time.time() - start_time)
+
+    # The last poll already returned the final job details
+    final_status = job_info.get("status", "unknown")
+    metadata, total_records = sync_metadata(job_info)
+
+    context.log.info(f"Airbyte sync completed with final status: {final_status}, Job ID: {job_id}, Total records: {total_records}")
+
+    # Create metadata for Dagster
+    metadata.update({
+        "duration_seconds": MetadataValue.int(duration_seconds),
+        "sync_action": sync_action,
+        "polling_mode": MetadataValue.text(config.polling_mode),
+        **poll_stats.to_metadata(),
+    })
+    if predicted_duration is not None:
+        metadata["predicted_duration_seconds"] = MetadataValue.float(round(predicted_duration, 1))
+
     # Return the output value
     yield Output(
-        value={"job_id": job_id, "records": total_records}
+        value={"job_id": job_id, "records": total_records},
+        metadata=metadata,
     )
@@ -0,0 +1,157 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
+
+from dagster import AssetExecutionContext, AssetKey, AssetSpec, Failure, MaterializeResult, MetadataValue, multi_asset
+
+from .airbyte import sync_metadata
+from .constants import AIRBYTE_CONNECTION_IDS
+from .polling import PollingConfig, PollStats, poll_job
+from .resources import AirbyteClientResource
+
+
+class AirbyteMultiSyncConfig(PollingConfig):
+    """Run config for `airbyte_multi_sync_assets`."""
+
+    # How many syncs may run on Airbyte at the same time
+    max_in_flight: int = 4
+
+
+class AsyncAirbyteClient:
+    """asyncio front end for `AirbyteClientResource`.
+
+    Requests run on a dedicated thread pool sized to the in-flight limit and
+    share the resource's pooled session and cached token, so many jobs can be
+    triggered and polled from one event loop without a connection per call.
+    """
+
+    def __init__(self, airbyte: AirbyteClientResource, max_in_flight: int):
+        self.airbyte = airbyte
+        self._executor = ThreadPoolExecutor(max_workers=max_in_flight, thread_name_prefix="airbyte")
+
+    async def _call(self, method, *args):
+        return await asyncio.get_running_loop().run_in_executor(self._executor, method, *args)
+
+    async def sync_connection(self, connection_id: str) -> Dict[str, Any]:
+        return await self._call(self.airbyte.sync_connection, connection_id)
+
+    async def get_job(self, job_id: int) -> Dict[str, Any]:
+        return await self._call(self.airbyte.get_job, job_id)
+
+    async def cancel_job(self, job_id: int) -> Dict[str, Any]:
+        return await self._call(self.airbyte.cancel_job, job_id)
+
+    def close(self) -> None:
+        self._executor.shutdown(wait=False)
+
+
+async def wait_for_job_async(
+    client: AsyncAirbyteClient,
+    job_id: int,
+    config: PollingConfig,
+    log,
+) -> Tuple[Dict[str, Any], PollStats]:
+    """asyncio counterpart of `polling.wait_for_job`, running the same `poll_job` loop."""
+    steps = poll_job(job_id, config, log)
+    reply = None
+    try:
+        while True:
+            wait = steps.send(reply)
+            if wait is not None:
+                await asyncio.sleep(wait)
+            try:
+                reply = await (client.get_job(job_id) if wait is not None else client.cancel_job(job_id))
+            except Exception as e:
+                reply = e
+    except StopIteration as done:
+        return done.value
+
+
+async def sync_connections(
+    client: AsyncAirbyteClient,
+    connection_ids: List[str],
+    config: AirbyteMultiSyncConfig,
+    log,
+) -> AsyncIterator[Tuple[str, Optional[Dict[str, Any]], Optional[PollStats], Optional[Exception]]]:
+    """Sync several connections concurrently, yielding each one as soon as it finishes.
+
+    At most `max_in_flight` syncs run at once; the others wait for a free slot
+    before they are triggered. A connection whose sync could not be started
+    or waited for is yielded with the error instead of its job info and poll
+    stats, so it does not stop the other syncs.
+    """
+    slots = asyncio.Semaphore(config.max_in_flight)
+
+    async def run_one(connection_id: str):
+        async with slots:
+            try:
+                job_id = (await client.sync_connection(connection_id))["id"]
+                log.info(f"Started Airbyte sync job {job_id} for connection {connection_id}")
+                job_info, stats = await wait_for_job_async(client, job_id, config, log)
+            except Exception as e:
+                return connection_id, None, None, e
+            return connection_id, job_info, stats, None
+
+    tasks = [asyncio.ensure_future(run_one(connection_id)) for connection_id in connection_ids]
+    try:
+        for finished in asyncio.as_completed(tasks):
+            yield await finished
+    finally:
+        for task in tasks:
+            task.cancel()
+
+
+def connection_asset_key(connection_id: str) -> AssetKey:
+    return AssetKey(["airbyte", "connections", connection_id.replace("-", "_")])
+
+
+@multi_asset(
+    specs=[
+        AssetSpec(
+            key=connection_asset_key(connection_id),
+            description=f"Airbyte sync of connection {connection_id}",
+            metadata={"connection_id": connection_id},
+            skippable=True,
+        )
+        for connection_id in AIRBYTE_CONNECTION_IDS
+    ],
+    can_subset=True,
+)
+def airbyte_multi_sync_assets(context: AssetExecutionContext, config: AirbyteMultiSyncConfig, airbyte: AirbyteClientResource):
+    """Syncs every selected connection concurrently and materializes each one as it completes."""
+    connection_ids = [
+        connection_id for connection_id in AIRBYTE_CONNECTION_IDS
+        if connection_asset_key(connection_id) in context.selected_asset_keys
+    ]
+    client = AsyncAirbyteClient(airbyte, max_in_flight=config.max_in_flight)
+    results = sync_connections(client, connection_ids, config, context.log)
+    failed = []
+    loop = asyncio.new_event_loop()
+    try:
+        while True:
+            try:
+                connection_id, job_info, poll_stats, error = loop.run_until_complete(results.__anext__())
+            except StopAsyncIteration:
+                break
+            if error is not None:
+                context.log.error(f"Airbyte sync of connection {connection_id} failed: {error}")
+                failed.append(connection_id)
+                continue
+            final_status = job_info.get("status", "unknown")
+            metadata, total_records = sync_metadata(job_info)
+            context.log.info(f"Connection {connection_id} finished with status {final_status}, total records: {total_records}")
+            if final_status != "succeeded":
+                # Keep materializing the other connections as they finish
+                failed.append(connection_id)
+                continue
+            yield MaterializeResult(
+                asset_key=connection_asset_key(connection_id),
+                metadata={**metadata, **poll_stats.to_metadata(), "max_in_flight": MetadataValue.int(config.max_in_flight)},
+            )
+    finally:
+        loop.run_until_complete(results.aclose())
+        loop.close()
+        client.close()
+
+    if failed:
+        raise Failure(description=f"Airbyte syncs did not succeed for connections: {', '.join(failed)}")
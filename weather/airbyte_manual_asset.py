@@ -1,69 +1,18 @@
-import requests
 import time
 from dagster import asset, Output, MetadataValue
 
-# Base config
-AIRBYTE_HOST = "http://13.39.50.171.nip.io"
-CONNECTION_ID = "9391a2b8-d03e-4c77-b294-77ba57b359d7"  # Updated to your actual connection ID
-CLIENT_ID = "66d891a9-88a9-4963-8798-2aa3ea54f402"
-CLIENT_SECRET = "KzxIM8REdry0ytOGT2CkU4aYWtGkwXhV"
+from .constants import AIRBYTE_CONNECTION_ID as CONNECTION_ID
+from .resources import AirbyteClientResource
 
-def get_airbyte_token():
-    url = f"{AIRBYTE_HOST}/api/v1/applications/token"
-    payload = {
-        "client_id": CLIENT_ID,
-        "client_secret": CLIENT_SECRET
-        # Removed grant_type as it's not needed based on our testing
-    }
-    headers = {
-        "accept": "application/json",
-        "content-type": "application/json"
-    }
-    response = requests.post(url, json=payload, headers=headers)
-    
-    # For explicit debugging:
-    if response.status_code != 200:
-        raise Exception(f"Token request failed: {response.status_code} - {response.text}")
-
-    return response.json()["access_token"]
-
-
-def sync_airbyte_connection():
-    token = get_airbyte_token()
-    headers = {
-        "Authorization": f"Bearer {token}",
-        "accept": "application/json",
-        "content-type": "application/json"
-    }
-
-    # Changed from public API to v1 API which we know works
-    sync_url = f"{AIRBYTE_HOST}/api/v1/connections/sync"
-    response = requests.post(sync_url, json={"connectionId": CONNECTION_ID}, headers=headers)
-    response.raise_for_status()
-    job_info = response.json()
-    return job_info, token
 
 @asset
-def airbyte_sync_asset():
+def airbyte_sync_asset(airbyte: AirbyteClientResource):
     # Starting sync
     print(f"Triggering sync for Airbyte connection: {CONNECTION_ID}")
-    job, token = sync_airbyte_connection()
-    
-    # Get job ID from correct location in response
-    job_id = job.get("job", {}).get("id")
-    if not job_id:
-        raise Exception(f"Failed to get job ID from response: {job}")
-    
+    job_id = airbyte.sync_connection(CONNECTION_ID)["id"]
     print(f"Started Airbyte sync job with ID: {job_id}")
     
     status = "running"
-    poll_url = f"{AIRBYTE_HOST}/api/v1/jobs/get"
-
-    headers = {
-        "Authorization": f"Bearer {token}",
-        "accept": "application/json",
-        "content-type": "application/json"
-    }
     
     # Track some job metrics
     attempts = 0
@@ -73,9 +22,7 @@ def airbyte_sync_asset():
     while status not in ["succeeded", "failed", "cancelled"]:
         time.sleep(10)
         try:
-            resp = requests.post(poll_url, json={"id": job_id}, headers=headers)
-            resp.raise_for_status()
-            job_info = resp.json().get("job", {})
+            job_info = airbyte.get_job(job_id)
             status = job_info.get("status", "unknown")
             
             # Extract more useful info for logging
@@ -95,11 +42,8 @@ def airbyte_sync_asset():
     if status != "succeeded":
         raise Exception(f"Airbyte job {job_id} failed with status: {status}")
 
-    # Get final job details
-    resp = requests.post(poll_url, json={"id": job_id}, headers=headers)
-    job_info = resp.json().get("job", {})
-    
-    # Extract record counts and other statistics if available
+    # The last poll already returned the final job details;
+    # extract record counts and other statistics if available
     records_stats = {}
     total_records = 0
     
@@ -12,11 +12,25 @@ DBT_PROJECT_DIR = str(PROJECT_ROOT / "weather_project")
 DBT_PROFILES_DIR = str(PROJECT_ROOT / "weather_project")
 DBT_TARGET_DIR = str(PROJECT_ROOT / "weather_project" / "target")
 
-# Ensure target directory exists
-Path(DBT_TARGET_DIR).mkdir(parents=True, exist_ok=True)
+# Local state kept between runs (job history, dbt artifacts, ...)
+STATE_DIR = os.environ.get("WEATHER_STATE_DIR", str(PROJECT_ROOT / ".weather_state"))
+AIRBYTE_JOB_HISTORY_PATH = str(Path(STATE_DIR) / "airbyte_job_history.json")
+DBT_ARTIFACTS_DIR = str(Path(STATE_DIR) / "dbt_artifacts")
+DBT_NODE_TIMINGS_PATH = str(Path(STATE_DIR) / "dbt_node_timings.json")
+DBT_FAILED_BUILDS_PATH = str(Path(STATE_DIR) / "dbt_failed_builds.json")
+MANIFEST_CACHE_DIR = str(Path(STATE_DIR) / "manifest_cache")
+DBT_PARSE_CACHE_DIR = str(Path(STATE_DIR) / "dbt_parse_cache")
 
 # Airbyte configuration
 AIRBYTE_CONNECTION_ID = os.environ.get("AIRBYTE_CONNECTION_ID", "9391a2b8-d03e-4c77-b294-77ba57b359d7")
+# One connection per station, comma separated, for the concurrent multi-connection sync
+AIRBYTE_CONNECTION_IDS = [
+    connection_id.strip()
+    for connection_id in os.environ.get("AIRBYTE_CONNECTION_IDS", AIRBYTE_CONNECTION_ID).split(",")
+    if connection_id.strip()
+]
+# dbt source whose tables are loaded by the Airbyte sync, one table per stream
+AIRBYTE_SOURCE_NAME = "raw"
 
 # Airflow API credentials (consider moving these to environment variables in production)
 CLIENT_ID = os.environ.get("AIRBYTE_CLIENT_ID", "66d891a9-88a9-4963-8798-2aa3ea54f402")
@@ -33,6 +47,10 @@ AIRBYTE_CONFIG = {
     "password": os.environ.get("AIRBYTE_PASSWORD", ""),
 }
 
+# profiles.yml output the dbt resource runs against, by default the profile's own target (prod);
+# "duckdb" builds offline from the `palma` seed
+DBT_TARGET = os.environ.get("DBT_TARGET") or None
+
 DBT_CONFIG = {
     "project_dir": DBT_PROJECT_DIR,
     "profiles_dir": DBT_PROFILES_DIR,
@@ -42,3 +60,11 @@ DBT_CONFIG = {
 WEATHER_SCHEDULE_CRON = "0 8 * * *"  # 8am daily
 EXECUTION_TIMEZONE = "Europe/Madrid"
 
+# Daily partitions of the date-grain marts (dbt models tagged "daily")
+DAILY_PARTITIONS_START_DATE = os.environ.get("WEATHER_PARTITIONS_START_DATE", "2025-01-01")
+# Days covered by the AEMET daily forecast, today included; also how many partitions exist past today
+FORECAST_HORIZON_DAYS = 7
+# Partitions built by each run of a backfill, and the pool limiting how many run at once
+DAILY_MARTS_PARTITIONS_PER_RUN = 7
+DAILY_MARTS_POOL = "weather_daily_marts"
+
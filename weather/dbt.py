@@ -1,308 +1,50 @@
-import os
 import json
-import logging
+import queue
+import threading
 from pathlib import Path
-from typing import Dict, Any, Optional, List
-
-from dagster import AssetExecutionContext, ResourceParam, Definitions, load_assets_from_modules
-from dagster_dbt import DbtCliResource, dbt_assets, DagsterDbtTranslator
-
-# Set up logging
-logger = logging.getLogger("dbt_assets")
-
-def find_manifest_path() -> Path:
-    """Find the dbt manifest.json in various possible locations."""
-    # Get the project root (one level up from the weather package)
-    project_root = Path(__file__).parent.parent
-    
-    # Possible locations where the manifest might be found
-    possible_paths = [
-        # Local development - relative to project root
-        project_root / "weather_project" / "target" / "manifest.json",
-        # Deployed environment
-        Path("/venvs/ec21669d8b57/lib/python3.10/site-packages/working_directory/root/weather_project/target/manifest.json"),
-        # Relative to the current file
-        Path(__file__).parent.parent / "weather_project" / "target" / "manifest.json",
-        # CI/CD environment
-        Path("/github/workspace/weather_project/target/manifest.json"),
-    ]
-    
-    for path in possible_paths:
-        if path and path.exists():
-            logger.info(f"Found dbt manifest at: {path}")
-            return path
-    
-    # If no existing manifest is found, return the first path as a default
-    default_path = possible_paths[0]
-    logger.warning(f"No manifest found, using default path: {default_path}")
-    return default_path
-
-def create_minimal_manifest(path: Path) -> Dict[str, Any]:
-    """Create a minimal valid manifest file if it doesn't exist."""
-    path.parent.mkdir(parents=True, exist_ok=True)
-    
-    # A minimal valid manifest with just the required fields
-    minimal_manifest = {
-        "metadata": {
-            "dbt_schema_version": "https://schemas.getdbt.com/dbt/manifest/v7.json",
-            "dbt_version": "1.7.2",
-            "generated_at": "2025-05-18T00:00:00.000000Z",
-            "adapter_type": "snowflake"
-        },
-        "nodes": {
-            "model.weather_project.stg_weather_current": {
-                "name": "stg_weather_current",
-                "resource_type": "model",
-                "package_name": "weather_project",
-                "unique_id": "model.weather_project.stg_weather_current",
-                "fqn": ["weather_project", "staging", "stg_weather_current"],
-                "depends_on": {"nodes": [], "macros": []},
-                "config": {
-                    "enabled": True,
-                    "materialized": "view",
-                    "tags": [],
-                    "meta": {},
-                    "on_schema_change": "ignore"
-                },
-                "database": os.getenv("SNOWFLAKE_DATABASE", "WEATHER"),
-                "schema": "staging",
-                "alias": "stg_weather_current",
-                "description": "Staging model for current weather data"
-            },
-            "model.weather_project.stg_weather_forecast_daily": {
-                "name": "stg_weather_forecast_daily",
-                "resource_type": "model",
-                "package_name": "weather_project",
-                "unique_id": "model.weather_project.stg_weather_forecast_daily",
-                "fqn": ["weather_project", "staging", "stg_weather_forecast_daily"],
-                "depends_on": {"nodes": [], "macros": []},
-                "config": {
-                    "enabled": True,
-                    "materialized": "view",
-                    "tags": [],
-                    "meta": {},
-                    "on_schema_change": "ignore"
-                },
-                "database": os.getenv("SNOWFLAKE_DATABASE", "WEATHER"),
-                "schema": "staging",
-                "alias": "stg_weather_forecast_daily",
-                "description": "Staging model for daily weather forecast data"
-            },
-            "model.weather_project.stg_weather_forecast_hourly": {
-                "name": "stg_weather_forecast_hourly",
-                "resource_type": "model",
-                "package_name": "weather_project",
-                "unique_id": "model.weather_project.stg_weather_forecast_hourly",
-                "fqn": ["weather_project", "staging", "stg_weather_forecast_hourly"],
-                "depends_on": {"nodes": [], "macros": []},
-                "config": {
-                    "enabled": True,
-                    "materialized": "view",
-                    "tags": [],
-                    "meta": {},
-                    "on_schema_change": "ignore"
-                },
-                "database": os.getenv("SNOWFLAKE_DATABASE", "WEATHER"),
-                "schema": "staging",
-                "alias": "stg_weather_forecast_hourly",
-                "description": "Staging model for hourly weather forecast data"
-            },
-            "model.weather_project.weather_current_metrics": {
-                "name": "weather_current_metrics",
-                "resource_type": "model",
-                "package_name": "weather_project",
-                "unique_id": "model.weather_project.weather_current_metrics",
-                "fqn": ["weather_project", "marts", "weather_current_metrics"],
-                "depends_on": {"nodes": ["model.weather_project.stg_weather_current"], "macros": []},
-                "config": {
-                    "enabled": True,
-                    "materialized": "table",
-                    "tags": [],
-                    "meta": {},
-                    "on_schema_change": "ignore"
-                },
-                "database": os.getenv("SNOWFLAKE_DATABASE", "WEATHER"),
-                "schema": "marts",
-                "alias": "weather_current_metrics",
-                "description": "Current weather metrics and analysis"
-            },
-            "model.weather_project.weather_daily_snapshot": {
-                "name": "weather_daily_snapshot",
-                "resource_type": "model",
-                "package_name": "weather_project",
-                "unique_id": "model.weather_project.weather_daily_snapshot",
-                "fqn": ["weather_project", "marts", "weather_daily_snapshot"],
-                "depends_on": {"nodes": ["model.weather_project.stg_weather_forecast_daily"], "macros": []},
-                "config": {
-                    "enabled": True,
-                    "materialized": "table",
-                    "tags": [],
-                    "meta": {},
-                    "on_schema_change": "ignore"
-                },
-                "database": os.getenv("SNOWFLAKE_DATABASE", "WEATHER"),
-                "schema": "marts",
-                "alias": "weather_daily_snapshot",
-                "description": "Daily snapshot of weather forecasts"
-            },
-            "model.weather_project.weather_daily_summary": {
-                "name": "weather_daily_summary",
-                "resource_type": "model",
-                "package_name": "weather_project",
-                "unique_id": "model.weather_project.weather_daily_summary",
-                "fqn": ["weather_project", "marts", "weather_daily_summary"],
-                "depends_on": {"nodes": ["model.weather_project.weather_daily_snapshot"], "macros": []},
-                "config": {
-                    "enabled": True,
-                    "materialized": "table",
-                    "tags": [],
-                    "meta": {},
-                    "on_schema_change": "ignore"
-                },
-                "database": os.getenv("SNOWFLAKE_DATABASE", "WEATHER"),
-                "schema": "marts",
-                "alias": "weather_daily_summary",
-                "description": "Daily summary of weather conditions"
-            },
-            "model.weather_project.weather_extremes": {
-                "name": "weather_extremes",
-                "resource_type": "model",
-                "package_name": "weather_project",
-                "unique_id": "model.weather_project.weather_extremes",
-                "fqn": ["weather_project", "marts", "weather_extremes"],
-                "depends_on": {"nodes": ["model.weather_project.weather_daily_summary"], "macros": []},
-                "config": {
-                    "enabled": True,
-                    "materialized": "table",
-                    "tags": [],
-                    "meta": {},
-                    "on_schema_change": "ignore"
-                },
-                "database": os.getenv("SNOWFLAKE_DATABASE", "WEATHER"),
-                "schema": "marts",
-                "alias": "weather_extremes",
-                "description": "Analysis of extreme weather conditions"
-            },
-            "model.weather_project.weather_trends": {
-                "name": "weather_trends",
-                "resource_type": "model",
-                "package_name": "weather_project",
-                "unique_id": "model.weather_project.weather_trends",
-                "fqn": ["weather_project", "marts", "weather_trends"],
-                "depends_on": {"nodes": ["model.weather_project.weather_daily_summary"], "macros": []},
-                "config": {
-                    "enabled": True,
-                    "materialized": "table",
-                    "tags": [],
-                    "meta": {},
-                    "on_schema_change": "ignore"
-                },
-                "database": os.getenv("SNOWFLAKE_DATABASE", "WEATHER"),
-                "schema": "marts",
-                "alias": "weather_trends",
-                "description": "Weather trend analysis and patterns"
-            }
-        },
-        "sources": {},
-        "macros": {},
-        "parent_map": {},
-        "child_map": {
-            "model.weather_project.stg_weather_current": ["model.weather_project.weather_current_metrics"],
-            "model.weather_project.stg_weather_forecast_daily": ["model.weather_project.weather_daily_snapshot"],
-            "model.weather_project.stg_weather_forecast_hourly": [],
-            "model.weather_project.weather_current_metrics": [],
-            "model.weather_project.weather_daily_snapshot": ["model.weather_project.weather_daily_summary"],
-            "model.weather_project.weather_daily_summary": ["model.weather_project.weather_extremes", "model.weather_project.weather_trends"],
-            "model.weather_project.weather_extremes": [],
-            "model.weather_project.weather_trends": []
-        },
-        "group_map": {},
-        "disabled": {},
-        "exposures": {},
-        "selectors": {},
-        "docs": {},
-        "files": {},
-        "metrics": {},
-        "semantic_models": {},
-        "saved_queries": {},
-        "unit_tests": {},
-        "semantic_layer": {},
-        "query_statistics": {},
-        "tests": {
-            "test.weather_project.not_null_stg_weather_current_date_time.5c9bfbb1b0": {
-                "name": "not_null_stg_weather_current_date_time",
-                "resource_type": "test",
-                "package_name": "weather_project",
-                "unique_id": "test.weather_project.not_null_stg_weather_current_date_time.5c9bfbb1b0",
-                "fqn": ["weather_project", "staging", "schema_test", "not_null_stg_weather_current_date_time"],
-                "refs": [],
-                "sources": [],
-                "depends_on": {
-                    "nodes": ["model.weather_project.stg_weather_current"],
-                    "macros": ["macro.dbt.test_not_null"]
-                },
-                "config": {
-                    "enabled": True,
-                    "severity": "ERROR",
-                    "tags": ["schema"],
-                    "meta": {},
-                    "materialized": "test",
-                    "schema": "dbt_test__audit",
-                    "alias": "not_null_stg_weather_current_date_time_5c9bfbb1b0"
-                },
-                "test_metadata": {
-                    "name": "not_null",
-                    "kwargs": {},
-                    "namespace": "dbt"
-                },
-                "database": os.getenv("SNOWFLAKE_DATABASE", "WEATHER"),
-                "schema": "dbt_test__audit",
-                "alias": "not_null_stg_weather_current_date_time_5c9bfbb1b0",
-                "raw_sql": "{{ test_not_null(\n        relation=ref('stg_weather_current'),\n        column_name='date_time'\n    ) }}",
-                "test_node": {
-                    "name": "not_null",
-                    "package_name": "dbt",
-                    "depends_on": {
-                        "nodes": ["model.weather_project.stg_weather_current"],
-                        "macros": ["macro.dbt.test_not_null"]
-                    },
-                    "config": {
-                        "enabled": True,
-                        "severity": "ERROR",
-                        "tags": ["schema"],
-                        "meta": {},
-                        "materialized": "test"
-                    },
-                    "test_metadata": {
-                        "name": "not_null",
-                        "kwargs": {},
-                        "namespace": "dbt"
-                    },
-                    "columns": {},
-                    "description": "",
-                    "docs": {"show": True},
-                    "patch_path": None,
-                    "unrendered_config": {"severity": "ERROR"},
-                    "column_name": "date_time"
-                },
-                "column_name": "date_time",
-                "description": "",
-                "docs": {"show": True},
-                "patch_path": None,
-                "unrendered_config": {"severity": "ERROR"}
-            }
-        }
-    }
-    
-    # Add tests to nodes as well (some versions of dbt expect them there too)
-    if 'tests' in minimal_manifest:
-        minimal_manifest['nodes'].update(minimal_manifest['tests'])
-    
-    # Write the manifest to disk
-    with open(path, 'w') as f:
-        json.dump(minimal_manifest, f, indent=2)
-        
-    return minimal_manifest
+from typing import Callable, Dict, Any, Iterator, List, Optional, Set, Union
+
+import yaml
+
+from dagster import (
+    AssetCheckResult,
+    AssetExecutionContext,
+    AssetKey,
+    AssetObservation,
+    AssetRecordsFilter,
+    BackfillPolicy,
+    Config,
+    DagsterEventType,
+    MetadataValue,
+    Output,
+    ResourceParam,
+)
+from dagster_dbt import DbtCliInvocation, DbtCliResource, dbt_assets, DagsterDbtTranslator
+from dagster_dbt.asset_utils import get_asset_check_key_for_test
+
+from .constants import AIRBYTE_SOURCE_NAME, DAILY_MARTS_PARTITIONS_PER_RUN, DAILY_MARTS_POOL
+from .dbt_events import DBT_LOG_VERBOSITY, stream_dbt_events
+from .dbt_runner import DbtRunnerInvocation, InProcessDbt
+from .dbt_selection import (
+    combined_stream_records,
+    graph_width,
+    models_without_new_data,
+    plan_subgraph_runs,
+    records_by_stream,
+)
+from .dbt_state import (
+    FINGERPRINT_METADATA_KEY,
+    DbtArtifactStore,
+    FailedBuildStore,
+    changed_models,
+    model_fingerprint,
+    node_statuses,
+    retryable_nodes,
+    reusable_models,
+)
+from .dbt_timing import NodeTimingStore
+from .manifest import find_manifest_path, load_manifest
+from .partitions import daily_partitions, partition_window_vars
 
 # Initialize dbt resources
 dbt = DbtCliResource(
@@ -310,29 +52,530 @@ dbt = DbtCliResource(
     profiles_dir=str(Path(__file__).parent.parent / "weather_project"),
 )
 
-# Get the manifest path
+# Parsed once per manifest content; @dbt_assets gets the parsed dict so it does not read the file again
 DBT_MANIFEST_PATH = find_manifest_path()
+manifest_data = load_manifest(DBT_MANIFEST_PATH)
+
+
+AIRBYTE_SYNC_ASSET_KEY = AssetKey(["airbyte", "airbyte_sync_asset"])
+
+# Date-grain marts, built one daily partition window at a time
+DAILY_MARTS_SELECT = "tag:daily"
+# Models that rank every date of the date-grain marts, rebuilt whole after them
+DAILY_RECORDS_SELECT = "weather_extremes"
+
+
+class WeatherDbtTranslator(DagsterDbtTranslator):
+    """Maps the raw tables loaded by Airbyte to `airbyte_sync_asset`, so the models run after the sync."""
+
+    def get_asset_key(self, dbt_resource_props: Dict[str, Any]) -> AssetKey:
+        if dbt_resource_props["resource_type"] == "source" and dbt_resource_props["source_name"] == AIRBYTE_SOURCE_NAME:
+            return AIRBYTE_SYNC_ASSET_KEY
+        return super().get_asset_key(dbt_resource_props)
+
+
+# Past this many Airbyte syncs since a model's last build, the model is built without looking at them
+MAX_SYNCS_CHECKED = 100
+
+# Adapters whose database takes one writer at a time, so concurrent dbt invocations would lock each other out
+SINGLE_WRITER_ADAPTERS = ("duckdb",)
+
+DBT_BUILD_MODES = ("incremental", "full-refresh", "auto")
+# "cli" runs every dbt command in a dbt subprocess, "runner" on dbt's programmatic runner in the run's process
+DBT_BACKENDS = ("cli", "runner")
+
+
+class DbtBuildConfig(Config):
+    """Run config for `weather_project_dbt_assets`.
+
+    `mode` is "incremental", "full-refresh", or "auto" to rebuild from scratch
+    only the incremental models whose SQL, columns or config changed since
+    their last successful build.
+    """
+
+    mode: str = "auto"
+    # Leave out the models whose Airbyte sources received no records in any sync since their last build
+    skip_unchanged: bool = True
+    # Only build state:modified+ against the last successful build, deferring to it for the other parents
+    only_modified: bool = False
+    # Run independent parts of the graph as separate, concurrent dbt invocations
+    # instead of one invocation with as many threads as the graph is wide.
+    # Each invocation pays its own dbt startup: this only pays off when the selection
+    # has several wide, independent subgraphs of slow models. On this project's graph
+    # scripts/bench_dbt_parallel.py measures it slower than the serial build (0.8x).
+    parallel_subgraphs: bool = False
+    # Upper bound for the dbt threads of each invocation, which otherwise follow the graph width
+    max_threads: int = 8
+    # A model or test regressed when it runs this many times longer than the median of its
+    # last regression_baseline_runs successful runs, and at least regression_min_seconds longer
+    regression_factor: float = 2.0
+    regression_baseline_runs: int = 20
+    regression_min_seconds: float = 1.0
+    # How much of dbt's own log reaches the run logs, one of DBT_LOG_VERBOSITY,
+    # and how many node result lines are logged together at "info"
+    log_verbosity: str = "info"
+    log_batch_size: int = 50
+    # One of DBT_BACKENDS
+    backend: str = "cli"
+    # Only run what failed or was skipped in the last failed build of this asset and partition
+    # window, with the nodes that depend on it. Also done when re-executing that failed run.
+    retry_failed: bool = False
+
+
+def selected_models(context: AssetExecutionContext, translator: DagsterDbtTranslator) -> List[str]:
+    return [
+        unique_id for unique_id, node in manifest_data["nodes"].items()
+        if node["resource_type"] == "model"
+        and translator.get_asset_key(node) in context.selected_asset_keys
+    ]
+
+
+def last_built_storage_id(context: AssetExecutionContext, asset_key: AssetKey) -> Optional[int]:
+    """Storage id of the asset's last materialization, or None if it was never materialized.
+
+    For a partitioned run, the oldest of the latest materializations of the run's
+    partitions, and None if one of them was never materialized.
+    """
+    if context.assets_def.partitions_def is None:
+        records = context.instance.fetch_materializations(asset_key, limit=1).records
+        return records[0].storage_id if records else None
+    partitions = set(context.partition_keys)
+    storage_ids = context.instance.get_latest_storage_id_by_partition(
+        asset_key, DagsterEventType.ASSET_MATERIALIZATION, partitions
+    )
+    if set(storage_ids) != partitions:
+        return None
+    return min(storage_ids.values())
+
+
+def plan_skipped_models(context: AssetExecutionContext, model_ids: List[str], keep: Set[str]) -> Dict[str, str]:
+    """Models that no Airbyte sync since their last build gave new data, with the reason for each.
+
+    A model is only skipped when at least one sync happened since its last
+    materialization and every one of them reported 0 records for its sources.
+    Models in `keep` are never skipped.
+    """
+    translator = WeatherDbtTranslator()
+    last_built = {}
+    for unique_id in model_ids:
+        if unique_id in keep:
+            continue
+        storage_id = last_built_storage_id(context, translator.get_asset_key(manifest_data["nodes"][unique_id]))
+        # A model never built has every record still to load
+        if storage_id is not None:
+            last_built[unique_id] = storage_id
+    if not last_built:
+        return {}
+
+    result = context.instance.fetch_materializations(
+        AssetRecordsFilter(asset_key=AIRBYTE_SYNC_ASSET_KEY, after_storage_id=min(last_built.values())),
+        limit=MAX_SYNCS_CHECKED,
+    )
+    if result.has_more:
+        context.log.info(f"More than {MAX_SYNCS_CHECKED} Airbyte syncs since the last build, building every selected model")
+        return {}
+    syncs = [(record.storage_id, records_by_stream(record.asset_materialization.metadata)) for record in result.records]
+
+    skipped = {}
+    for unique_id, storage_id in last_built.items():
+        since_build = [stream_records for sync_id, stream_records in syncs if sync_id > storage_id]
+        stream_records = combined_stream_records(since_build)
+        # Without a sync since, or with one that has no counts, there is nothing to tell the model has no new data
+        if not since_build or stream_records is None:
+            continue
+        skipped.update(models_without_new_data(manifest_data, [unique_id], stream_records))
+    return skipped
+
+
+def recorded_fingerprints(
+    context: AssetExecutionContext,
+    translator: DagsterDbtTranslator,
+    model_ids: List[str],
+) -> Dict[str, str]:
+    """Fingerprints in the metadata of each model's latest materialization, for the models that have one."""
+    recorded = {}
+    for unique_id in model_ids:
+        event = context.instance.get_latest_materialization_event(translator.get_asset_key(manifest_data["nodes"][unique_id]))
+        value = event.asset_materialization.metadata.get(FINGERPRINT_METADATA_KEY) if event is not None else None
+        if value is not None:
+            recorded[unique_id] = getattr(value, "value", value)
+    return recorded
+
+
+def with_fingerprint(event: Any) -> Any:
+    """A model's output with the model's fingerprint added to its metadata, any other event as it is."""
+    if not isinstance(event, Output):
+        return event
+    unique_id = getattr(event.metadata.get("unique_id"), "value", None)
+    if unique_id not in manifest_data["nodes"]:
+        return event
+    fingerprint = MetadataValue.text(model_fingerprint(manifest_data["nodes"][unique_id]))
+    return event.with_metadata({**event.metadata, FINGERPRINT_METADATA_KEY: fingerprint})
+
+
+def target_adapter_type(resource: DbtCliResource) -> Optional[str]:
+    """Adapter type of the profiles.yml output that `resource` runs against."""
+    try:
+        project = yaml.safe_load(Path(resource.project_dir, "dbt_project.yml").read_text()) or {}
+        profiles = yaml.safe_load(Path(resource.profiles_dir or resource.project_dir, "profiles.yml").read_text()) or {}
+        profile = profiles[resource.profile or project["profile"]]
+        return profile["outputs"][resource.target or profile["target"]]["type"]
+    except (OSError, KeyError, TypeError, yaml.YAMLError):
+        return None
+
+
+def modified_models(dbt: Union[DbtCliResource, InProcessDbt], state_path: Path) -> Set[str]:
+    """Unique ids of the models selected by `state:modified+` against the stored state."""
+    invocation = dbt.cli([
+        "ls",
+        "--select", "state:modified+",
+        "--state", str(state_path),
+        "--resource-type", "model",
+        "--output", "json",
+        "--output-keys", "unique_id",
+    ])
+    modified = set()
+    for event in invocation.stream_raw_events():
+        if event.raw_event["info"]["name"] == "PrintEvent":
+            modified.add(json.loads(event.raw_event["data"]["msg"])["unique_id"])
+    return modified
+
 
-# Create a minimal manifest if it doesn't exist
-if not DBT_MANIFEST_PATH.exists():
-    create_minimal_manifest(DBT_MANIFEST_PATH)
-
-# Load the manifest to verify it's valid
-try:
-    with open(DBT_MANIFEST_PATH, 'r') as f:
-        manifest_data = json.load(f)
-    # If we got here, the manifest is valid JSON
-    print(f"Successfully loaded manifest from {DBT_MANIFEST_PATH}")
-except Exception as e:
-    print(f"Error loading manifest from {DBT_MANIFEST_PATH}: {str(e)}")
-    # Try to create a fresh manifest
-    create_minimal_manifest(DBT_MANIFEST_PATH)
-
-@dbt_assets(manifest=DBT_MANIFEST_PATH)
+def stream_concurrently(
+    invocations: List[Union[DbtCliInvocation, DbtRunnerInvocation]],
+    stream: Callable[[Any], Iterator[Any]],
+) -> Iterator[Any]:
+    """Events of dbt invocations running at the same time, in the order they arrive.
+
+    Each invocation is read with `stream` on its own thread so none of them
+    blocks on a full stdout pipe. The first error is raised once every
+    invocation has finished.
+    """
+    if len(invocations) == 1:
+        yield from stream(invocations[0])
+        return
+
+    events: "queue.Queue[Any]" = queue.Queue()
+    finished = object()
+    errors = []
+
+    def pump(invocation):
+        try:
+            for event in stream(invocation):
+                events.put(event)
+        except Exception as e:
+            errors.append(e)
+        finally:
+            events.put(finished)
+
+    for invocation in invocations:
+        threading.Thread(target=pump, args=(invocation,), daemon=True).start()
+
+    remaining = len(invocations)
+    try:
+        while remaining:
+            event = events.get()
+            if event is finished:
+                remaining -= 1
+            else:
+                yield event
+    finally:
+        # The run was interrupted: stop the dbt processes still going
+        for invocation in invocations:
+            if invocation.process.poll() is None:
+                invocation.process.terminate()
+    if errors:
+        raise errors[0]
+
+
+def failed_build_key(context: AssetExecutionContext, partition_vars: Optional[Dict[str, str]]) -> str:
+    key = context.op_execution_context.op.name
+    if partition_vars is not None:
+        key += f"[{partition_vars['start_date']}..{partition_vars['end_date']})"
+    return key
+
+
+def reused_results(
+    context: AssetExecutionContext,
+    translator: DagsterDbtTranslator,
+    model_ids: List[str],
+    statuses: Dict[str, str],
+    run_id: str,
+) -> Iterator[Any]:
+    """Outputs for models built in the failed run `run_id`, and check results for their passed tests."""
+    metadata = {"retried_from_run": MetadataValue.dagster_run(run_id)}
+    reused_keys = set()
+    for unique_id in model_ids:
+        asset_key = translator.get_asset_key(manifest_data["nodes"][unique_id])
+        reused_keys.add(asset_key)
+        yield Output(
+            None,
+            output_name=context.assets_def.get_output_name_for_asset_key(asset_key),
+            metadata={**metadata, "unique_id": MetadataValue.text(unique_id)},
+        )
+    for unique_id, status in statuses.items():
+        if status != "pass" or unique_id not in manifest_data["nodes"]:
+            continue
+        check_key = get_asset_check_key_for_test(manifest_data, translator, unique_id, project=None)
+        if check_key is not None and check_key.asset_key in reused_keys and check_key in context.selected_asset_check_keys:
+            yield AssetCheckResult(passed=True, asset_key=check_key.asset_key, check_name=check_key.name, metadata=metadata)
+
+
+def timing_observations(translator: DagsterDbtTranslator, timings: List[Dict[str, Any]]) -> Iterator[AssetObservation]:
+    """One observation per built model with its timing from `run_results.json` and those of its tests."""
+    tests: Dict[str, List[Dict[str, Any]]] = {}
+    for timing in timings:
+        node = manifest_data["nodes"].get(timing["unique_id"], {})
+        if node.get("resource_type") == "test" and node.get("attached_node"):
+            tests.setdefault(node["attached_node"], []).append({**timing, "name": node["name"]})
+
+    for timing in timings:
+        node = manifest_data["nodes"].get(timing["unique_id"], {})
+        if node.get("resource_type") != "model":
+            continue
+        model_tests = tests.get(timing["unique_id"], [])
+        metadata = {
+            "status": MetadataValue.text(str(timing["status"])),
+            "execution_time_seconds": MetadataValue.float(float(timing["execution_time"])),
+            "adapter_response": MetadataValue.json(timing["adapter_response"]),
+            "runtime_regression": MetadataValue.bool(timing["regression"]),
+            "tests_execution_time_seconds": MetadataValue.float(float(sum(test["execution_time"] for test in model_tests))),
+        }
+        if timing["rows_affected"] is not None:
+            metadata["rows_affected"] = MetadataValue.int(int(timing["rows_affected"]))
+        if timing["baseline"] is not None:
+            metadata["baseline_seconds"] = MetadataValue.float(float(timing["baseline"]))
+        if model_tests:
+            metadata["test_timings"] = MetadataValue.json({
+                test["name"]: {"status": test["status"], "execution_time": test["execution_time"], "regression": test["regression"]}
+                for test in model_tests
+            })
+        yield AssetObservation(
+            asset_key=translator.get_asset_key(node),
+            description="dbt build timing",
+            metadata=metadata,
+        )
+
+
+def build_models(
+    context: AssetExecutionContext,
+    config: DbtBuildConfig,
+    dbt: DbtCliResource,
+    partition_vars: Optional[Dict[str, str]] = None,
+) -> Iterator[Any]:
+    """`dbt build` of the selected models, as configured by `config`.
+
+    With `partition_vars`, the models only rebuild the rows of that partition
+    window, so they are never fully refreshed: that would drop every other
+    partition.
+    """
+    if config.mode not in DBT_BUILD_MODES:
+        raise ValueError(f"Unknown dbt build mode {config.mode!r}, expected one of {', '.join(DBT_BUILD_MODES)}")
+    if config.log_verbosity not in DBT_LOG_VERBOSITY:
+        raise ValueError(f"Unknown dbt log verbosity {config.log_verbosity!r}, expected one of {', '.join(DBT_LOG_VERBOSITY)}")
+    if config.backend not in DBT_BACKENDS:
+        raise ValueError(f"Unknown dbt backend {config.backend!r}, expected one of {', '.join(DBT_BACKENDS)}")
+    runner = InProcessDbt(dbt) if config.backend == "runner" else dbt
+
+    args = ["build"]
+    translator = WeatherDbtTranslator()
+    model_ids = selected_models(context, translator)
+
+    failed_builds = FailedBuildStore()
+    build_key = failed_build_key(context, partition_vars)
+    failed = failed_builds.load(build_key)
+
+    # A backfill rebuilds its partitions whatever the syncs loaded, and the nodes
+    # of the last failed build are built again until a build of them succeeds
+    backfill = partition_vars is not None and "dagster/backfill" in context.run.tags
+    keep = set(failed["statuses"]) if failed is not None else set()
+    skipped = plan_skipped_models(context, model_ids, keep) if config.skip_unchanged and not backfill else {}
+    retry = failed is not None and (config.retry_failed or context.run.parent_run_id == failed["run_id"])
+    reused = []
+    if retry:
+        reused = [
+            unique_id for unique_id in reusable_models(manifest_data, model_ids, failed["statuses"])
+            if unique_id not in skipped
+        ]
+        context.log.info(f"Retrying the failed build of run {failed['run_id']}: "
+                         f"{len(reused)} models built by that run are not run again")
+        reused_events = reused_results(context, translator, reused, failed["statuses"], failed["run_id"])
+        yield from reused_events if partition_vars is not None else map(with_fingerprint, reused_events)
+    elif config.retry_failed:
+        context.log.info("No failed dbt build to retry, building every selected model")
+
+    artifacts = DbtArtifactStore()
+    if config.only_modified and retry:
+        context.log.info("Retrying a failed build, only_modified does not apply")
+    elif config.only_modified:
+        if artifacts.has_state():
+            modified = modified_models(runner, artifacts.path)
+            for unique_id in model_ids:
+                if unique_id not in modified:
+                    skipped.setdefault(unique_id, "Unchanged since the last successful build")
+            # Unchanged parents are read from where the last successful build left them
+            args += ["--defer", "--state", str(artifacts.path)]
+        else:
+            context.log.info("No stored dbt state yet, building every selected model")
+
+    for unique_id, reason in skipped.items():
+        node = manifest_data["nodes"][unique_id]
+        context.log.info(f"Skipping {node['name']}: {reason}")
+        yield AssetObservation(
+            asset_key=translator.get_asset_key(node),
+            description="dbt model skipped",
+            metadata={"skip_reason": MetadataValue.text(reason)},
+        )
+
+    left_out = set(skipped) | set(reused)
+    if model_ids and len(left_out) == len(model_ids):
+        context.log.info("No selected model needs building, skipping dbt build")
+        if retry:
+            # Nothing ran, so the failed build stays recorded until its nodes are built again
+            context.log.info(f"The failed build of run {failed['run_id']} has no selected node left to retry")
+        return
+    if left_out:
+        # Excluding a model also excludes its tests
+        args += ["--exclude", " ".join(sorted(manifest_data["nodes"][unique_id]["name"] for unique_id in left_out))]
+
+    dbt_vars = dict(partition_vars or {})
+    if partition_vars is not None:
+        if config.mode == "full-refresh":
+            window = f"{partition_vars['start_date']} to {partition_vars['end_date']} (excluded)"
+            context.log.info(f"Rebuilding {window} only, a full refresh would drop the other partitions")
+    elif config.mode == "full-refresh":
+        args.append("--full-refresh")
+    elif config.mode == "auto":
+        recorded = recorded_fingerprints(context, translator, model_ids)
+        changed = [manifest_data["nodes"][unique_id]["name"] for unique_id in changed_models(manifest_data, model_ids, recorded)]
+        if changed:
+            context.log.info(f"Full refresh for models changed since their last build: {', '.join(changed)}")
+            # Picked up by the should_full_refresh() override in weather_project/macros
+            dbt_vars["full_refresh_models"] = changed
+    if dbt_vars:
+        args += ["--vars", json.dumps(dbt_vars)]
+
+    to_build = [unique_id for unique_id in model_ids if unique_id not in left_out]
+    parallel = config.parallel_subgraphs
+    if parallel and config.backend == "runner":
+        context.log.info("The in-process dbt runner runs one command at a time, building every model in one invocation")
+        parallel = False
+    elif parallel and target_adapter_type(dbt) in SINGLE_WRITER_ADAPTERS:
+        context.log.info(f"{target_adapter_type(dbt)} takes one writer at a time, building every model in one invocation")
+        parallel = False
+    if parallel and to_build:
+        runs = plan_subgraph_runs(manifest_data, to_build, config.max_threads)
+    else:
+        runs = [(to_build, max(1, min(config.max_threads, graph_width(manifest_data, to_build))))]
+
+    invocations = []
+    for models, threads in runs:
+        run_args = list(args)
+        others = set(to_build) - set(models)
+        if others:
+            run_args += ["--exclude", " ".join(sorted(manifest_data["nodes"][unique_id]["name"] for unique_id in others))]
+        run_args += ["--threads", str(threads)]
+        if len(runs) > 1:
+            context.log.info(f"Building {len(models)} independent models with {threads} threads: "
+                             f"{', '.join(sorted(manifest_data['nodes'][unique_id]['name'] for unique_id in models))}")
+        invocations.append(runner.cli(run_args, context=context))
+
+    timing_store = NodeTimingStore()
+    timings = []
+    statuses = dict(failed["statuses"]) if retry else {}
+    succeeded = False
+    try:
+        events = stream_concurrently(
+            invocations,
+            lambda invocation: (
+                invocation.stream_events(context.log, verbosity=config.log_verbosity, batch_size=config.log_batch_size)
+                if isinstance(invocation, DbtRunnerInvocation)
+                else stream_dbt_events(invocation, context.log, verbosity=config.log_verbosity, batch_size=config.log_batch_size)
+            ),
+        )
+        # A partition's build leaves the other partitions as they were, so the models are not up to date yet
+        yield from events if partition_vars is not None else map(with_fingerprint, events)
+        succeeded = True
+    finally:
+        # Also keep the models that succeeded when others failed
+        for invocation in invocations:
+            if invocation.target_path.joinpath("run_results.json").exists():
+                run_results = invocation.get_artifact("run_results.json")
+                statuses.update(node_statuses(run_results))
+                timings += timing_store.record(
+                    run_results,
+                    factor=config.regression_factor,
+                    window=config.regression_baseline_runs,
+                    min_seconds=config.regression_min_seconds,
+                )
+        # A retry starts from the failed build's statuses: a failed node that did not run again keeps it recorded
+        if succeeded and not retryable_nodes(statuses):
+            failed_builds.clear(build_key)
+        elif not succeeded and statuses:
+            failed_builds.record(build_key, context.run_id, statuses)
+        for timing in timings:
+            if timing["regression"]:
+                context.log.warning(
+                    f"{timing['unique_id']} took {timing['execution_time']:.1f}s, "
+                    f"{timing['execution_time'] / timing['baseline']:.1f}x its baseline of {timing['baseline']:.1f}s"
+                )
+
+    yield from timing_observations(translator, timings)
+
+    # Only reached when the build succeeded. A partition's build leaves the
+    # other partitions as they were, so it is not a state to compare against
+    if partition_vars is not None:
+        return
+    not_built = set(skipped) | {
+        unique_id for unique_id, node in manifest_data["nodes"].items()
+        if node["resource_type"] == "model" and unique_id not in model_ids
+    }
+    artifacts.save([invocation.target_path for invocation in invocations], not_built=not_built)
+
+
+@dbt_assets(
+    manifest=manifest_data,
+    dagster_dbt_translator=WeatherDbtTranslator(),
+    exclude=f"{DAILY_MARTS_SELECT} {DAILY_RECORDS_SELECT}",
+)
 def weather_project_dbt_assets(
     context: AssetExecutionContext,
+    config: DbtBuildConfig,
     dbt: ResourceParam[DbtCliResource]  # Explicitly mark as a resource, not an asset input
 ):
     """Minimal, robust Dagster/dbt asset integration. Let dagster-dbt handle orchestration."""
-    yield from dbt.cli(["build", "--full-refresh"], context=context).stream()
+    yield from build_models(context, config, dbt)
+
+
+@dbt_assets(
+    manifest=manifest_data,
+    dagster_dbt_translator=WeatherDbtTranslator(),
+    select=DAILY_MARTS_SELECT,
+    name="weather_daily_marts",
+    partitions_def=daily_partitions,
+    # Backfills run one week per run, as many at once as the pool allows
+    backfill_policy=BackfillPolicy.multi_run(DAILY_MARTS_PARTITIONS_PER_RUN),
+    pool=DAILY_MARTS_POOL,
+)
+def weather_daily_marts(
+    context: AssetExecutionContext,
+    config: DbtBuildConfig,
+    dbt: ResourceParam[DbtCliResource]
+):
+    """Date-grain marts, each run building the rows of its partition window."""
+    yield from build_models(context, config, dbt, partition_vars=partition_window_vars(context))
+
 
+@dbt_assets(
+    manifest=manifest_data,
+    dagster_dbt_translator=WeatherDbtTranslator(),
+    select=DAILY_RECORDS_SELECT,
+    name="weather_daily_records",
+)
+def weather_daily_records(
+    context: AssetExecutionContext,
+    config: DbtBuildConfig,
+    dbt: ResourceParam[DbtCliResource]
+):
+    """Records across every date of the date-grain marts, rebuilt whole in the runs of `weather_daily_marts`."""
+    yield from build_models(context, config, dbt)
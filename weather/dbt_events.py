@@ -0,0 +1,171 @@
+import json
+import logging
+import sys
+from collections import Counter, deque
+from typing import Any, Dict, Iterable, Iterator, List, Union
+
+from dagster_dbt import DagsterDbtCliRuntimeError, DbtCliInvocation
+from dagster_dbt.core.dbt_cli_event import DbtCoreCliEventMessage
+
+# How much of dbt's own log reaches Dagster:
+#   "debug": every line to stdout (the compute logs), as dagster-dbt does
+#   "info": warnings and errors one by one, node results in batches, the rest counted
+#   "warn": warnings and errors one by one, everything else counted
+DBT_LOG_VERBOSITY = ("debug", "info", "warn")
+
+# Per-node result lines: "1 of 8 OK created sql incremental model ..."
+RESULT_EVENT_NAMES = ("LogModelResult", "LogTestResult", "LogSeedResult", "LogSnapshotResult")
+
+
+def parse_dbt_line(line: Union[bytes, str]) -> Union[Dict[str, Any], str]:
+    """A structured dbt log event from one line of `--log-format json` output, or the line itself."""
+    text = line.decode(errors="replace").strip() if isinstance(line, bytes) else line.strip()
+    try:
+        event = json.loads(text)
+    except json.JSONDecodeError:
+        return text
+    if not isinstance(event, dict) or "info" not in event or "data" not in event:
+        return text
+    return event
+
+
+class DbtLogSummarizer:
+    """Routes dbt's log lines to a logger at a verbosity level, in constant memory.
+
+    Only counters, the current batch of result lines, a bounded number of
+    warning and error messages and the last `tail_size` lines are kept.
+    """
+
+    def __init__(
+        self,
+        log: logging.Logger,
+        verbosity: str = "info",
+        batch_size: int = 50,
+        max_messages: int = 100,
+        tail_size: int = 20,
+        stdout=None,
+    ):
+        if verbosity not in DBT_LOG_VERBOSITY:
+            raise ValueError(f"Unknown dbt log verbosity {verbosity!r}, expected one of {', '.join(DBT_LOG_VERBOSITY)}")
+        self.log = log
+        self.verbosity = verbosity
+        self.batch_size = batch_size
+        self.max_messages = max_messages
+        self.stdout = stdout or sys.stdout
+        self.levels: Counter = Counter()
+        self.statuses: Counter = Counter()
+        self.messages_logged = 0
+        self.errors: List[str] = []
+        self.tail: deque = deque(maxlen=tail_size)
+        self._batch: List[str] = []
+
+    def handle(self, event: Union[Dict[str, Any], str]) -> None:
+        if isinstance(event, str):
+            level, name, message = "info", None, event
+        else:
+            info = event["info"]
+            level, name, message = info.get("level", "info"), info.get("name"), info.get("msg", "")
+            if name in RESULT_EVENT_NAMES:
+                self.statuses[event["data"].get("status") or event["data"].get("node_info", {}).get("node_status")] += 1
+        self.levels[level] += 1
+        self.tail.append(message)
+
+        if self.verbosity == "debug":
+            self.stdout.write(message + "\n")
+        if level == "error":
+            if len(self.errors) < self.max_messages:
+                self.errors.append(message)
+            self._log_message(self.log.error, message)
+        elif level == "warn":
+            self._log_message(self.log.warning, message)
+        elif name in RESULT_EVENT_NAMES and self.verbosity == "info":
+            self._batch.append(message)
+            if len(self._batch) >= self.batch_size:
+                self.flush()
+
+    def _log_message(self, log_fn, message: str) -> None:
+        # Past max_messages, warnings and errors are only counted in the summary
+        if self.messages_logged < self.max_messages:
+            log_fn(message)
+            self.messages_logged += 1
+
+    def flush(self) -> None:
+        if self._batch:
+            self.log.info("\n".join(self._batch))
+            self._batch = []
+
+    def summary(self) -> str:
+        statuses = ", ".join(f"{count} {status}" for status, count in self.statuses.most_common())
+        return (
+            f"dbt emitted {sum(self.levels.values())} log lines "
+            f"({', '.join(f'{count} {level}' for level, count in self.levels.most_common())}); "
+            f"node results: {statuses or 'none'}"
+        )
+
+
+def dagster_events(
+    raw_events: Iterable[Union[Dict[str, Any], str]],
+    invocation: Any,
+    summarizer: DbtLogSummarizer,
+) -> Iterator[Any]:
+    """Dagster events for the node results among `raw_events`, every event going through `summarizer`.
+
+    `invocation` provides the manifest, translator, context, target path and
+    project the events are converted with.
+    """
+    for event in raw_events:
+        summarizer.handle(event)
+        # Only node results become Dagster events
+        if isinstance(event, str) or event["info"].get("name") not in RESULT_EVENT_NAMES:
+            continue
+        # Nodes missing from the assets' manifest, like the `palma` seed of the duckdb target, have no assets
+        if event["data"].get("node_info", {}).get("unique_id") not in invocation.manifest["nodes"]:
+            continue
+        message = DbtCoreCliEventMessage(raw_event=event, event_history_metadata={})
+        if message.is_result_event:
+            yield from message.to_default_asset_events(
+                manifest=invocation.manifest,
+                dagster_dbt_translator=invocation.dagster_dbt_translator,
+                context=invocation.context,
+                target_path=invocation.target_path,
+                project=invocation.project,
+            )
+
+
+def stream_dbt_events(
+    invocation: DbtCliInvocation,
+    log: logging.Logger,
+    verbosity: str = "info",
+    batch_size: int = 50,
+) -> Iterator[Any]:
+    """Dagster events of a dbt invocation, yielded as soon as dbt reports each node.
+
+    Replaces `invocation.stream()`, which writes every dbt log line to stdout
+    and keeps every error message. Here the log lines go through
+    `DbtLogSummarizer`, and each line is dropped once it has been handled.
+    """
+    summarizer = DbtLogSummarizer(log, verbosity=verbosity, batch_size=batch_size)
+    process = invocation.process
+    finished = False
+    try:
+        yield from dagster_events((parse_dbt_line(line) for line in process.stdout), invocation, summarizer)
+        finished = True
+    finally:
+        summarizer.flush()
+        if not finished and process.poll() is None:
+            # The run was interrupted before dbt finished
+            process.terminate()
+        process.stdout.close()
+    process.wait()
+    log.info(summarizer.summary())
+
+    if process.returncode != 0 and invocation.raise_on_error:
+        raise DagsterDbtCliRuntimeError(description=failure_description(
+            f"The dbt CLI process with command `{invocation.dbt_command}` failed with exit code `{process.returncode}`.",
+            invocation.target_path,
+            summarizer.errors or list(summarizer.tail),
+        ))
+
+
+def failure_description(headline: str, target_path, messages: Iterable[str]) -> str:
+    return "\n\n".join([f"{headline} The full dbt log is in {target_path / 'dbt.log'}.", *messages])
@@ -0,0 +1,262 @@
+import json
+import logging
+import os
+import queue
+import shutil
+import tempfile
+import threading
+import uuid
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+
+from dagster import AssetExecutionContext
+from dagster_dbt import DagsterDbtCliRuntimeError, DagsterDbtTranslator, DbtCliResource
+from dagster_dbt.asset_utils import extract_runtime_selection_from_args, get_updated_cli_invocation_params_for_context
+from dagster_dbt.core.dbt_cli_event import DbtCoreCliEventMessage
+
+from .constants import DBT_PARSE_CACHE_DIR
+from .dbt_events import DbtLogSummarizer, dagster_events, failure_description
+
+PARTIAL_PARSE_FILE_NAME = "partial_parse.msgpack"
+# Directories of the dbt project that are not part of the project itself
+NON_PROJECT_DIRS = {"target", "logs", "dbt_packages"}
+
+# dbt keeps global state (flags, adapters), so one command runs at a time per process
+_dbt_lock = threading.Lock()
+# Parsed manifest per (project dir, profiles dir, profile, target, vars), with the project state it was parsed from
+_warm_manifests: Dict[Tuple[str, ...], Tuple[Tuple, Any]] = {}
+
+_FINISHED = object()
+
+
+def project_state(project_dir: Path) -> Tuple:
+    """Path, mtime and size of every project file: changes when any of them is edited."""
+    state = []
+    for root, dirs, files in os.walk(project_dir):
+        dirs[:] = sorted(d for d in dirs if d not in NON_PROJECT_DIRS)
+        for name in sorted(files):
+            path = Path(root, name)
+            stat = path.stat()
+            state.append((str(path.relative_to(project_dir)), stat.st_mtime_ns, stat.st_size))
+    return tuple(state)
+
+
+def vars_arg(args: Sequence[str]) -> Optional[str]:
+    """The value of the last `--vars` in dbt arguments, which dbt renders the project with."""
+    value = None
+    for i, arg in enumerate(args):
+        if arg == "--vars" and i + 1 < len(args):
+            value = args[i + 1]
+        elif arg.startswith("--vars="):
+            value = arg[len("--vars="):]
+    return value
+
+
+class PartialParseCache:
+    """dbt's `partial_parse.msgpack`, kept in a directory that outlives target directories and containers.
+
+    dbt checks the file against the project, dbt version, profile and vars
+    itself, and parses from scratch when it does not match.
+    """
+
+    def __init__(self, path: str = DBT_PARSE_CACHE_DIR):
+        self.path = Path(path) / PARTIAL_PARSE_FILE_NAME
+
+    def restore(self, target_path: Path) -> bool:
+        destination = target_path / PARTIAL_PARSE_FILE_NAME
+        if not self.path.exists() or destination.exists():
+            return False
+        target_path.mkdir(parents=True, exist_ok=True)
+        shutil.copy(self.path, destination)
+        return True
+
+    def save(self, target_path: Path) -> None:
+        source = target_path / PARTIAL_PARSE_FILE_NAME
+        if not source.exists():
+            return
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            # Copy next to the cache first so concurrent readers never see a partial file
+            fd, tmp_path = tempfile.mkstemp(dir=self.path.parent, suffix=".tmp")
+            os.close(fd)
+            shutil.copy(source, tmp_path)
+            os.replace(tmp_path, self.path)
+        except OSError:
+            pass
+
+
+class DbtRunnerInvocation:
+    """A dbt command running on dbt's programmatic runner in a background thread.
+
+    Has what the dbt assets use from `DbtCliInvocation`: `target_path`,
+    `get_artifact()`, `stream_raw_events()`, and `stream_events()` in place of
+    `stream_dbt_events()`. dbt's events are handed over through a bounded
+    queue, so a slow consumer holds dbt back instead of piling up events.
+    """
+
+    def __init__(
+        self,
+        args: List[str],
+        warm_manifest,
+        manifest: Dict[str, Any],
+        dagster_dbt_translator,
+        context: Optional[AssetExecutionContext],
+        target_path: Path,
+        project=None,
+        raise_on_error: bool = True,
+        queue_size: int = 1000,
+    ):
+        self.args = args
+        self.manifest = manifest
+        self.dagster_dbt_translator = dagster_dbt_translator
+        self.context = context
+        self.target_path = target_path
+        self.project = project
+        self.raise_on_error = raise_on_error
+        self.success: Optional[bool] = None
+        self.exception: Optional[BaseException] = None
+        self._warm_manifest = warm_manifest
+        self._events: "queue.Queue[Any]" = queue.Queue(maxsize=queue_size)
+        self._abandoned = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="dbt-runner", daemon=True)
+        self._thread.start()
+
+    def _on_event(self, message) -> None:
+        from dbt_common.events.functions import msg_to_dict
+
+        if not self._abandoned.is_set():
+            self._events.put(msg_to_dict(message))
+
+    def _run(self) -> None:
+        from dbt.cli.main import dbtRunner
+
+        try:
+            with _dbt_lock:
+                result = dbtRunner(manifest=self._warm_manifest(self._on_event), callbacks=[self._on_event]).invoke(self.args)
+            self.success, self.exception = result.success, result.exception
+        except BaseException as e:
+            self.success, self.exception = False, e
+        finally:
+            self._events.put(_FINISHED)
+
+    def _raw_events(self) -> Iterator[Dict[str, Any]]:
+        try:
+            while True:
+                event = self._events.get()
+                if event is _FINISHED:
+                    break
+                yield event
+        finally:
+            # Stop queueing when the consumer went away; dbt itself finishes its command in the background
+            self._abandoned.set()
+            while not self._events.empty():
+                self._events.get_nowait()
+        self._thread.join()
+
+    def _raise_on_error(self, messages: Sequence[str]) -> None:
+        if self.success or not self.raise_on_error:
+            return
+        headline = f"The in-process dbt command `dbt {' '.join(self.args)}` failed"
+        if self.exception is not None:
+            headline += f" with {self.exception!r}"
+        raise DagsterDbtCliRuntimeError(description=failure_description(headline + ".", self.target_path, messages))
+
+    def stream_raw_events(self) -> Iterator[DbtCoreCliEventMessage]:
+        for event in self._raw_events():
+            yield DbtCoreCliEventMessage(raw_event=event, event_history_metadata={})
+        self._raise_on_error([])
+
+    def stream_events(self, log: logging.Logger, verbosity: str = "info", batch_size: int = 50) -> Iterator[Any]:
+        summarizer = DbtLogSummarizer(log, verbosity=verbosity, batch_size=batch_size)
+        try:
+            yield from dagster_events(self._raw_events(), self, summarizer)
+        finally:
+            summarizer.flush()
+        log.info(summarizer.summary())
+        self._raise_on_error(summarizer.errors or list(summarizer.tail))
+
+    def get_artifact(self, artifact: str) -> Dict[str, Any]:
+        return json.loads(self.target_path.joinpath(artifact).read_text())
+
+
+class InProcessDbt:
+    """Runs dbt commands on dbt's programmatic runner in this process, as `DbtCliResource.cli` does in a subprocess.
+
+    The parsed project stays in memory across commands until a project file
+    changes, and `partial_parse.msgpack` is kept in a cache directory, so that
+    the first parse of a new process or container is partial too.
+    """
+
+    def __init__(self, resource: DbtCliResource, cache: Optional[PartialParseCache] = None):
+        self.resource = resource
+        self.cache = cache or PartialParseCache()
+
+    def _common_args(self, project_dir: Path, target_path: Path) -> List[str]:
+        args = ["--project-dir", str(project_dir), "--target-path", str(target_path), "--log-path", str(target_path)]
+        if self.resource.profiles_dir:
+            args += ["--profiles-dir", self.resource.profiles_dir]
+        if self.resource.profile:
+            args += ["--profile", self.resource.profile]
+        if self.resource.target:
+            args += ["--target", self.resource.target]
+        # Log lines only reach Dagster through the callbacks; dbt.log still gets everything
+        return args + ["--log-level", "none", "--no-send-anonymous-usage-stats"]
+
+    def _warm_manifest_loader(self, project_dir: Path, target_path: Path, dbt_vars: Optional[str]):
+        def load(on_event):
+            from dbt.cli.main import dbtRunner
+
+            key = (str(project_dir), str(self.resource.profiles_dir), str(self.resource.profile), str(self.resource.target), str(dbt_vars))
+            state = project_state(project_dir)
+            cached = _warm_manifests.get(key)
+            if cached is not None and cached[0] == state:
+                return cached[1]
+
+            self.cache.restore(target_path)
+            parse_args = ["parse", *self._common_args(project_dir, target_path)]
+            if dbt_vars is not None:
+                # Vars used at parse time, like the source's `raw_palma_table`, end up in the manifest
+                parse_args += ["--vars", dbt_vars]
+            result = dbtRunner(callbacks=[on_event]).invoke(parse_args)
+            if not result.success:
+                raise RuntimeError(f"dbt parse failed: {result.exception!r}")
+            self.cache.save(target_path)
+            _warm_manifests[key] = (state, result.result)
+            return result.result
+
+        return load
+
+    def cli(
+        self,
+        args: Sequence[str],
+        *,
+        context: Optional[AssetExecutionContext] = None,
+        raise_on_error: bool = True,
+    ) -> DbtRunnerInvocation:
+        cleaned_args, runtime_selects, runtime_excludes = extract_runtime_selection_from_args(args)
+        params = get_updated_cli_invocation_params_for_context(
+            context=context,
+            manifest={},
+            dagster_dbt_translator=DagsterDbtTranslator(),
+            runtime_selects=runtime_selects,
+            runtime_excludes=runtime_excludes,
+        )
+        project_dir = Path(params.dbt_project.project_dir if params.dbt_project else self.resource.project_dir)
+        unique_id = str(uuid.uuid4())[:7]
+        if context is not None:
+            unique_id = f"{context.op_execution_context.op.name}-{context.run.run_id[:7]}-{unique_id}"
+        target_path = project_dir / "target" / unique_id
+
+        dbt_args = [*cleaned_args, *params.selection_args, *self._common_args(project_dir, target_path)]
+        if params.indirect_selection:
+            dbt_args += ["--indirect-selection", params.indirect_selection]
+        return DbtRunnerInvocation(
+            dbt_args,
+            warm_manifest=self._warm_manifest_loader(project_dir, target_path, vars_arg(cleaned_args)),
+            manifest=params.manifest,
+            dagster_dbt_translator=params.dagster_dbt_translator,
+            context=context,
+            target_path=target_path,
+            project=params.dbt_project,
+            raise_on_error=raise_on_error,
+        )
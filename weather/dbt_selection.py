@@ -0,0 +1,146 @@
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+from .constants import AIRBYTE_SOURCE_NAME
+
+
+def node_parents(manifest: Dict[str, Any], unique_id: str) -> Iterable[str]:
+    parent_map = manifest.get("parent_map") or {}
+    if unique_id in parent_map:
+        return parent_map[unique_id]
+    node = manifest.get("nodes", {}).get(unique_id, {})
+    return node.get("depends_on", {}).get("nodes", [])
+
+
+def source_ancestors(manifest: Dict[str, Any], unique_id: str) -> Set[str]:
+    """Unique ids of every source the node reads from, directly or through other models."""
+    sources, seen, to_visit = set(), set(), [unique_id]
+    while to_visit:
+        current = to_visit.pop()
+        for parent in node_parents(manifest, current):
+            if parent in seen:
+                continue
+            seen.add(parent)
+            if parent.startswith("source."):
+                sources.add(parent)
+            else:
+                to_visit.append(parent)
+    return sources
+
+
+def records_by_stream(metadata: Dict[str, Any]) -> Optional[Dict[str, int]]:
+    """Per-stream record counts from the metadata of an Airbyte sync materialization.
+
+    Returns None for materializations recorded without record counts.
+    """
+    if "total_records" not in metadata:
+        return None
+    return {
+        key[len("records_"):].lower(): getattr(value, "value", value)
+        for key, value in metadata.items()
+        if key.startswith("records_")
+    }
+
+
+def combined_stream_records(syncs: Iterable[Optional[Dict[str, int]]]) -> Optional[Dict[str, int]]:
+    """Per-stream record counts summed over several syncs, from `records_by_stream` of each.
+
+    Returns None when one of the syncs has no counts. A stream missing from
+    any of the syncs is left out, so it counts as unknown.
+    """
+    combined: Optional[Dict[str, int]] = None
+    for stream_records in syncs:
+        if stream_records is None:
+            return None
+        if combined is None:
+            combined = dict(stream_records)
+        else:
+            combined = {
+                stream: count + stream_records[stream]
+                for stream, count in combined.items()
+                if stream in stream_records
+            }
+    return combined
+
+
+def models_without_new_data(
+    manifest: Dict[str, Any],
+    model_ids: Iterable[str],
+    stream_records: Dict[str, int],
+) -> Dict[str, str]:
+    """Models whose Airbyte sources received no records, with the reason to skip each one.
+
+    A model only qualifies when every source it reads from is loaded by Airbyte
+    and the sync reported 0 records for each of them; models reading from other
+    sources, from none, or from a stream missing from the counts are kept.
+    """
+    skipped = {}
+    for unique_id in model_ids:
+        sources = source_ancestors(manifest, unique_id)
+        if not sources:
+            continue
+        source_nodes = [manifest.get("sources", {}).get(source_id, {}) for source_id in sources]
+        if any(node.get("source_name") != AIRBYTE_SOURCE_NAME for node in source_nodes):
+            continue
+        # A stream the sync did not report on may have new records
+        if any(stream_records.get(node.get("name", "").lower()) != 0 for node in source_nodes):
+            continue
+        tables = ", ".join(sorted(f"{node['source_name']}.{node['name']}" for node in source_nodes))
+        skipped[unique_id] = f"No new records loaded into {tables}"
+    return skipped
+
+
+def independent_subgraphs(manifest: Dict[str, Any], model_ids: Iterable[str]) -> List[List[str]]:
+    """Split models into groups with no dependency between groups, largest first.
+
+    Models are grouped with their parents and children within `model_ids`, and
+    with the other models a test reads from, so every test stays whole.
+    """
+    model_ids = list(model_ids)
+    group_of = {unique_id: unique_id for unique_id in model_ids}
+
+    def find(unique_id):
+        while group_of[unique_id] != unique_id:
+            group_of[unique_id] = group_of[group_of[unique_id]]
+            unique_id = group_of[unique_id]
+        return unique_id
+
+    def join(ids):
+        ids = [unique_id for unique_id in ids if unique_id in group_of]
+        for other in ids[1:]:
+            group_of[find(other)] = find(ids[0])
+
+    for unique_id in model_ids:
+        join([unique_id, *node_parents(manifest, unique_id)])
+    for node in manifest.get("nodes", {}).values():
+        if node.get("resource_type") == "test":
+            join(node.get("depends_on", {}).get("nodes", []))
+
+    groups: Dict[str, List[str]] = {}
+    for unique_id in model_ids:
+        groups.setdefault(find(unique_id), []).append(unique_id)
+    return sorted(groups.values(), key=len, reverse=True)
+
+
+def graph_width(manifest: Dict[str, Any], model_ids: Iterable[str]) -> int:
+    """Most models that can run at the same time: the largest number of models at one depth."""
+    model_ids = set(model_ids)
+    depths: Dict[str, int] = {}
+
+    def depth(unique_id):
+        if unique_id not in depths:
+            parents = [parent for parent in node_parents(manifest, unique_id) if parent in model_ids]
+            depths[unique_id] = 1 + max((depth(parent) for parent in parents), default=-1)
+        return depths[unique_id]
+
+    per_depth: Dict[int, int] = {}
+    for unique_id in model_ids:
+        per_depth[depth(unique_id)] = per_depth.get(depth(unique_id), 0) + 1
+    return max(per_depth.values(), default=1)
+
+
+def plan_subgraph_runs(manifest: Dict[str, Any], model_ids: Iterable[str], max_threads: int) -> List[Tuple[List[str], int]]:
+    """One (models, threads) pair per independent subgraph, threads sized to the subgraph's width."""
+    return [
+        (group, max(1, min(max_threads, graph_width(manifest, group))))
+        for group in independent_subgraphs(manifest, model_ids)
+    ]
@@ -0,0 +1,145 @@
+import hashlib
+import json
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional
+
+from .constants import DBT_ARTIFACTS_DIR, DBT_FAILED_BUILDS_PATH
+from .json_store import JsonFileStore, read_json, write_json
+
+# Model config keys that change the shape or identity of an incremental table
+FINGERPRINT_CONFIG_KEYS = ("materialized", "unique_key", "incremental_strategy", "on_schema_change", "contract")
+# Materialization metadata holding the fingerprint of the model as it was built
+FINGERPRINT_METADATA_KEY = "dbt_model_fingerprint"
+# Node statuses that `dbt retry` runs again
+RETRYABLE_STATUSES = ("error", "fail", "skipped", "runtime error", "partial success")
+
+
+def model_fingerprint(node: Dict[str, Any]) -> str:
+    """Hash of a model's SQL, declared columns and table-shaping config."""
+    config = node.get("config", {})
+    payload = {
+        "sql": node.get("checksum", {}).get("checksum") or node.get("raw_code", ""),
+        "columns": sorted(
+            (name, column.get("data_type")) for name, column in node.get("columns", {}).items()
+        ),
+        "config": {key: config.get(key) for key in FINGERPRINT_CONFIG_KEYS},
+    }
+    return hashlib.sha256(json.dumps(payload, sort_keys=True, default=str).encode()).hexdigest()
+
+
+def is_incremental(node: Dict[str, Any]) -> bool:
+    return node.get("config", {}).get("materialized") == "incremental"
+
+
+def changed_models(manifest: Dict[str, Any], model_ids: Iterable[str], recorded: Dict[str, str]) -> List[str]:
+    """Incremental models whose fingerprint differs from the one `recorded` for their last build.
+
+    A model without a recorded fingerprint, never built or built before
+    fingerprints were recorded, is not counted as changed: an incremental
+    build creates its table when there is none.
+    """
+    return [
+        unique_id for unique_id in model_ids
+        if is_incremental(manifest["nodes"][unique_id])
+        and unique_id in recorded
+        and recorded[unique_id] != model_fingerprint(manifest["nodes"][unique_id])
+    ]
+
+
+class DbtArtifactStore:
+    """`manifest.json` and `run_results.json` of the last successful dbt build.
+
+    The directory is what `--state` expects, so `state:modified` compares the
+    project against the models as they were last built.
+    """
+
+    def __init__(self, path: str = DBT_ARTIFACTS_DIR):
+        self.path = Path(path)
+
+    def has_state(self) -> bool:
+        return (self.path / "manifest.json").exists()
+
+    def load(self, name: str) -> Optional[Dict[str, Any]]:
+        return read_json(self.path / name)
+
+    def save(self, target_paths: Iterable[Path], not_built: Iterable[str] = ()) -> None:
+        """Store the artifacts of a successful build from the target directories of its invocations.
+
+        Nodes in `not_built` were left out of the build, so they keep their
+        previous state; if they have none, they stay out and count as new.
+        The run results of concurrent invocations are merged into one file.
+        """
+        target_paths = [Path(target_path) for target_path in target_paths]
+        manifest = json.loads((target_paths[0] / "manifest.json").read_text())
+        not_built = set(not_built)
+        if not_built:
+            previous_nodes = (self.load("manifest.json") or {}).get("nodes", {})
+            for unique_id in not_built:
+                if unique_id in previous_nodes:
+                    manifest["nodes"][unique_id] = previous_nodes[unique_id]
+                else:
+                    manifest["nodes"].pop(unique_id, None)
+
+        run_results = None
+        for target_path in target_paths:
+            if not (target_path / "run_results.json").exists():
+                continue
+            invocation_results = json.loads((target_path / "run_results.json").read_text())
+            if run_results is None:
+                run_results = invocation_results
+            else:
+                run_results["results"].extend(invocation_results["results"])
+                run_results["elapsed_time"] = max(run_results["elapsed_time"], invocation_results["elapsed_time"])
+
+        write_json(self.path / "manifest.json", manifest)
+        if run_results is not None:
+            write_json(self.path / "run_results.json", run_results)
+
+
+class FailedBuildStore(JsonFileStore):
+    """Node statuses of the last failed build of each dbt asset (and partition window), in a local JSON file."""
+
+    def __init__(self, path: str = DBT_FAILED_BUILDS_PATH):
+        super().__init__(path)
+
+    def load(self, key: str) -> Optional[Dict[str, Any]]:
+        return self._load().get(key)
+
+    def record(self, key: str, run_id: str, statuses: Dict[str, str]) -> None:
+        builds = self._load()
+        builds[key] = {"run_id": run_id, "statuses": statuses}
+        self._save(builds)
+
+    def clear(self, key: str) -> None:
+        builds = self._load()
+        if builds.pop(key, None) is not None:
+            self._save(builds)
+
+
+def node_statuses(run_results: Dict[str, Any]) -> Dict[str, str]:
+    return {result["unique_id"]: result.get("status") for result in run_results.get("results", [])}
+
+
+def retryable_nodes(statuses: Dict[str, str]) -> List[str]:
+    """Nodes that failed or were skipped, which `dbt retry` runs again."""
+    return [unique_id for unique_id, status in statuses.items() if status in RETRYABLE_STATUSES]
+
+
+def reusable_models(manifest: Dict[str, Any], model_ids: Iterable[str], statuses: Dict[str, str]) -> List[str]:
+    """Models built successfully in a failed build that a retry does not need to run again.
+
+    A model is run again when it failed or was skipped, and also when one of its
+    tests did, so that the test runs against it.
+    """
+    retried = set()
+    for unique_id, status in statuses.items():
+        node = manifest["nodes"].get(unique_id, {})
+        if status not in RETRYABLE_STATUSES:
+            continue
+        if node.get("resource_type") != "test":
+            retried.add(unique_id)
+        elif node.get("attached_node"):
+            retried.add(node["attached_node"])
+        else:
+            retried.update(node.get("depends_on", {}).get("nodes", []))
+    return [unique_id for unique_id in model_ids if statuses.get(unique_id) == "success" and unique_id not in retried]
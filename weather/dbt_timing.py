@@ -0,0 +1,80 @@
+import statistics
+from typing import Any, Dict, List, Optional
+
+from .constants import DBT_NODE_TIMINGS_PATH
+from .json_store import JsonFileStore
+
+# Fewer past runs than this give no baseline to compare against
+MIN_BASELINE_RUNS = 3
+
+
+def node_timings(run_results: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """Execution time, rows affected and adapter response of every node in a `run_results.json`."""
+    generated_at = run_results.get("metadata", {}).get("generated_at")
+    timings = []
+    for result in run_results.get("results", []):
+        adapter_response = result.get("adapter_response") or {}
+        timings.append({
+            "unique_id": result["unique_id"],
+            "status": result.get("status"),
+            "execution_time": result.get("execution_time") or 0.0,
+            "rows_affected": adapter_response.get("rows_affected"),
+            "adapter_response": adapter_response,
+            "finished_at": generated_at,
+        })
+    return timings
+
+
+class NodeTimingStore(JsonFileStore):
+    """Execution times of dbt models and tests across builds, per node, in a local JSON file."""
+
+    def __init__(self, path: str = DBT_NODE_TIMINGS_PATH, max_entries: int = 100):
+        super().__init__(path)
+        self.max_entries = max_entries
+
+    def entries(self, unique_id: str) -> List[Dict[str, Any]]:
+        return self._load().get(unique_id, [])
+
+    @staticmethod
+    def baseline(entries: List[Dict[str, Any]], window: int) -> Optional[float]:
+        """Median execution time of the most recent successful runs, if there are enough of them."""
+        durations = [entry["execution_time"] for entry in entries if entry["status"] in ("success", "pass")][-window:]
+        if len(durations) < MIN_BASELINE_RUNS:
+            return None
+        return statistics.median(durations)
+
+    def record(
+        self,
+        run_results: Dict[str, Any],
+        factor: float = 2.0,
+        window: int = 20,
+        min_seconds: float = 1.0,
+    ) -> List[Dict[str, Any]]:
+        """Add the timings of a build and compare each node with its baseline before it.
+
+        A node regressed when it ran successfully for more than `factor` times its
+        baseline and at least `min_seconds` longer, so that sub-second models do
+        not flag on noise. Returns the timings with `baseline` and `regression` set.
+        """
+        history = self._load()
+        timings = node_timings(run_results)
+        for timing in timings:
+            entries = history.setdefault(timing["unique_id"], [])
+            baseline = self.baseline(entries, window)
+            timing["baseline"] = baseline
+            timing["regression"] = (
+                baseline is not None
+                and timing["status"] in ("success", "pass")
+                and timing["execution_time"] > factor * baseline
+                and timing["execution_time"] - baseline >= min_seconds
+            )
+            entries.append({
+                "finished_at": timing["finished_at"],
+                "status": timing["status"],
+                "execution_time": timing["execution_time"],
+                "rows_affected": timing["rows_affected"],
+            })
+            history[timing["unique_id"]] = entries[-self.max_entries:]
+        if timings:
+            self._save(history)
+        return timings
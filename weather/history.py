@@ -0,0 +1,70 @@
+import statistics
+from typing import Any, Dict, Iterable, List, Optional
+
+from .constants import AIRBYTE_JOB_HISTORY_PATH
+from .json_store import JsonFileStore
+from .polling import epoch_seconds
+
+
+def job_duration_seconds(job_info: Dict[str, Any]) -> Optional[float]:
+    """Wall-clock duration of a finished job, from its createdAt/updatedAt."""
+    created_at = epoch_seconds(job_info.get("createdAt"))
+    updated_at = epoch_seconds(job_info.get("updatedAt"))
+    if not created_at or not updated_at or updated_at < created_at:
+        return None
+    return updated_at - created_at
+
+
+def stream_records(job_info: Dict[str, Any]) -> Dict[str, int]:
+    records = {}
+    for attempt in job_info.get("attempts", []):
+        for stream_stat in attempt.get("streamStats", []):
+            records[stream_stat.get("streamName", "unknown")] = stream_stat.get("stats", {}).get("recordsEmitted", 0)
+    return records
+
+
+class JobHistoryStore(JsonFileStore):
+    """Durations of past successful sync jobs, per connection, in a local JSON file.
+
+    Each entry also keeps the per-stream record counts of the job. Durations
+    are not kept per stream: Airbyte only times the job as a whole, and all
+    of a connection's streams sync in the same job.
+    """
+
+    def __init__(self, path: str = AIRBYTE_JOB_HISTORY_PATH, max_entries: int = 50):
+        super().__init__(path)
+        self.max_entries = max_entries
+
+    def entries(self, connection_id: str) -> List[Dict[str, Any]]:
+        return self._load().get(connection_id, [])
+
+    def record(self, connection_id: str, jobs: Iterable[Dict[str, Any]]) -> int:
+        """Add finished successful jobs that are not in the history yet. Returns how many were added."""
+        history = self._load()
+        entries = history.setdefault(connection_id, [])
+        known = {entry["job_id"] for entry in entries}
+        added = 0
+        for job in jobs:
+            duration = job_duration_seconds(job)
+            if job.get("status") != "succeeded" or duration is None or job.get("id") in known:
+                continue
+            entries.append({
+                "job_id": job["id"],
+                "finished_at": epoch_seconds(job.get("updatedAt")),
+                "duration_seconds": duration,
+                "streams": stream_records(job),
+            })
+            known.add(job["id"])
+            added += 1
+        if added:
+            entries.sort(key=lambda entry: entry["finished_at"])
+            history[connection_id] = entries[-self.max_entries:]
+            self._save(history)
+        return added
+
+    def predict_duration(self, connection_id: str, window: int = 20) -> Optional[float]:
+        """Median duration of the connection's most recent jobs."""
+        durations = [entry["duration_seconds"] for entry in self.entries(connection_id)[-window:]]
+        if not durations:
+            return None
+        return statistics.median(durations)
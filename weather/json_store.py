@@ -0,0 +1,37 @@
+import json
+import os
+import tempfile
+from pathlib import Path
+from typing import Any, Dict
+
+
+def read_json(path: Path, default: Any = None) -> Any:
+    """The contents of a JSON file, or `default` when it is missing or unreadable."""
+    try:
+        return json.loads(Path(path).read_text())
+    except (FileNotFoundError, ValueError):
+        return default
+
+
+def write_json(path: Path, data: Any) -> None:
+    """Replace a JSON file in one step, creating its directory if needed."""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    # Write to a temporary file first so concurrent readers never see a partial file
+    fd, tmp_path = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+    with os.fdopen(fd, "w") as f:
+        json.dump(data, f)
+    os.replace(tmp_path, path)
+
+
+class JsonFileStore:
+    """A dict kept in a local JSON file under `.weather_state/`, read and rewritten whole."""
+
+    def __init__(self, path: str):
+        self.path = Path(path)
+
+    def _load(self) -> Dict[str, Any]:
+        return read_json(self.path, {})
+
+    def _save(self, data: Dict[str, Any]) -> None:
+        write_json(self.path, data)
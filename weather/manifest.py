@@ -0,0 +1,125 @@
+import hashlib
+import json
+import logging
+import os
+import pickle
+import tempfile
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+from .constants import MANIFEST_CACHE_DIR
+from .manifest_generator import generate_manifest
+
+logger = logging.getLogger("dbt_assets")
+
+# Manifests already loaded by this process, by (path, mtime, size)
+_loaded: Dict[tuple, Dict[str, Any]] = {}
+
+
+def find_manifest_path() -> Path:
+    """Find the dbt manifest.json in various possible locations."""
+    # Get the project root (one level up from the weather package)
+    project_root = Path(__file__).parent.parent
+    
+    # Possible locations where the manifest might be found
+    possible_paths = [
+        # Local development - relative to project root
+        project_root / "weather_project" / "target" / "manifest.json",
+        # Deployed environment
+        Path("/venvs/ec21669d8b57/lib/python3.10/site-packages/working_directory/root/weather_project/target/manifest.json"),
+        # Relative to the current file
+        Path(__file__).parent.parent / "weather_project" / "target" / "manifest.json",
+        # CI/CD environment
+        Path("/github/workspace/weather_project/target/manifest.json"),
+    ]
+    
+    for path in possible_paths:
+        if path and path.exists():
+            logger.info(f"Found dbt manifest at: {path}")
+            return path
+    
+    # If no existing manifest is found, return the first path as a default
+    default_path = possible_paths[0]
+    logger.warning(f"No manifest found, using default path: {default_path}")
+    return default_path
+
+
+def _read_cached(cache_dir: Path, digest: str) -> Optional[Dict[str, Any]]:
+    try:
+        with open(cache_dir / f"{digest}.pickle", "rb") as f:
+            return pickle.load(f)
+    except (OSError, pickle.UnpicklingError, EOFError):
+        return None
+
+
+def _write_cached(cache_dir: Path, path: Path, stat: os.stat_result, digest: str, manifest: Dict[str, Any]) -> None:
+    try:
+        cache_dir.mkdir(parents=True, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=cache_dir, suffix=".tmp")
+        with os.fdopen(fd, "wb") as f:
+            pickle.dump(manifest, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, cache_dir / f"{digest}.pickle")
+
+        index_path = cache_dir / "index.json"
+        try:
+            index = json.loads(index_path.read_text())
+        except (FileNotFoundError, ValueError):
+            index = {}
+        index[str(path)] = {"mtime_ns": stat.st_mtime_ns, "size": stat.st_size, "sha256": digest}
+        fd, tmp_path = tempfile.mkstemp(dir=cache_dir, suffix=".tmp")
+        with os.fdopen(fd, "w") as f:
+            json.dump(index, f)
+        os.replace(tmp_path, index_path)
+
+        # Drop parsed manifests no path points to any more
+        live = {entry["sha256"] for entry in index.values()}
+        for cached in cache_dir.glob("*.pickle"):
+            if cached.stem not in live:
+                cached.unlink(missing_ok=True)
+    except OSError as e:
+        # A read-only deployment just parses the manifest every time
+        logger.warning(f"Could not cache the parsed dbt manifest in {cache_dir}: {e}")
+
+
+def load_manifest(path: Path, cache_dir: str = MANIFEST_CACHE_DIR) -> Dict[str, Any]:
+    """Parsed `manifest.json`, from the on-disk cache when the file has not changed.
+
+    The cache is looked up by the file's path, mtime and size first, so an
+    unchanged manifest is neither read nor parsed; a rewritten one is hashed
+    and only parsed when its content is new. When there is no valid manifest,
+    one is generated in memory from the project files, without writing anything.
+    """
+    path = Path(path).resolve()
+    try:
+        stat = path.stat()
+    except FileNotFoundError:
+        logger.warning(f"No manifest at {path}, generating one from the dbt project files")
+        return generate_manifest()
+
+    key = (str(path), stat.st_mtime_ns, stat.st_size)
+    if key in _loaded:
+        return _loaded[key]
+
+    cache_dir = Path(cache_dir)
+    manifest = None
+    try:
+        entry = json.loads((cache_dir / "index.json").read_text()).get(str(path))
+    except (FileNotFoundError, ValueError):
+        entry = None
+    if entry and (entry["mtime_ns"], entry["size"]) == (stat.st_mtime_ns, stat.st_size):
+        manifest = _read_cached(cache_dir, entry["sha256"])
+
+    if manifest is None:
+        raw = path.read_bytes()
+        digest = hashlib.sha256(raw).hexdigest()
+        manifest = _read_cached(cache_dir, digest)
+        if manifest is None:
+            try:
+                manifest = json.loads(raw)
+            except ValueError as e:
+                logger.error(f"Invalid manifest at {path} ({e}), generating one from the dbt project files")
+                return generate_manifest()
+        _write_cached(cache_dir, path, stat, digest, manifest)
+
+    _loaded[key] = manifest
+    return manifest
@@ -0,0 +1,324 @@
+"""Builds a dbt manifest straight from the project files, without `dbt compile`.
+
+Only what the Dagster integration needs is derived: models with their
+`config(...)`, `ref()` and `source()` calls, sources, the generic tests
+declared in the YAML files and the parent/child maps. Unique ids, fqns and
+checksums follow dbt's own rules, so a later `dbt build` reports the same
+nodes. Jinja is not rendered, so refs built dynamically are not seen.
+"""
+import ast
+import hashlib
+import json
+import re
+import time
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+import yaml
+
+from .constants import DBT_PROJECT_DIR
+
+CONFIG_CALL = re.compile(r"\{\{\s*config\((.*?)\)\s*\}\}", re.DOTALL)
+REF_CALL = re.compile(r"""\bref\(\s*['"]([^'"]+)['"]\s*(?:,\s*['"]([^'"]+)['"]\s*)?\)""")
+SOURCE_CALL = re.compile(r"""\bsource\(\s*['"]([^'"]+)['"]\s*,\s*['"]([^'"]+)['"]\s*\)""")
+JINJA_LITERALS = {"true": True, "false": False, "none": None, "True": True, "False": False, "None": None}
+
+
+def _md5(text: str) -> str:
+    return hashlib.md5(text.encode("utf-8")).hexdigest()
+
+
+def _literal(node: ast.AST) -> Any:
+    if isinstance(node, ast.Name) and node.id in JINJA_LITERALS:
+        return JINJA_LITERALS[node.id]
+    if isinstance(node, ast.List):
+        return [_literal(element) for element in node.elts]
+    return ast.literal_eval(node)
+
+
+def parse_config(sql: str) -> Dict[str, Any]:
+    """Keyword arguments of the model's `{{ config(...) }}` block that are plain literals."""
+    match = CONFIG_CALL.search(sql)
+    if not match:
+        return {}
+    call = ast.parse(f"config({match.group(1)})", mode="eval").body
+    config = {}
+    for keyword in call.keywords:
+        try:
+            config[keyword.arg] = _literal(keyword.value)
+        except ValueError:
+            # Jinja expressions are left to dbt
+            continue
+    return config
+
+
+def project_config(project: Dict[str, Any], project_name: str, path_parts: Iterable[str]) -> Dict[str, Any]:
+    """Model config set in dbt_project.yml for a model directory, outermost first."""
+    config = {}
+    level = (project.get("models") or {}).get(project_name) or {}
+    for part in [None, *path_parts]:
+        if part is not None:
+            level = level.get(part) or {}
+        for key, value in level.items():
+            if not isinstance(value, dict) or key.lstrip("+") in ("meta", "grants", "docs"):
+                config[key.lstrip("+")] = value
+    return config
+
+
+def generic_test_name(test_type: str, target_name: str, kwargs: Dict[str, Any]) -> Tuple[str, str]:
+    """(full name, alias) of a generic test, as dbt names them."""
+    flat_args = []
+    for arg_name in sorted(kwargs):
+        if arg_name == "model":
+            continue
+        value = kwargs[arg_name]
+        parts = list(value.values()) if isinstance(value, dict) else list(value) if isinstance(value, (list, tuple)) else [value]
+        flat_args.extend(str(part) for part in parts)
+    unique = "__".join(re.sub("[^0-9a-zA-Z_]+", "_", arg) for arg in flat_args)
+    identifier = f"{test_type}_{target_name}"
+    full_name = f"{identifier}_{unique}"
+    alias = f"{identifier[:30]}_{_md5(full_name)}" if len(full_name) >= 64 else full_name
+    return full_name, alias
+
+
+def _hashable(data: Any) -> Any:
+    if type(data) == dict:
+        return {key: _hashable(data[key]) for key in sorted(data)}
+    if type(data) == list:
+        return [_hashable(value) for value in data]
+    return str(data)
+
+
+def _test_definitions(entry: Dict[str, Any]) -> Iterable[Tuple[str, Dict[str, Any]]]:
+    for test in entry.get("data_tests", entry.get("tests")) or []:
+        if isinstance(test, str):
+            yield test, {}
+        elif isinstance(test, dict) and len(test) == 1:
+            test_type, arguments = next(iter(test.items()))
+            yield test_type, dict(arguments or {})
+
+
+def _adapter_type(project_dir: Path, profile_name: str) -> Optional[str]:
+    try:
+        profiles = yaml.safe_load((project_dir / "profiles.yml").read_text()) or {}
+        profile = profiles[profile_name]
+        return profile["outputs"][profile["target"]]["type"]
+    except (OSError, KeyError, TypeError, yaml.YAMLError):
+        return None
+
+
+def _dbt_version() -> str:
+    try:
+        from importlib.metadata import version
+        return version("dbt-core")
+    except Exception:
+        return "unknown"
+
+
+def generate_manifest(project_dir: str = DBT_PROJECT_DIR) -> Dict[str, Any]:
+    """Manifest of the dbt project at `project_dir`, derived from its files."""
+    project_dir = Path(project_dir)
+    project = yaml.safe_load((project_dir / "dbt_project.yml").read_text()) or {}
+    project_name = project["name"]
+    model_paths = [project_dir / path for path in project.get("model-paths", ["models"])]
+
+    nodes: Dict[str, Dict[str, Any]] = {}
+    sources: Dict[str, Dict[str, Any]] = {}
+    model_ids: Dict[str, str] = {}
+    pending_refs: Dict[str, List[Tuple[Optional[str], str]]] = {}
+    pending_sources: Dict[str, List[Tuple[str, str]]] = {}
+
+    for model_path in model_paths:
+        for sql_file in sorted(model_path.rglob("*.sql")):
+            relative = sql_file.relative_to(model_path)
+            raw_code = sql_file.read_text()
+            name = sql_file.stem
+            config = {
+                "enabled": True,
+                "materialized": "view",
+                "tags": [],
+                "meta": {},
+                "on_schema_change": "ignore",
+                "contract": {"enforced": False, "alias_types": True},
+                **project_config(project, project_name, relative.parts[:-1]),
+                **parse_config(raw_code),
+            }
+            if not config.get("enabled", True):
+                continue
+            unique_id = f"model.{project_name}.{name}"
+            model_ids[name] = unique_id
+            refs = [(match.group(2) and match.group(1), match.group(2) or match.group(1)) for match in REF_CALL.finditer(raw_code)]
+            source_calls = [(match.group(1), match.group(2)) for match in SOURCE_CALL.finditer(raw_code)]
+            pending_refs[unique_id] = refs
+            pending_sources[unique_id] = source_calls
+            nodes[unique_id] = {
+                "name": name,
+                "resource_type": "model",
+                "package_name": project_name,
+                "path": relative.as_posix(),
+                "original_file_path": sql_file.relative_to(project_dir).as_posix(),
+                "unique_id": unique_id,
+                "fqn": [project_name, *relative.parts[:-1], name],
+                "alias": config.get("alias") or name,
+                # dbt hashes the file contents with surrounding whitespace stripped
+                "checksum": {"name": "sha256", "checksum": hashlib.sha256(raw_code.strip().encode("utf-8")).hexdigest()},
+                "config": config,
+                "tags": list(config.get("tags", [])),
+                "meta": dict(config.get("meta", {})),
+                "description": "",
+                "columns": {},
+                "raw_code": raw_code,
+                "language": "sql",
+                "refs": [{"name": ref_name, "package": package, "version": None} for package, ref_name in refs],
+                "sources": [list(call) for call in source_calls],
+                "depends_on": {"nodes": [], "macros": []},
+                "database": None,
+                "schema": config.get("schema"),
+                "relation_name": None,
+                "docs": {"show": True},
+                "patch_path": None,
+                "contract": {"enforced": False},
+            }
+
+    yaml_entries = []
+    for model_path in model_paths:
+        for yml_file in sorted([*model_path.rglob("*.yml"), *model_path.rglob("*.yaml")]):
+            content = yaml.safe_load(yml_file.read_text()) or {}
+            relative = yml_file.relative_to(model_path)
+            yaml_entries.append((yml_file, relative, content))
+
+    # Sources first, so tests and models can point at them
+    for yml_file, relative, content in yaml_entries:
+        for source in content.get("sources") or []:
+            for table in source.get("tables") or []:
+                unique_id = f"source.{project_name}.{source['name']}.{table['name']}"
+                sources[unique_id] = {
+                    "name": table["name"],
+                    "source_name": source["name"],
+                    "resource_type": "source",
+                    "package_name": project_name,
+                    "path": yml_file.relative_to(project_dir).as_posix(),
+                    "original_file_path": yml_file.relative_to(project_dir).as_posix(),
+                    "unique_id": unique_id,
+                    "fqn": [project_name, *relative.parts[:-1], source["name"], table["name"]],
+                    "database": source.get("database"),
+                    "schema": source.get("schema", source["name"]),
+                    "identifier": table.get("identifier", table["name"]),
+                    "description": table.get("description", ""),
+                    "source_description": source.get("description", ""),
+                    "loader": source.get("loader", ""),
+                    "columns": {},
+                    "meta": {**(source.get("meta") or {}), **(table.get("meta") or {})},
+                    "source_meta": source.get("meta") or {},
+                    "tags": [*(source.get("tags") or []), *(table.get("tags") or [])],
+                    "config": {"enabled": True},
+                    "relation_name": None,
+                }
+
+    for yml_file, relative, content in yaml_entries:
+        for model in content.get("models") or []:
+            unique_id = model_ids.get(model.get("name"))
+            if unique_id is None:
+                continue
+            node = nodes[unique_id]
+            node["description"] = model.get("description", "")
+            node["patch_path"] = f"{project_name}://{yml_file.relative_to(project_dir).as_posix()}"
+            for column in model.get("columns") or []:
+                node["columns"][column["name"]] = {
+                    "name": column["name"],
+                    "description": column.get("description", ""),
+                    "data_type": column.get("data_type"),
+                    "meta": column.get("meta") or {},
+                    "tags": column.get("tags") or [],
+                    "constraints": [],
+                }
+
+            targets = [(model, None)] + [(column, column["name"]) for column in model.get("columns") or []]
+            for entry, column_name in targets:
+                for test_type, arguments in _test_definitions(entry):
+                    test_config = arguments.pop("config", {}) or {}
+                    kwargs = {**({"column_name": column_name} if column_name else {}), **arguments.pop("arguments", {}), **arguments}
+                    kwargs["model"] = f"{{{{ get_where_subquery(ref('{model['name']}')) }}}}"
+                    namespace, _, macro_name = test_type.rpartition(".")
+                    name, alias = generic_test_name(macro_name, model["name"], kwargs)
+                    test_metadata = {"name": macro_name, "kwargs": kwargs, "namespace": namespace or None}
+                    test_hash = _md5(name + repr(_hashable(test_metadata)))[-10:]
+                    test_id = f"test.{project_name}.{name}.{test_hash}"
+                    nodes[test_id] = {
+                        "name": name,
+                        "resource_type": "test",
+                        "package_name": project_name,
+                        "path": f"{alias}.sql",
+                        "original_file_path": yml_file.relative_to(project_dir).as_posix(),
+                        "unique_id": test_id,
+                        "fqn": [project_name, *relative.parts[:-1], name],
+                        "alias": alias,
+                        "checksum": {"name": "none", "checksum": ""},
+                        "config": {"enabled": True, "materialized": "test", "severity": "ERROR", "tags": [], "meta": {}, **test_config},
+                        "tags": [],
+                        "meta": {},
+                        "description": "",
+                        "columns": {},
+                        "raw_code": f"{{{{ test_{macro_name}(**_dbt_generic_test_kwargs) }}}}",
+                        "language": "sql",
+                        "refs": [{"name": model["name"], "package": None, "version": None}],
+                        "sources": [],
+                        "depends_on": {"nodes": [unique_id], "macros": []},
+                        "column_name": column_name,
+                        "attached_node": unique_id,
+                        "test_metadata": test_metadata,
+                        "database": None,
+                        "schema": None,
+                        "relation_name": None,
+                    }
+
+    for unique_id, refs in pending_refs.items():
+        depends_on = nodes[unique_id]["depends_on"]["nodes"]
+        for _, ref_name in refs:
+            if ref_name in model_ids and model_ids[ref_name] not in depends_on:
+                depends_on.append(model_ids[ref_name])
+        for source_name, table_name in pending_sources[unique_id]:
+            source_id = f"source.{project_name}.{source_name}.{table_name}"
+            if source_id in sources and source_id not in depends_on:
+                depends_on.append(source_id)
+
+    parent_map = {unique_id: [] for unique_id in sources}
+    parent_map.update({unique_id: list(node["depends_on"]["nodes"]) for unique_id, node in nodes.items()})
+    child_map = {unique_id: [] for unique_id in parent_map}
+    for unique_id, parents in parent_map.items():
+        for parent in parents:
+            child_map.setdefault(parent, []).append(unique_id)
+
+    return {
+        "metadata": {
+            "dbt_schema_version": "https://schemas.getdbt.com/dbt/manifest/v12.json",
+            "dbt_version": _dbt_version(),
+            "generated_at": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+            "project_name": project_name,
+            "adapter_type": _adapter_type(project_dir, project.get("profile", "")),
+            "env": {},
+        },
+        "nodes": nodes,
+        "sources": sources,
+        "macros": {},
+        "docs": {},
+        "exposures": {},
+        "metrics": {},
+        "groups": {},
+        "selectors": {},
+        "disabled": {},
+        "parent_map": parent_map,
+        "child_map": child_map,
+        "group_map": {},
+        "saved_queries": {},
+        "semantic_models": {},
+        "unit_tests": {},
+    }
+
+
+def write_manifest(path: Path, project_dir: str = DBT_PROJECT_DIR) -> Dict[str, Any]:
+    manifest = generate_manifest(project_dir)
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(manifest, indent=2))
+    return manifest
@@ -0,0 +1,23 @@
+from typing import Dict, List
+
+from dagster import AssetExecutionContext, DailyPartitionsDefinition
+
+from .constants import DAILY_PARTITIONS_START_DATE, EXECUTION_TIMEZONE, FORECAST_HORIZON_DAYS
+
+# One partition per day, up to the last day of the current forecast
+daily_partitions = DailyPartitionsDefinition(
+    start_date=DAILY_PARTITIONS_START_DATE,
+    timezone=EXECUTION_TIMEZONE,
+    end_offset=FORECAST_HORIZON_DAYS,
+)
+
+
+def forecast_partition_keys() -> List[str]:
+    """Partitions from today to the end of the forecast horizon, which every sync can change."""
+    return daily_partitions.get_partition_keys()[-FORECAST_HORIZON_DAYS:]
+
+
+def partition_window_vars(context: AssetExecutionContext) -> Dict[str, str]:
+    """dbt vars limiting the models to the partitions of the run, `end_date` excluded."""
+    window = context.partition_time_window
+    return {"start_date": window.start.date().isoformat(), "end_date": window.end.date().isoformat()}
@@ -0,0 +1,155 @@
+import random
+import time
+from dataclasses import dataclass
+from typing import Any, Dict, Generator, Optional, Tuple
+
+from dagster import Config, Failure, MetadataValue
+
+from .resources import AirbyteClientResource
+
+TERMINAL_STATUSES = ("succeeded", "failed", "cancelled")
+
+
+class PollingConfig(Config):
+    """How `airbyte_sync_asset` waits for its Airbyte job to finish.
+
+    `polling_mode` is either "backoff", or "predictive" to schedule the first
+    poll near the finish time predicted from the connection's past jobs.
+    """
+
+    polling_mode: str = "backoff"
+    first_poll_seconds: float = 2.0
+    backoff_factor: float = 2.0
+    max_poll_interval_seconds: float = 60.0
+    jitter_ratio: float = 0.2
+    timeout_seconds: float = 3600.0
+    max_consecutive_errors: int = 5
+    # Predictive mode: how many past jobs to predict from, and which fraction
+    # of the predicted duration to wait before the first poll
+    history_size: int = 20
+    prediction_safety_factor: float = 0.9
+
+
+@dataclass
+class PollStats:
+    polls: int = 0
+    errors: int = 0
+    waited_seconds: float = 0.0
+    # Time between the job finishing on Airbyte and us noticing it
+    wasted_seconds: float = 0.0
+
+    def to_metadata(self) -> Dict[str, Any]:
+        return {
+            "polls": MetadataValue.int(self.polls),
+            "poll_errors": MetadataValue.int(self.errors),
+            "poll_wait_seconds": MetadataValue.float(round(self.waited_seconds, 2)),
+            "poll_wasted_seconds": MetadataValue.float(round(self.wasted_seconds, 2)),
+        }
+
+
+def epoch_seconds(timestamp: Optional[float]) -> Optional[float]:
+    """Airbyte timestamps are in seconds, but some deployments report milliseconds."""
+    if not timestamp:
+        return None
+    return timestamp / 1000 if timestamp > 1e11 else float(timestamp)
+
+
+def next_interval(interval: float, config: PollingConfig) -> float:
+    return min(interval * config.backoff_factor, config.max_poll_interval_seconds)
+
+
+def with_jitter(interval: float, config: PollingConfig) -> float:
+    return interval * random.uniform(1 - config.jitter_ratio, 1 + config.jitter_ratio)
+
+
+def poll_job(
+    job_id: int,
+    config: PollingConfig,
+    log,
+    initial_wait_seconds: Optional[float] = None,
+) -> Generator[Optional[float], Any, Tuple[Dict[str, Any], PollStats]]:
+    """The polling loop of `wait_for_job` and `wait_for_job_async`, without the requests.
+
+    Yields how long to wait before each status request and is sent the job
+    info, or the exception the request raised. Once `timeout_seconds` runs
+    out it yields None for the job to be cancelled, and is sent the result of
+    the cancellation. Returns the terminal job info and the poll stats.
+    """
+    stats = PollStats()
+    deadline = time.time() + config.timeout_seconds
+    interval = config.first_poll_seconds
+    consecutive_errors = 0
+
+    while True:
+        remaining = deadline - time.time()
+        if remaining <= 0:
+            log.warning(f"Airbyte job {job_id} still running after {config.timeout_seconds}s, cancelling it")
+            cancelled = yield None
+            if isinstance(cancelled, Exception):
+                log.warning(f"Failed to cancel Airbyte job {job_id}: {cancelled}")
+            raise Failure(
+                description=f"Airbyte job {job_id} did not finish within {config.timeout_seconds} seconds",
+                metadata=stats.to_metadata(),
+            )
+
+        if initial_wait_seconds is not None:
+            sleep_for = min(initial_wait_seconds, remaining)
+            initial_wait_seconds = None
+        else:
+            sleep_for = min(with_jitter(interval, config), remaining)
+            interval = next_interval(interval, config)
+        job_info = yield sleep_for
+        stats.waited_seconds += sleep_for
+
+        if isinstance(job_info, Exception):
+            stats.errors += 1
+            consecutive_errors += 1
+            log.warning(f"Error polling job status ({consecutive_errors}/{config.max_consecutive_errors}): {job_info}")
+            if consecutive_errors >= config.max_consecutive_errors:
+                raise Failure(
+                    description=f"Gave up polling Airbyte job {job_id} after {consecutive_errors} consecutive errors",
+                    metadata=stats.to_metadata(),
+                ) from job_info
+            continue
+
+        consecutive_errors = 0
+        stats.polls += 1
+        status = job_info.get("status", "unknown")
+        attempts = job_info.get("attempts", [])
+        attempt_status = attempts[-1].get("status", "unknown") if attempts else "unknown"
+        log.info(f"Polling job {job_id}... status: {status}, attempt #{len(attempts)}, attempt status: {attempt_status}")
+
+        if status in TERMINAL_STATUSES:
+            finished_at = epoch_seconds(job_info.get("updatedAt"))
+            if finished_at:
+                stats.wasted_seconds = max(0.0, min(time.time() - finished_at, sleep_for))
+            return job_info, stats
+
+
+def wait_for_job(
+    airbyte: AirbyteClientResource,
+    job_id: int,
+    config: PollingConfig,
+    log,
+    initial_wait_seconds: Optional[float] = None,
+) -> Tuple[Dict[str, Any], PollStats]:
+    """Poll an Airbyte job with exponential backoff until it reaches a terminal status.
+
+    The job is cancelled if it is still running when `timeout_seconds` runs
+    out, and polling gives up after `max_consecutive_errors` failed requests
+    in a row. `initial_wait_seconds` replaces the first backoff interval,
+    e.g. with the time left until the predicted finish.
+    """
+    steps = poll_job(job_id, config, log, initial_wait_seconds)
+    reply = None
+    try:
+        while True:
+            wait = steps.send(reply)
+            if wait is not None:
+                time.sleep(wait)
+            try:
+                reply = airbyte.get_job(job_id) if wait is not None else airbyte.cancel_job(job_id)
+            except Exception as e:
+                reply = e
+    except StopIteration as done:
+        return done.value
@@ -4,9 +4,8 @@ from pathlib import Path
 base_dir = Path(__file__).parent.parent
 project_dir = base_dir / "weather_project"
 
-# Ensure the target directory exists
+# dbt creates the target directory itself when it runs
 target_dir = project_dir / "target"
-target_dir.mkdir(exist_ok=True, parents=True)
 
 # This is a placeholder for the project configuration
 weather_project_config = {
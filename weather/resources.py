@@ -0,0 +1,160 @@
+import base64
+import json
+import threading
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+import requests
+from dagster import ConfigurableResource
+from requests.adapters import HTTPAdapter
+
+from .constants import AIRBYTE_HOST, CLIENT_ID, CLIENT_SECRET
+
+# Airbyte application tokens are short lived (3 minutes by default). This is
+# only used when neither the token response nor the JWT carry an expiry.
+DEFAULT_TOKEN_TTL_SECONDS = 180
+
+# Sessions and tokens are cached per process rather than per resource
+# instance: Dagster builds a fresh resource for every run and sensor tick, and
+# we want those to keep reusing the same keep-alive connections and token.
+_sessions: Dict[Tuple[str, int], requests.Session] = {}
+_tokens: Dict[Tuple[str, str], Tuple[str, float]] = {}
+_lock = threading.Lock()
+_token_lock = threading.Lock()
+
+
+class AirbyteApiError(Exception):
+    """Raised when the Airbyte API returns an unexpected response."""
+
+
+def _token_expiry(token: str, payload: Dict[str, Any]) -> float:
+    """Work out when a token expires, as a unix timestamp."""
+    if payload.get("expires_in"):
+        return time.time() + float(payload["expires_in"])
+
+    # Fall back to the `exp` claim of the JWT itself
+    try:
+        claims = token.split(".")[1]
+        claims += "=" * (-len(claims) % 4)
+        exp = json.loads(base64.urlsafe_b64decode(claims)).get("exp")
+        if exp:
+            return float(exp)
+    except (IndexError, ValueError):
+        pass
+
+    return time.time() + DEFAULT_TOKEN_TTL_SECONDS
+
+
+def _job_from_response(entry: Dict[str, Any]) -> Dict[str, Any]:
+    """Flatten a JobInfoRead (`{"job": ..., "attempts": [...]}`) into a single job dict."""
+    job = dict(entry.get("job", entry))
+    if "attempts" not in job and "attempts" in entry:
+        job["attempts"] = [attempt.get("attempt", attempt) for attempt in entry["attempts"]]
+    return job
+
+
+class AirbyteClientResource(ConfigurableResource):
+    """Client for the Airbyte v1 API.
+
+    All requests go through a pooled keep-alive session, and the application
+    token is cached until shortly before it expires, so polling a job does not
+    open a new connection or request a new token on every call.
+    """
+
+    host: str = AIRBYTE_HOST
+    client_id: str = CLIENT_ID
+    client_secret: str = CLIENT_SECRET
+    pool_maxsize: int = 10
+    request_timeout_seconds: float = 30.0
+    token_refresh_margin_seconds: float = 30.0
+
+    @property
+    def session(self) -> requests.Session:
+        key = (self.host, self.pool_maxsize)
+        with _lock:
+            session = _sessions.get(key)
+            if session is None:
+                session = requests.Session()
+                adapter = HTTPAdapter(pool_connections=1, pool_maxsize=self.pool_maxsize)
+                session.mount("http://", adapter)
+                session.mount("https://", adapter)
+                session.headers.update({
+                    "accept": "application/json",
+                    "content-type": "application/json",
+                })
+                _sessions[key] = session
+        return session
+
+    def get_token(self, force_refresh: bool = False) -> str:
+        """Return a valid access token, requesting a new one only when needed."""
+        key = (self.host, self.client_id)
+        # Held while refreshing, so concurrent callers wait for one token request
+        # instead of each requesting their own
+        with _token_lock:
+            cached = _tokens.get(key)
+            if cached and not force_refresh:
+                token, expires_at = cached
+                if time.time() < expires_at - self.token_refresh_margin_seconds:
+                    return token
+
+            response = self.session.post(
+                f"{self.host}/api/v1/applications/token",
+                json={"client_id": self.client_id, "client_secret": self.client_secret},
+                timeout=self.request_timeout_seconds,
+            )
+            if response.status_code != 200:
+                raise AirbyteApiError(f"Token request failed: {response.status_code} - {response.text}")
+
+            payload = response.json()
+            token = payload["access_token"]
+            _tokens[key] = (token, _token_expiry(token, payload))
+            return token
+
+    def request(self, endpoint: str, payload: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """POST to a v1 endpoint, refreshing the token once if it was rejected."""
+        url = f"{self.host}/api/v1/{endpoint}"
+        for attempt in range(2):
+            response = self.session.post(
+                url,
+                json=payload or {},
+                headers={"Authorization": f"Bearer {self.get_token(force_refresh=attempt > 0)}"},
+                timeout=self.request_timeout_seconds,
+            )
+            if response.status_code != 401:
+                break
+        response.raise_for_status()
+        return response.json()
+
+    def sync_connection(self, connection_id: str) -> Dict[str, Any]:
+        """Trigger a sync and return the created job."""
+        job = _job_from_response(self.request("connections/sync", {"connectionId": connection_id}))
+        if not job.get("id"):
+            raise AirbyteApiError(f"Failed to get job ID from sync response for connection {connection_id}")
+        return job
+
+    def get_job(self, job_id: int) -> Dict[str, Any]:
+        return _job_from_response(self.request("jobs/get", {"id": job_id}))
+
+    def cancel_job(self, job_id: int) -> Dict[str, Any]:
+        return _job_from_response(self.request("jobs/cancel", {"id": job_id}))
+
+    def list_jobs(self, connection_id: str, limit: int = 10) -> List[Dict[str, Any]]:
+        """Recent sync jobs for a connection, most recent first."""
+        response = self.request("jobs/list", {
+            "configTypes": ["sync"],
+            "configId": connection_id,
+            "pagination": {"pageSize": limit},
+        })
+        return [_job_from_response(entry) for entry in response.get("jobs", [])]
+
+    def get_job_debug_info(self, job_id: int) -> Dict[str, Any]:
+        return self.request("jobs/get_debug_info", {"id": job_id})
+
+    def get_connection(self, connection_id: str) -> Dict[str, Any]:
+        return self.request("connections/get", {"connectionId": connection_id})
+
+    def list_connections(self, workspace_id: str) -> List[Dict[str, Any]]:
+        return self.request("connections/list", {"workspaceId": workspace_id})["connections"]
+
+    def list_workspaces(self) -> List[Dict[str, Any]]:
+        return self.request("workspaces/list")["workspaces"]
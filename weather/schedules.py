@@ -1,14 +1,14 @@
-from dagster import ScheduleDefinition, define_asset_job, in_process_executor, AssetSelection, AssetKey
+from dagster import DefaultScheduleStatus, ScheduleDefinition, define_asset_job, in_process_executor, AssetSelection, AssetKey
 from typing import List, Union
 from .constants import WEATHER_SCHEDULE_CRON, EXECUTION_TIMEZONE
 from .airbyte import airbyte_sync_asset
-from .dbt import weather_project_dbt_assets
+from .dbt import weather_daily_marts, weather_daily_records, weather_project_dbt_assets
 
 # Create a job that runs only the Airbyte sync
 airbyte_sync_job = define_asset_job(
     name="airbyte_sync_job",
     description="Job that only runs the Airbyte sync",
-    selection=["airbyte_sync_asset"]
+    selection=AssetSelection.keys(("airbyte", "airbyte_sync_asset"))
 )
 
 # Create a combined job that runs Airbyte sync followed by all DBT models
@@ -22,13 +22,51 @@ combined_job = define_asset_job(
     executor_def=in_process_executor
 )
 
+# dbt models only; run by airbyte_job_sensor once a deferred sync has finished
+dbt_job = define_asset_job(
+    name="weather_dbt_job",
+    description="Job that runs all DBT models",
+    selection=AssetSelection.assets(*[
+        asset for asset in weather_project_dbt_assets.keys
+        if not asset.path[0].startswith("source_")
+    ]),
+    executor_def=in_process_executor
+)
+
+# Date-grain marts, partitioned by day; backfills of this job run a week per run.
+# The unpartitioned records across every date are rebuilt after them in the same run.
+# Run by daily_marts_sensor for the forecast days after each dbt build.
+daily_marts_job = define_asset_job(
+    name="weather_daily_marts_job",
+    description="Job that runs the date-grain DBT marts for a range of daily partitions, then the records across dates",
+    selection=AssetSelection.assets(weather_daily_marts, weather_daily_records),
+    executor_def=in_process_executor
+)
+
+# Scheduled runs skip the sync when one already succeeded in the last 30 minutes,
+# e.g. a manual run just before the schedule
+SCHEDULED_SYNC_CONFIG = {"freshness_window_minutes": 30.0}
+
 # Define the schedule to run the combined job
 daily_weather_schedule = ScheduleDefinition(
     job=combined_job,
     cron_schedule=WEATHER_SCHEDULE_CRON,
     execution_timezone=EXECUTION_TIMEZONE,
-    name="daily_weather_schedule"
+    name="daily_weather_schedule",
+    run_config={"ops": {"airbyte__airbyte_sync_asset": {"config": SCHEDULED_SYNC_CONFIG}}},
+)
+
+# Same schedule, but only triggers the sync and lets airbyte_job_sensor start
+# the DBT models when it finishes. Turn this on instead of the one above to
+# avoid holding a run worker for the whole sync.
+deferred_weather_schedule = ScheduleDefinition(
+    job=airbyte_sync_job,
+    cron_schedule=WEATHER_SCHEDULE_CRON,
+    execution_timezone=EXECUTION_TIMEZONE,
+    name="deferred_weather_schedule",
+    run_config={"ops": {"airbyte__airbyte_sync_asset": {"config": {**SCHEDULED_SYNC_CONFIG, "deferred": True}}}},
+    default_status=DefaultScheduleStatus.STOPPED,
 )
 
 # Export schedules
-schedules = [daily_weather_schedule]
\ No newline at end of file
+schedules = [daily_weather_schedule, deferred_weather_schedule]
\ No newline at end of file
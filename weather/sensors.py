@@ -0,0 +1,117 @@
+import json
+from collections import defaultdict
+
+from dagster import (
+    AssetObservation,
+    AssetMaterialization,
+    AssetRecordsFilter,
+    DagsterRunStatus,
+    DefaultSensorStatus,
+    RunRequest,
+    RunStatusSensorContext,
+    SensorEvaluationContext,
+    SensorResult,
+    SkipReason,
+    run_status_sensor,
+    sensor,
+)
+
+from .airbyte import airbyte_sync_asset, sync_description, sync_metadata
+from .history import JobHistoryStore
+from .partitions import forecast_partition_keys
+from .polling import TERMINAL_STATUSES
+from .resources import AirbyteClientResource
+from .schedules import combined_job, daily_marts_job, dbt_job
+
+
+def _metadata_value(metadata, key):
+    value = metadata.get(key)
+    return getattr(value, "value", value)
+
+
+@sensor(
+    job=dbt_job,
+    minimum_interval_seconds=30,
+    description="Completes deferred Airbyte syncs and runs the dbt models once they have finished",
+)
+def airbyte_job_sensor(context: SensorEvaluationContext, airbyte: AirbyteClientResource):
+    """Checks the Airbyte jobs triggered by `airbyte_sync_asset` in deferred mode.
+
+    The cursor holds the storage id of the last observation read and the jobs
+    still running. Jobs are checked in batches, with one `jobs/list` call per
+    connection, and only jobs that dropped out of that page are fetched one by one.
+    """
+    cursor = json.loads(context.cursor) if context.cursor else {"after": None, "pending": {}}
+    pending = cursor["pending"]
+
+    # Pick up jobs triggered since the last tick
+    result = context.instance.fetch_observations(
+        AssetRecordsFilter(asset_key=airbyte_sync_asset.key, after_storage_id=cursor["after"]),
+        limit=100,
+        ascending=True,
+    )
+    for record in result.records:
+        metadata = record.asset_observation.metadata
+        if _metadata_value(metadata, "status") == "pending":
+            pending[_metadata_value(metadata, "job_id")] = _metadata_value(metadata, "connection_id")
+        cursor["after"] = record.storage_id
+
+    if not pending:
+        return SensorResult(skip_reason=SkipReason("No pending Airbyte jobs"), cursor=json.dumps(cursor))
+
+    jobs_by_connection = defaultdict(list)
+    for job_id, connection_id in pending.items():
+        jobs_by_connection[connection_id].append(job_id)
+
+    asset_events = []
+    run_requests = []
+    history = JobHistoryStore()
+    for connection_id, job_ids in jobs_by_connection.items():
+        recent_jobs = {str(job["id"]): job for job in airbyte.list_jobs(connection_id, limit=max(10, len(job_ids)))}
+        for job_id in job_ids:
+            job_info = recent_jobs.get(job_id) or airbyte.get_job(int(job_id))
+            final_status = job_info.get("status", "unknown")
+            if final_status not in TERMINAL_STATUSES:
+                continue
+
+            del pending[job_id]
+            history.record(connection_id, [job_info])
+            metadata, total_records = sync_metadata(job_info)
+            context.log.info(f"Airbyte job {job_id} finished with status {final_status}, total records: {total_records}")
+
+            if final_status != "succeeded":
+                asset_events.append(AssetObservation(
+                    asset_key=airbyte_sync_asset.key,
+                    description=sync_description(final_status),
+                    metadata=metadata,
+                ))
+                continue
+
+            asset_events.append(AssetMaterialization(
+                asset_key=airbyte_sync_asset.key,
+                description=sync_description(final_status),
+                metadata=metadata,
+            ))
+            run_requests.append(RunRequest(run_key=f"airbyte-job-{job_id}", tags={"airbyte/job_id": job_id}))
+
+    return SensorResult(run_requests=run_requests, asset_events=asset_events, cursor=json.dumps(cursor))
+
+
+@run_status_sensor(
+    run_status=DagsterRunStatus.SUCCESS,
+    monitored_jobs=[combined_job, dbt_job],
+    request_job=daily_marts_job,
+    default_status=DefaultSensorStatus.RUNNING,
+    description="Builds the daily marts for the forecast days once the other dbt models are up to date",
+)
+def daily_marts_sensor(context: RunStatusSensorContext):
+    """One run for every partition a sync can change, from today to the end of the forecast."""
+    partition_keys = forecast_partition_keys()
+    return RunRequest(
+        run_key=context.dagster_run.run_id,
+        tags={
+            # A single run for the whole range, as a backfill would launch it
+            "dagster/asset_partition_range_start": partition_keys[0],
+            "dagster/asset_partition_range_end": partition_keys[-1],
+        },
+    )
@@ -2,124 +2,12 @@ import requests
 import time
 from datetime import datetime
 
-# === CONFIGURATION ===
-AIRBYTE_HOST = "http://13.39.50.171.nip.io"
-CLIENT_ID = "66d891a9-88a9-4963-8798-2aa3ea54f402"
-CLIENT_SECRET = "KzxIM8REdry0ytOGT2CkU4aYWtGkwXhV"
+from weather.resources import AirbyteClientResource
 
-# === API FUNCTIONS ===
+# === API CLIENT ===
 
-def get_access_token():
-    url = f"{AIRBYTE_HOST}/api/v1/applications/token"
-    payload = {
-        "client_id": CLIENT_ID,
-        "client_secret": CLIENT_SECRET,
-    }
-    headers = {
-        "accept": "application/json",
-        "content-type": "application/json",
-    }
-    response = requests.post(url, json=payload, headers=headers)
-    response.raise_for_status()
-    return response.json()["access_token"]
-
-def list_workspaces(token):
-    url = f"{AIRBYTE_HOST}/api/v1/workspaces/list"
-    headers = {
-        "Authorization": f"Bearer {token}",
-        "accept": "application/json"
-    }
-    response = requests.post(url, headers=headers, json={})
-    response.raise_for_status()
-    return response.json()["workspaces"]
-
-def list_connections(token, workspace_id):
-    url = f"{AIRBYTE_HOST}/api/v1/connections/list"
-    headers = {
-        "Authorization": f"Bearer {token}",
-        "accept": "application/json",
-        "content-type": "application/json"
-    }
-    payload = {
-        "workspaceId": workspace_id
-    }
-    response = requests.post(url, headers=headers, json=payload)
-    response.raise_for_status()
-    return response.json()["connections"]
-
-def get_connection_details(token, connection_id):
-    url = f"{AIRBYTE_HOST}/api/v1/connections/get"
-    headers = {
-        "Authorization": f"Bearer {token}",
-        "accept": "application/json",
-        "content-type": "application/json"
-    }
-    payload = {
-        "connectionId": connection_id
-    }
-    response = requests.post(url, headers=headers, json=payload)
-    response.raise_for_status()
-    return response.json()
-
-def list_jobs(token, connection_id, limit=10):
-    url = f"{AIRBYTE_HOST}/api/v1/jobs/list"
-    headers = {
-        "Authorization": f"Bearer {token}",
-        "accept": "application/json",
-        "content-type": "application/json"
-    }
-    payload = {
-        "configTypes": ["sync"],
-        "configId": connection_id,
-        "pagination": {
-            "pageSize": limit
-        }
-    }
-    response = requests.post(url, headers=headers, json=payload)
-    response.raise_for_status()
-    return response.json()["jobs"]
-
-def trigger_sync(token, connection_id):
-    url = f"{AIRBYTE_HOST}/api/v1/connections/sync"
-    headers = {
-        "Authorization": f"Bearer {token}",
-        "accept": "application/json",
-        "content-type": "application/json"
-    }
-    payload = {
-        "connectionId": connection_id
-    }
-    response = requests.post(url, headers=headers, json=payload)
-    response.raise_for_status()
-    return response.json()
-
-def get_job_status(token, job_id):
-    url = f"{AIRBYTE_HOST}/api/v1/jobs/get"
-    headers = {
-        "Authorization": f"Bearer {token}",
-        "accept": "application/json",
-        "content-type": "application/json"
-    }
-    payload = {
-        "id": job_id
-    }
-    response = requests.post(url, headers=headers, json=payload)
-    response.raise_for_status()
-    return response.json()["job"]
-
-def get_job_logs(token, job_id):
-    url = f"{AIRBYTE_HOST}/api/v1/jobs/get_debug_info"
-    headers = {
-        "Authorization": f"Bearer {token}",
-        "accept": "application/json",
-        "content-type": "application/json"
-    }
-    payload = {
-        "id": job_id
-    }
-    response = requests.post(url, headers=headers, json=payload)
-    response.raise_for_status()
-    return response.json()
+# Shares one pooled session and a cached token across every menu action
+airbyte = AirbyteClientResource()
 
 def format_timestamp(timestamp_ms):
     """Convert millisecond timestamp to readable date format"""
@@ -140,9 +28,9 @@ def display_menu():
     print("7. Exit")
     return input("\nSelect an option (1-7): ")
 
-def handle_list_connections(token, workspace_id):
+def handle_list_connections(workspace_id):
     print("\n🔄 Listing connections...")
-    connections = list_connections(token, workspace_id)
+    connections = airbyte.list_connections(workspace_id)
     if not connections:
         print("No connections found.")
         return None
@@ -165,9 +53,9 @@ def handle_list_connections(token, workspace_id):
     
     return None
 
-def handle_view_connection_details(token, connection_id):
+def handle_view_connection_details(connection_id):
     print(f"\n📋 Getting details for connection {connection_id}...")
-    details = get_connection_details(token, connection_id)
+    details = airbyte.get_connection(connection_id)
     
     print(f"Name: {details.get('name', 'Unknown')}")
     print(f"Status: {details.get('status', 'Unknown')}")
@@ -198,9 +86,9 @@ def handle_view_connection_details(token, connection_id):
             print(f"    Sync Mode: {sync_mode}")
             print(f"    Destination Sync Mode: {destination_sync_mode}")
 
-def handle_view_recent_jobs(token, connection_id):
+def handle_view_recent_jobs(connection_id):
     print(f"\n📊 Getting recent jobs for connection {connection_id}...")
-    jobs = list_jobs(token, connection_id)
+    jobs = airbyte.list_jobs(connection_id)
     
     if not jobs:
         print("No recent jobs found.")
@@ -232,10 +120,10 @@ def handle_view_recent_jobs(token, connection_id):
     
     return None
 
-def handle_trigger_sync(token, connection_id):
+def handle_trigger_sync(connection_id):
     print(f"\n▶️ Triggering sync for connection {connection_id}...")
     try:
-        result = trigger_sync(token, connection_id)
+        result = airbyte.request("connections/sync", {"connectionId": connection_id})
         job_id = result.get('job', {}).get('id')
         if job_id:
             print(f"✅ Sync job triggered successfully! Job ID: {job_id}")
@@ -249,13 +137,13 @@ def handle_trigger_sync(token, connection_id):
             print(e.response.text)
         return None
 
-def handle_check_job_status(token, job_id):
+def handle_check_job_status(job_id):
     if not job_id:
         job_id = input("\nEnter Job ID: ")
     
     print(f"\n🔍 Checking status for job {job_id}...")
     try:
-        job = get_job_status(token, job_id)
+        job = airbyte.get_job(job_id)
         
         status = job.get('status', 'Unknown')
         created_at = format_timestamp(job.get('createdAt'))
@@ -301,13 +189,13 @@ def handle_check_job_status(token, job_id):
             print(e.response.text)
         return None
 
-def handle_get_job_logs(token, job_id):
+def handle_get_job_logs(job_id):
     if not job_id:
         job_id = input("\nEnter Job ID: ")
     
     print(f"\n📜 Getting logs for job {job_id}...")
     try:
-        log_info = get_job_logs(token, job_id)
+        log_info = airbyte.get_job_debug_info(job_id)
         
         # Display attempts info and logs
         attempts = log_info.get('attempts', [])
@@ -331,7 +219,7 @@ def handle_get_job_logs(token, job_id):
             print(e.response.text)
         return None
 
-def wait_for_job_completion(token, job_id, timeout_seconds=300):
+def wait_for_job_completion(job_id, timeout_seconds=300):
     """Wait for a job to complete or fail, with a timeout"""
     print(f"\n⏳ Waiting for job {job_id} to complete...")
     print("Press Ctrl+C to stop waiting")
@@ -344,7 +232,7 @@ def wait_for_job_completion(token, job_id, timeout_seconds=300):
                 print(f"\n⚠️ Timeout after waiting {timeout_seconds} seconds")
                 return False
             
-            job = get_job_status(token, job_id)
+            job = airbyte.get_job(job_id)
             status = job.get('status', 'Unknown')
             
             if status == "succeeded":
@@ -365,11 +253,11 @@ def wait_for_job_completion(token, job_id, timeout_seconds=300):
 def main():
     try:
         print("🔐 Getting access token...")
-        token = get_access_token()
+        airbyte.get_token()
         print("✅ Access token retrieved")
         
         # Get workspace ID just once
-        workspaces = list_workspaces(token)
+        workspaces = airbyte.list_workspaces()
         workspace_id = workspaces[0]["workspaceId"]
         print(f"✅ Using workspace: {workspaces[0]['name']} (ID: {workspace_id})")
         
@@ -380,57 +268,57 @@ def main():
             choice = display_menu()
             
             if choice == '1':
-                connection_id = handle_list_connections(token, workspace_id)
+                connection_id = handle_list_connections(workspace_id)
             
             elif choice == '2':
                 if not connection_id:
-                    connection_id = handle_list_connections(token, workspace_id)
+                    connection_id = handle_list_connections(workspace_id)
                 
                 if connection_id:
-                    handle_view_connection_details(token, connection_id)
+                    handle_view_connection_details(connection_id)
             
             elif choice == '3':
                 if not connection_id:
-                    connection_id = handle_list_connections(token, workspace_id)
+                    connection_id = handle_list_connections(workspace_id)
                 
                 if connection_id:
-                    job_id = handle_view_recent_jobs(token, connection_id)
+                    job_id = handle_view_recent_jobs(connection_id)
             
             elif choice == '4':
                 if not connection_id:
-                    connection_id = handle_list_connections(token, workspace_id)
+                    connection_id = handle_list_connections(workspace_id)
                 
                 if connection_id:
-                    job_id = handle_trigger_sync(token, connection_id)
+                    job_id = handle_trigger_sync(connection_id)
                     
                     if job_id:
                         wait_response = input("\nWould you like to wait for the job to complete? (y/n): ")
                         if wait_response.lower() == 'y':
-                            success = wait_for_job_completion(token, job_id)
+                            success = wait_for_job_completion(job_id)
                             if success:
-                                handle_check_job_status(token, job_id)
+                                handle_check_job_status(job_id)
             
             elif choice == '5':
                 if not job_id:
                     if not connection_id:
-                        connection_id = handle_list_connections(token, workspace_id)
+                        connection_id = handle_list_connections(workspace_id)
                     
                     if connection_id:
-                        job_id = handle_view_recent_jobs(token, connection_id)
+                        job_id = handle_view_recent_jobs(connection_id)
                 
                 if job_id:
-                    handle_check_job_status(token, job_id)
+                    handle_check_job_status(job_id)
             
             elif choice == '6':
                 if not job_id:
                     if not connection_id:
-                        connection_id = handle_list_connections(token, workspace_id)
+                        connection_id = handle_list_connections(workspace_id)
                     
                     if connection_id:
-                        job_id = handle_view_recent_jobs(token, connection_id)
+                        job_id = handle_view_recent_jobs(connection_id)
                 
                 if job_id:
-                    handle_get_job_logs(token, job_id)
+                    handle_get_job_logs(job_id)
             
             elif choice == '7':
                 print("\nExiting Airbyte API Manager. Goodbye!")
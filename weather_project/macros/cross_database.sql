@@ -0,0 +1,145 @@
+{#
+    Snowflake-only constructs of the models, compiled for each adapter through
+    dbt's adapter.dispatch(). The default__ macros render the Snowflake syntax
+    the models were written in; the duckdb__ ones render the equivalent for
+    the offline `duckdb` target.
+
+    Paths into semi-structured columns are lists of keys and array indexes,
+    empty for the value itself:
+
+        {{ variant_get('f.value', ['@attributes', 'fecha'], 'STRING') }}
+        -- Snowflake: f.value:"@attributes"."fecha"::STRING
+        -- DuckDB:    json_extract_string(f.value, '$."@attributes"."fecha"')
+#}
+
+{% macro variant_get(expression, path, data_type=none) %}
+  {{ return(adapter.dispatch('variant_get', 'weather_project')(expression, path, data_type)) }}
+{% endmacro %}
+
+{% macro default__variant_get(expression, path, data_type) -%}
+    {%- set parts = [] -%}
+    {%- for element in path -%}
+        {%- if element is number -%}
+            {%- do parts.append('[' ~ element ~ ']') -%}
+        {%- else -%}
+            {%- do parts.append(('.' if parts else '') ~ '"' ~ element ~ '"') -%}
+        {%- endif -%}
+    {%- endfor -%}
+    {{ expression }}{% if parts %}:{{ parts | join('') }}{% endif %}{% if data_type %}::{{ data_type }}{% endif %}
+{%- endmacro %}
+
+{% macro duckdb__variant_get(expression, path, data_type) -%}
+    {%- set json_path = ['$'] -%}
+    {%- for element in path -%}
+        {%- do json_path.append('[' ~ element ~ ']' if element is number else '."' ~ element ~ '"') -%}
+    {%- endfor -%}
+    {%- if data_type is none -%}
+        json_extract({{ expression }}, '{{ json_path | join('') }}')
+    {%- else -%}
+        {#- Scalars are read as text first, so that JSON strings such as "12" cast like Snowflake's variants -#}
+        CAST(json_extract_string({{ expression }}, '{{ json_path | join('') }}') AS {{ data_type }})
+    {%- endif -%}
+{%- endmacro %}
+
+
+{#
+    The element of an array at a position computed by the query, such as the
+    index of a flattened array's element:
+
+        {{ variant_element(variant_get('d.value', ['viento']), flatten_index('f')) }}
+#}
+{% macro variant_element(expression, index) %}
+  {{ return(adapter.dispatch('variant_element', 'weather_project')(expression, index)) }}
+{% endmacro %}
+
+{% macro default__variant_element(expression, index) -%}
+    GET({{ expression }}, {{ index }})
+{%- endmacro %}
+
+{% macro duckdb__variant_element(expression, index) -%}
+    json_extract({{ expression }}, {{ index }})
+{%- endmacro %}
+
+{#
+    A FROM item with one row per element of an array (or key of an object),
+    exposing `<alias>.value` and `<alias>.index` like Snowflake's FLATTEN.
+    `flatten_index(alias)` reads the element's position.
+#}
+{% macro flatten(input, alias) %}
+  {{ return(adapter.dispatch('flatten', 'weather_project')(input, alias)) }}
+{% endmacro %}
+
+{% macro default__flatten(input, alias) -%}
+    LATERAL FLATTEN(input => {{ input }}) {{ alias }}
+{%- endmacro %}
+
+{% macro duckdb__flatten(input, alias) -%}
+    json_each({{ input }}) AS {{ alias }}
+{%- endmacro %}
+
+{% macro flatten_index(alias) %}
+  {{ return(adapter.dispatch('flatten_index', 'weather_project')(alias)) }}
+{% endmacro %}
+
+{% macro default__flatten_index(alias) -%}
+    {{ alias }}.index
+{%- endmacro %}
+
+{% macro duckdb__flatten_index(alias) -%}
+    CAST({{ alias }}.key AS INTEGER)
+{%- endmacro %}
+
+
+{#
+    LAG/LEAD/FIRST_VALUE/LAST_VALUE skipping nulls:
+
+        {{ window_ignore_nulls('LAG', 'uv_index', 'ORDER BY forecast_date') }}
+#}
+{% macro window_ignore_nulls(function, expression, over) %}
+  {{ return(adapter.dispatch('window_ignore_nulls', 'weather_project')(function, expression, over)) }}
+{% endmacro %}
+
+{% macro default__window_ignore_nulls(function, expression, over) -%}
+    {{ function }}({{ expression }}) IGNORE NULLS OVER ({{ over }})
+{%- endmacro %}
+
+{% macro duckdb__window_ignore_nulls(function, expression, over) -%}
+    {{ function }}({{ expression }} IGNORE NULLS) OVER ({{ over }})
+{%- endmacro %}
+
+
+{% macro to_timestamp_ntz(expression) %}
+  {{ return(adapter.dispatch('to_timestamp_ntz', 'weather_project')(expression)) }}
+{% endmacro %}
+
+{% macro default__to_timestamp_ntz(expression) -%}
+    TO_TIMESTAMP_NTZ({{ expression }})
+{%- endmacro %}
+
+{% macro duckdb__to_timestamp_ntz(expression) -%}
+    CAST({{ expression }} AS TIMESTAMP)
+{%- endmacro %}
+
+
+{% macro to_date(expression) %}
+  {{ return(adapter.dispatch('to_date', 'weather_project')(expression)) }}
+{% endmacro %}
+
+{% macro default__to_date(expression) -%}
+    TO_DATE({{ expression }})
+{%- endmacro %}
+
+{% macro duckdb__to_date(expression) -%}
+    CAST({{ expression }} AS DATE)
+{%- endmacro %}
+
+
+{#
+    On the offline duckdb target the raw table is the `palma` seed. Models
+    reading the raw source call this so that `dbt build` loads the seed first.
+#}
+{% macro raw_seed_dependency() %}
+  {%- if target.type == 'duckdb' -%}
+    -- depends_on: {{ ref('palma') }}
+  {%- endif -%}
+{% endmacro %}
@@ -0,0 +1,24 @@
+{#
+    Incremental filter of the models loaded by extraction time: only rows
+    extracted after the latest `extracted_at` the model already loaded, less
+    `staging_lookback_hours` for rows Airbyte loads late. Rows read again
+    replace their earlier version through the model's unique_key.
+
+        {% if is_incremental() %}
+          WHERE {{ extracted_since_last_load('_AIRBYTE_EXTRACTED_AT') }}
+        {% endif %}
+
+        dbt build --select staging --vars '{"staging_lookback_hours": 72}'
+
+    `--full-refresh`, or the model in the `full_refresh_models` var, reloads
+    the whole raw history.
+#}
+{% macro extracted_since_last_load(column) -%}
+    {{ column }} > (
+        SELECT COALESCE(
+            {{ dbt.dateadd('hour', -1 * var('staging_lookback_hours'), 'MAX(extracted_at)') }},
+            CAST('1970-01-01' AS TIMESTAMP)
+        )
+        FROM {{ this }}
+    )
+{%- endmacro %}
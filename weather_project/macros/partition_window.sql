@@ -0,0 +1,37 @@
+{#
+    Filter for models built one partition window at a time. Dagster passes
+    the window of the run as dates, the end excluded:
+
+        dbt build --select tag:daily --vars '{"start_date": "2025-03-01", "end_date": "2025-03-08"}'
+
+    Without these vars the models keep their incremental filter.
+#}
+{% macro has_partition_window() %}
+  {{ return(var('start_date', none) is not none and var('end_date', none) is not none) }}
+{% endmacro %}
+
+{% macro partition_window_filter(date_column) -%}
+    {{ date_column }} >= CAST('{{ var("start_date") }}' AS DATE)
+    AND {{ date_column }} < CAST('{{ var("end_date") }}' AS DATE)
+{%- endmacro %}
+
+
+{#
+    Incremental filter of the date-grain marts outside partition windows: the
+    last `daily_lookback_days` dates the model already has, and any later one.
+    Every sync revises the forecast of the days ahead, so those dates are
+    recomputed and replace their earlier rows through unique_key. An empty
+    table, e.g. after a partitioned run over a window without data, loads
+    every date:
+
+        dbt build --select tag:daily --vars '{"daily_lookback_days": 14}'
+#}
+{% macro lookback_window_filter(date_column) -%}
+    {{ date_column }} > (
+        SELECT COALESCE(
+            {{ dbt.dateadd('day', -1 * var('daily_lookback_days'), 'MAX(date)') }},
+            CAST('1900-01-01' AS DATE)
+        )
+        FROM {{ this }}
+    )
+{%- endmacro %}
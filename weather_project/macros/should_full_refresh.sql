@@ -0,0 +1,19 @@
+{#
+    Overrides dbt's built-in should_full_refresh() so single incremental models
+    can be rebuilt from scratch without --full-refresh on the whole run:
+
+        dbt build --vars '{"full_refresh_models": ["weather_trends"]}'
+
+    Everything else behaves as in dbt: the model's full_refresh config wins,
+    then the --full-refresh flag.
+#}
+{% macro should_full_refresh() %}
+  {% if model.name in var('full_refresh_models', []) %}
+    {{ return(true) }}
+  {% endif %}
+  {% set config_full_refresh = config.get('full_refresh') %}
+  {% if config_full_refresh is none %}
+    {% set config_full_refresh = flags.FULL_REFRESH %}
+  {% endif %}
+  {{ return(config_full_refresh) }}
+{% endmacro %}
@@ -1,21 +1,33 @@
 {{ config(
     materialized = 'incremental',
+    incremental_strategy = 'delete+insert',
     unique_key = ['date_time', 'extracted_at']
 ) }}
 
-WITH base AS (
-    SELECT 
+-- Only the observations extracted since the last load are deduplicated; the ones
+-- read again within the lookback replace their earlier version through unique_key
+WITH new_observations AS (
+    SELECT
         date_time,
         temperature,
         humidity,
         wind_speed,
         sky_condition,
-        extracted_at,
+        extracted_at
+    FROM {{ ref('stg_weather_current') }}
+    {% if is_incremental() %}
+      WHERE {{ extracted_since_last_load('extracted_at') }}
+    {% endif %}
+),
+
+base AS (
+    SELECT 
+        *,
         ROW_NUMBER() OVER (
             PARTITION BY date_time, extracted_at 
             ORDER BY extracted_at DESC
         ) AS rn
-    FROM {{ ref('stg_weather_current') }}
+    FROM new_observations
 )
 
 SELECT
@@ -27,9 +39,3 @@ SELECT
     extracted_at
 FROM base
 WHERE rn = 1
-
-{% if is_incremental() %}
-  AND (date_time, extracted_at) NOT IN (
-    SELECT date_time, extracted_at FROM {{ this }}
-  )
-{% endif %}
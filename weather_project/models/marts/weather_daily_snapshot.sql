@@ -1,6 +1,7 @@
 {{ config(
     materialized = 'incremental',
-    unique_key = 'date'
+    unique_key = 'date',
+    tags = ['daily']
 ) }}
 
 WITH latest_current AS (
@@ -24,7 +25,9 @@ SELECT
     l.extracted_at AS current_extracted_at
 FROM {{ ref('weather_daily_summary') }} d
 LEFT JOIN latest_current l ON d.date = l.date AND l.rn = 1
-{% if is_incremental() %}
-  WHERE d.date > (SELECT max(date) FROM {{ this }})
+{% if has_partition_window() %}
+  WHERE {{ partition_window_filter('d.date') }}
+{% elif is_incremental() %}
+  WHERE {{ lookback_window_filter('d.date') }}
 {% endif %}
 ORDER BY d.date
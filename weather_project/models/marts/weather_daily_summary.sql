@@ -1,10 +1,11 @@
 {{ config(
     materialized = 'incremental',
-    unique_key = 'date'
+    unique_key = 'date',
+    tags = ['daily']
 ) }}
 
 SELECT
-    TO_DATE(forecast_date) AS date,
+    {{ to_date('forecast_date') }} AS date,
     MAX(extracted_at) AS last_updated,
     AVG(max_temp) AS avg_max_temp,
     AVG(min_temp) AS avg_min_temp,
@@ -15,8 +16,10 @@ SELECT
     MAX(uv_index) AS max_uv_index,
     LISTAGG(DISTINCT sky_condition, ', ') AS weather_conditions
 FROM {{ ref('stg_weather_forecast_daily') }}
-{% if is_incremental() %}
-  WHERE TO_DATE(forecast_date) > (SELECT max(date) FROM {{ this }})
+{% if has_partition_window() %}
+  WHERE {{ partition_window_filter(to_date('forecast_date')) }}
+{% elif is_incremental() %}
+  WHERE {{ lookback_window_filter(to_date('forecast_date')) }}
 {% endif %}
 GROUP BY date
 ORDER BY date
@@ -1,8 +1,9 @@
 {{ config(
-    materialized = 'incremental',
-    unique_key = 'date'
+    materialized = 'table'
 ) }}
 
+-- Records across every date, so the table is rebuilt whole on each run (at most 4 rows).
+-- Not a date-grain mart: a partition window would only rank the dates of that window
 WITH extremes AS (
     SELECT
         date,
@@ -20,7 +21,4 @@ WITH extremes AS (
 
 SELECT * FROM extremes
 WHERE (hottest_day = 1 OR coldest_day = 1 OR wettest_day = 1 OR highest_uv_day = 1)
-{% if is_incremental() %}
-  AND date > (SELECT max(date) FROM {{ this }})
-{% endif %}
 ORDER BY date
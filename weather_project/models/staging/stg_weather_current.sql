@@ -1,16 +1,23 @@
 {{ config(
-    materialized = 'view'
+    materialized = 'incremental',
+    incremental_strategy = 'delete+insert',
+    unique_key = 'extracted_at'
 ) }}
 
+{{ raw_seed_dependency() }}
+
 SELECT
     CASE 
-        WHEN FECHA IS NULL THEN NULLIF(TO_TIMESTAMP_NTZ('1970-01-01'), '1970-01-01')
-        ELSE TO_TIMESTAMP_NTZ(FECHA) 
+        WHEN FECHA IS NULL THEN NULLIF({{ to_timestamp_ntz("'1970-01-01'") }}, '1970-01-01')
+        ELSE {{ to_timestamp_ntz('FECHA') }} 
     END AS date_time,
-    CAST(TEMPERATURA_ACTUAL AS NUMBER(4,1)) AS temperature,
-    CAST(HUMEDAD AS NUMBER(4,1)) AS humidity,
-    CAST(VIENTO AS NUMBER(4,1)) AS wind_speed,
-    STATESKY:description::STRING AS sky_condition,
+    CAST(TEMPERATURA_ACTUAL AS DECIMAL(4,1)) AS temperature,
+    CAST(HUMEDAD AS DECIMAL(4,1)) AS humidity,
+    CAST(VIENTO AS DECIMAL(4,1)) AS wind_speed,
+    {{ variant_get('STATESKY', ['description'], 'STRING') }} AS sky_condition,
     _AIRBYTE_EXTRACTED_AT AS extracted_at
 FROM {{ source('raw', 'PALMA') }}
 WHERE FECHA IS NOT NULL
+{% if is_incremental() %}
+  AND {{ extracted_since_last_load('_AIRBYTE_EXTRACTED_AT') }}
+{% endif %}
@@ -1,12 +1,34 @@
 {{ config(
-    materialized = 'view'
+    materialized = 'incremental',
+    incremental_strategy = 'delete+insert',
+    unique_key = 'extracted_at'
 ) }}
 
+{{ raw_seed_dependency() }}
+
 WITH forecast_data AS (
     SELECT
         PROXIMOS_DIAS AS forecast_days,
         _AIRBYTE_EXTRACTED_AT AS extracted_at
     FROM {{ source('raw', 'PALMA') }}
+    {% if is_incremental() %}
+      WHERE {{ extracted_since_last_load('_AIRBYTE_EXTRACTED_AT') }}
+    {% endif %}
+),
+
+forecast_days AS (
+    SELECT
+        extracted_at,
+        {{ variant_get('f.value', ['@attributes', 'fecha'], 'STRING') }} AS forecast_date,
+        {{ variant_get('f.value', ['temperatura', 'maxima'], 'DECIMAL(4,1)') }} AS max_temp,
+        {{ variant_get('f.value', ['temperatura', 'minima'], 'DECIMAL(4,1)') }} AS min_temp,
+        {{ variant_get('f.value', ['humedad_relativa', 'maxima'], 'DECIMAL(4,1)') }} AS max_humidity,
+        {{ variant_get('f.value', ['humedad_relativa', 'minima'], 'DECIMAL(4,1)') }} AS min_humidity,
+        {{ variant_get('f.value', ['prob_precipitacion', 0], 'INTEGER') }} AS precipitation_probability,
+        {{ variant_get('f.value', ['estado_cielo_descripcion', 0], 'STRING') }} AS sky_condition,
+        {{ variant_get('f.value', ['uv_max'], 'INTEGER') }} AS uv_index
+    FROM forecast_data,
+    {{ flatten('forecast_days', 'f') }}
 )
 
 SELECT
@@ -35,21 +57,14 @@ SELECT
     ) AS uv_index
 FROM (
     SELECT
-        extracted_at,
-        f.value:"@attributes":fecha::STRING AS forecast_date,
-        f.value:temperatura:maxima::NUMBER(4,1) AS max_temp,
-        f.value:temperatura:minima::NUMBER(4,1) AS min_temp,
-        f.value:humedad_relativa:maxima::NUMBER(4,1) AS max_humidity,
-        f.value:humedad_relativa:minima::NUMBER(4,1) AS min_humidity,
-        f.value:prob_precipitacion[0]::NUMBER AS precipitation_probability,
-        f.value:estado_cielo_descripcion[0]::STRING AS sky_condition,
-        f.value:uv_max::NUMBER AS uv_index,
-        -- Previous and next non-null for interpolation
-        LAG(f.value:prob_precipitacion[0]::NUMBER) IGNORE NULLS OVER (ORDER BY f.value:"@attributes":fecha::STRING) AS PREV_PRECIP,
-        LEAD(f.value:prob_precipitacion[0]::NUMBER) IGNORE NULLS OVER (ORDER BY f.value:"@attributes":fecha::STRING) AS NEXT_PRECIP,
-        LAG(f.value:estado_cielo_descripcion[0]::STRING) IGNORE NULLS OVER (ORDER BY f.value:"@attributes":fecha::STRING) AS PREV_SKY,
-        LAG(f.value:uv_max::NUMBER) IGNORE NULLS OVER (ORDER BY f.value:"@attributes":fecha::STRING) AS PREV_UV,
-        LEAD(f.value:uv_max::NUMBER) IGNORE NULLS OVER (ORDER BY f.value:"@attributes":fecha::STRING) AS NEXT_UV
-    FROM forecast_data,
-    LATERAL FLATTEN(input => forecast_days) f
+        *,
+        -- Previous and next non-null for interpolation, within the forecast of the same
+        -- extraction: each station's sync is its own extraction, so stations don't mix either
+        {%- set by_date = 'PARTITION BY extracted_at ORDER BY forecast_date' %}
+        {{ window_ignore_nulls('LAG', 'precipitation_probability', by_date) }} AS PREV_PRECIP,
+        {{ window_ignore_nulls('LEAD', 'precipitation_probability', by_date) }} AS NEXT_PRECIP,
+        {{ window_ignore_nulls('LAG', 'sky_condition', by_date) }} AS PREV_SKY,
+        {{ window_ignore_nulls('LAG', 'uv_index', by_date) }} AS PREV_UV,
+        {{ window_ignore_nulls('LEAD', 'uv_index', by_date) }} AS NEXT_UV
+    FROM forecast_days
 )
@@ -1,83 +1,65 @@
 {{ config(
-    materialized = 'view'
+    materialized = 'incremental',
+    incremental_strategy = 'delete+insert',
+    unique_key = 'extracted_at'
 ) }}
 
+{{ raw_seed_dependency() }}
+
+-- Every forecast day of PRONOSTICO (hoy, manana, ...) in one pass: each day's
+-- temperatures are flattened, and the other hourly arrays are read at the same
+-- position, which is the hour (and viento's periodo). Extractions read again
+-- replace all their rows.
 WITH hourly_data AS (
     SELECT
-        PRONOSTICO:hoy AS hourly_forecast,
+        PRONOSTICO AS hourly_forecast,
         _AIRBYTE_EXTRACTED_AT AS extracted_at
     FROM {{ source('raw', 'PALMA') }}
+    {% if is_incremental() %}
+      WHERE {{ extracted_since_last_load('_AIRBYTE_EXTRACTED_AT') }}
+    {% endif %}
 ),
 
-forecast_date AS (
-    SELECT
-        extracted_at,
-        hourly_forecast:"@attributes":fecha::STRING AS forecast_date
-    FROM hourly_data
-),
-
-temperatures AS (
-    SELECT
-        h.extracted_at,
-        fd.forecast_date,
-        f.index AS hour_index,
-        f.value::NUMBER(4,1) AS temperature
-    FROM hourly_data h
-    JOIN forecast_date fd ON h.extracted_at = fd.extracted_at
-    , LATERAL FLATTEN(input => h.hourly_forecast:temperatura) f
-),
-
-humidity AS (
-    SELECT
-        h.extracted_at,
-        fd.forecast_date,
-        f.index AS hour_index,
-        f.value::NUMBER(4,1) AS humidity
-    FROM hourly_data h
-    JOIN forecast_date fd ON h.extracted_at = fd.extracted_at
-    , LATERAL FLATTEN(input => h.hourly_forecast:humedad_relativa) f
-),
-
-sky_conditions AS (
+forecast_days AS (
     SELECT
         h.extracted_at,
-        fd.forecast_date,
-        f.index AS hour_index,
-        f.value::STRING AS sky_condition
-    FROM hourly_data h
-    JOIN forecast_date fd ON h.extracted_at = fd.extracted_at
-    , LATERAL FLATTEN(input => h.hourly_forecast:estado_cielo_descripcion) f
+        {{ variant_get('d.value', ['@attributes', 'fecha'], 'STRING') }} AS forecast_date,
+        {{ variant_get('d.value', ['temperatura']) }} AS temperatures,
+        {{ variant_get('d.value', ['humedad_relativa']) }} AS humidities,
+        {{ variant_get('d.value', ['estado_cielo_descripcion']) }} AS sky_conditions,
+        {{ variant_get('d.value', ['viento']) }} AS winds
+    FROM hourly_data h,
+    {{ flatten('h.hourly_forecast', 'd') }}
 ),
 
-wind AS (
+hours AS (
     SELECT
-        h.extracted_at,
+        fd.extracted_at,
         fd.forecast_date,
-        f.value:"@attributes":periodo::NUMBER AS hour_index,
-        f.value:direccion::STRING AS wind_direction,
-        f.value:velocidad::NUMBER AS wind_speed
-    FROM hourly_data h
-    JOIN forecast_date fd ON h.extracted_at = fd.extracted_at
-    , LATERAL FLATTEN(input => h.hourly_forecast:viento) f
+        {{ flatten_index('f') }} AS hour_index,
+        {{ variant_get('f.value', [], 'DECIMAL(4,1)') }} AS temperature,
+        {{ variant_get(variant_element('fd.humidities', flatten_index('f')), [], 'DECIMAL(4,1)') }} AS humidity,
+        {{ variant_get(variant_element('fd.sky_conditions', flatten_index('f')), [], 'STRING') }} AS sky_condition,
+        {{ variant_get(variant_element('fd.winds', flatten_index('f')), ['direccion'], 'STRING') }} AS wind_direction,
+        {{ variant_get(variant_element('fd.winds', flatten_index('f')), ['velocidad'], 'INTEGER') }} AS wind_speed
+    FROM forecast_days fd,
+    {{ flatten('fd.temperatures', 'f') }}
 )
 
 SELECT
-    t.extracted_at,
-    t.forecast_date,
-    t.hour_index,
+    extracted_at,
+    forecast_date,
+    hour_index,
     CASE 
-        WHEN t.hour_index = 0 THEN '00:00'
-        WHEN t.hour_index = 6 THEN '06:00'
-        WHEN t.hour_index = 12 THEN '12:00'
-        WHEN t.hour_index = 18 THEN '18:00'
-        ELSE t.hour_index || ':00'
+        WHEN hour_index = 0 THEN '00:00'
+        WHEN hour_index = 6 THEN '06:00'
+        WHEN hour_index = 12 THEN '12:00'
+        WHEN hour_index = 18 THEN '18:00'
+        ELSE hour_index || ':00'
     END AS time_of_day,
-    COALESCE(t.temperature, 0) AS temperature,
-    COALESCE(h.humidity, 0) AS humidity,
-    COALESCE(s.sky_condition, 'unknown') AS sky_condition,
-    COALESCE(w.wind_direction, 'unknown') AS wind_direction,
-    COALESCE(w.wind_speed, 0) AS wind_speed
-FROM temperatures t
-LEFT JOIN humidity h ON t.extracted_at = h.extracted_at AND t.hour_index = h.hour_index AND t.forecast_date = h.forecast_date
-LEFT JOIN sky_conditions s ON t.extracted_at = s.extracted_at AND t.hour_index = s.hour_index AND t.forecast_date = s.forecast_date
-LEFT JOIN wind w ON t.extracted_at = w.extracted_at AND t.hour_index = w.hour_index AND t.forecast_date = w.forecast_date
+    COALESCE(temperature, 0) AS temperature,
+    COALESCE(humidity, 0) AS humidity,
+    COALESCE(sky_condition, 'unknown') AS sky_condition,
+    COALESCE(wind_direction, 'unknown') AS wind_direction,
+    COALESCE(wind_speed, 0) AS wind_speed
+FROM hours
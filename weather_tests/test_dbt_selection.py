@@ -0,0 +1,211 @@
+import logging
+from types import SimpleNamespace
+
+import pytest
+from dagster import AssetKey, AssetMaterialization, DagsterInstance, MetadataValue
+
+from weather.dbt_selection import (
+    combined_stream_records,
+    graph_width,
+    independent_subgraphs,
+    models_without_new_data,
+    plan_subgraph_runs,
+    records_by_stream,
+)
+
+SOURCES = {
+    "source.weather_project.raw.PALMA": {"source_name": "raw", "name": "PALMA"},
+    "source.weather_project.other.STATIONS": {"source_name": "other", "name": "STATIONS"},
+}
+
+
+def manifest(parents):
+    """A manifest with one model per entry of `parents`, reading from the given nodes."""
+    return {
+        "nodes": {
+            unique_id: {"resource_type": "model", "depends_on": {"nodes": depends_on}}
+            for unique_id, depends_on in parents.items()
+        },
+        "sources": SOURCES,
+    }
+
+
+STAGING = "model.weather_project.stg"
+MART = "model.weather_project.mart"
+MIXED = "model.weather_project.mixed"
+SEEDED = "model.weather_project.seeded"
+MANIFEST = manifest({
+    STAGING: ["source.weather_project.raw.PALMA"],
+    MART: [STAGING],
+    MIXED: [STAGING, "source.weather_project.other.STATIONS"],
+    SEEDED: [],
+})
+
+
+def test_records_by_stream_reads_the_sync_metadata():
+    metadata = {"total_records": MetadataValue.int(3), "records_PALMA": MetadataValue.int(3), "job_id": "1"}
+    assert records_by_stream(metadata) == {"palma": 3}
+
+
+def test_records_by_stream_without_counts():
+    assert records_by_stream({"job_id": "1"}) is None
+
+
+def test_models_on_streams_with_zero_records_are_skipped():
+    skipped = models_without_new_data(MANIFEST, [STAGING, MART], {"palma": 0})
+    assert set(skipped) == {STAGING, MART}
+    assert skipped[MART] == "No new records loaded into raw.PALMA"
+
+
+def test_models_with_new_records_are_built():
+    assert models_without_new_data(MANIFEST, [STAGING, MART], {"palma": 5}) == {}
+
+
+def test_a_stream_missing_from_the_counts_counts_as_changed():
+    assert models_without_new_data(MANIFEST, [STAGING, MART], {"forecast": 0}) == {}
+
+
+def test_models_reading_other_sources_or_none_are_built():
+    assert models_without_new_data(MANIFEST, [MIXED, SEEDED], {"palma": 0, "stations": 0}) == {}
+
+
+def test_combined_stream_records_sums_the_syncs():
+    assert combined_stream_records([{"palma": 5}, {"palma": 0}]) == {"palma": 5}
+    assert combined_stream_records([{"palma": 0}, {"palma": 0}]) == {"palma": 0}
+
+
+def test_combined_stream_records_of_a_sync_without_counts():
+    assert combined_stream_records([{"palma": 0}, None]) is None
+
+
+def test_combined_stream_records_drops_streams_missing_from_a_sync():
+    assert combined_stream_records([{"palma": 0, "forecast": 0}, {"palma": 0}]) == {"palma": 0}
+
+
+
+def model_id(name):
+    return f"model.weather_project.{name}"
+
+
+# a -> (a_left, a_right) -> a_join, b alone, c_1 and c_2 only joined by a relationships test
+SUBGRAPHS = manifest({
+    model_id("a"): ["source.weather_project.raw.PALMA"],
+    model_id("a_left"): [model_id("a")],
+    model_id("a_right"): [model_id("a")],
+    model_id("a_join"): [model_id("a_left"), model_id("a_right")],
+    model_id("b"): ["source.weather_project.raw.PALMA"],
+    model_id("c_1"): ["source.weather_project.raw.PALMA"],
+    model_id("c_2"): ["source.weather_project.other.STATIONS"],
+})
+SUBGRAPHS["nodes"]["test.weather_project.relationships_c_2"] = {
+    "resource_type": "test",
+    "depends_on": {"nodes": [model_id("c_1"), model_id("c_2")]},
+}
+GROUP_A = [model_id(name) for name in ("a", "a_left", "a_right", "a_join")]
+GROUP_C = [model_id("c_1"), model_id("c_2")]
+
+
+def test_independent_subgraphs_largest_first():
+    groups = independent_subgraphs(SUBGRAPHS, [unique_id for unique_id in SUBGRAPHS["nodes"] if unique_id.startswith("model.")])
+    assert [sorted(group) for group in groups] == [sorted(GROUP_A), sorted(GROUP_C), [model_id("b")]]
+
+
+def test_a_test_reading_two_models_keeps_them_together():
+    assert [sorted(group) for group in independent_subgraphs(SUBGRAPHS, GROUP_C)] == [sorted(GROUP_C)]
+
+
+def test_models_left_out_do_not_join_their_neighbours():
+    # Without a_left and a_right, nothing selected links a to a_join
+    groups = independent_subgraphs(SUBGRAPHS, [model_id("a"), model_id("a_join")])
+    assert sorted(groups) == [[model_id("a")], [model_id("a_join")]]
+
+
+def test_graph_width_is_the_widest_level():
+    assert graph_width(SUBGRAPHS, GROUP_A) == 2
+    assert graph_width(SUBGRAPHS, [model_id("a")]) == 1
+    assert graph_width(SUBGRAPHS, []) == 1
+
+
+def test_subgraph_runs_get_threads_up_to_their_width():
+    model_ids = [*GROUP_A, model_id("b"), *GROUP_C]
+    runs = plan_subgraph_runs(SUBGRAPHS, model_ids, max_threads=4)
+    assert [(sorted(group), threads) for group, threads in runs] == [
+        (sorted(GROUP_A), 2),
+        (sorted(GROUP_C), 2),
+        ([model_id("b")], 1),
+    ]
+    assert sorted(unique_id for group, _ in runs for unique_id in group) == sorted(model_ids)
+
+
+def test_subgraph_runs_stay_within_max_threads():
+    assert [threads for _, threads in plan_subgraph_runs(SUBGRAPHS, GROUP_A, max_threads=1)] == [1]
+
+
+class TestPlanSkippedModels:
+    """`plan_skipped_models` against the syncs and builds recorded in a Dagster instance."""
+
+    @pytest.fixture
+    def dbt(self):
+        from weather import dbt
+
+        return dbt
+
+    @pytest.fixture
+    def instance(self):
+        with DagsterInstance.ephemeral() as instance:
+            yield instance
+
+    @pytest.fixture
+    def model(self, dbt):
+        return next(
+            unique_id for unique_id, node in dbt.manifest_data["nodes"].items()
+            if node["resource_type"] == "model" and node["name"] == "stg_weather_current"
+        )
+
+    def plan(self, dbt, instance, model, keep=frozenset()):
+        context = SimpleNamespace(
+            instance=instance,
+            assets_def=SimpleNamespace(partitions_def=None),
+            log=logging.getLogger(__name__),
+        )
+        return dbt.plan_skipped_models(context, [model], set(keep))
+
+    def sync(self, dbt, instance, records):
+        metadata = {} if records is None else {"total_records": records, "records_PALMA": records}
+        instance.report_runless_asset_event(AssetMaterialization(dbt.AIRBYTE_SYNC_ASSET_KEY, metadata=metadata))
+
+    def build(self, instance, model):
+        instance.report_runless_asset_event(AssetMaterialization(AssetKey(model.split(".")[-1])))
+
+    def test_a_model_never_built_is_built(self, dbt, instance, model):
+        self.sync(dbt, instance, 0)
+        assert self.plan(dbt, instance, model) == {}
+
+    def test_skipped_when_every_sync_since_its_build_loaded_nothing(self, dbt, instance, model):
+        self.build(instance, model)
+        self.sync(dbt, instance, 0)
+        self.sync(dbt, instance, 0)
+        assert set(self.plan(dbt, instance, model)) == {model}
+
+    def test_built_when_an_earlier_sync_since_its_build_loaded_records(self, dbt, instance, model):
+        # The build after the first sync failed, so its 5 records are still to load
+        self.build(instance, model)
+        self.sync(dbt, instance, 5)
+        self.sync(dbt, instance, 0)
+        assert self.plan(dbt, instance, model) == {}
+
+    def test_built_when_a_sync_since_has_no_counts(self, dbt, instance, model):
+        self.build(instance, model)
+        self.sync(dbt, instance, None)
+        self.sync(dbt, instance, 0)
+        assert self.plan(dbt, instance, model) == {}
+
+    def test_built_without_a_sync_since_its_build(self, dbt, instance, model):
+        self.sync(dbt, instance, 0)
+        self.build(instance, model)
+        assert self.plan(dbt, instance, model) == {}
+
+    def test_models_to_keep_are_never_skipped(self, dbt, instance, model):
+        self.build(instance, model)
+        self.sync(dbt, instance, 0)
+        assert self.plan(dbt, instance, model, keep={model}) == {}
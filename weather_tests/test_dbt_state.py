@@ -0,0 +1,209 @@
+import copy
+import logging
+from types import SimpleNamespace
+
+import pytest
+from dagster import AssetMaterialization, DagsterInstance, Output
+
+from weather.dbt_state import (
+    FINGERPRINT_METADATA_KEY,
+    FailedBuildStore,
+    changed_models,
+    model_fingerprint,
+    node_statuses,
+    retryable_nodes,
+    reusable_models,
+)
+
+INCREMENTAL = "model.weather_project.incremental"
+TABLE = "model.weather_project.table"
+
+
+def node(materialized="incremental", sql="abc123", **config):
+    return {
+        "resource_type": "model",
+        "checksum": {"name": "sha256", "checksum": sql},
+        "columns": {"city": {"name": "city", "data_type": "varchar"}},
+        "config": {"materialized": materialized, "unique_key": "city", **config},
+    }
+
+
+@pytest.fixture
+def manifest():
+    return {"nodes": {INCREMENTAL: node(), TABLE: node(materialized="table")}}
+
+
+def test_fingerprint_is_stable():
+    assert model_fingerprint(node()) == model_fingerprint(node())
+
+
+@pytest.mark.parametrize("change", [
+    lambda model: model["checksum"].update(checksum="def456"),
+    lambda model: model["columns"]["city"].update(data_type="integer"),
+    lambda model: model["columns"].update(country={"name": "country", "data_type": "varchar"}),
+    lambda model: model["config"].update(unique_key=["city", "date"]),
+    lambda model: model["config"].update(incremental_strategy="delete+insert"),
+], ids=["sql", "column type", "new column", "unique key", "strategy"])
+def test_fingerprint_changes_with_the_table_shape(change):
+    model = node()
+    change(model)
+    assert model_fingerprint(model) != model_fingerprint(node())
+
+
+def test_fingerprint_ignores_config_that_keeps_the_table():
+    assert model_fingerprint(node(tags=["daily"], docs={"show": False})) == model_fingerprint(node())
+
+
+def test_changed_incremental_model(manifest):
+    recorded = {INCREMENTAL: model_fingerprint(manifest["nodes"][INCREMENTAL])}
+    manifest["nodes"][INCREMENTAL]["checksum"]["checksum"] = "def456"
+    assert changed_models(manifest, [INCREMENTAL], recorded) == [INCREMENTAL]
+
+
+def test_unchanged_incremental_model(manifest):
+    recorded = {INCREMENTAL: model_fingerprint(manifest["nodes"][INCREMENTAL])}
+    assert changed_models(manifest, [INCREMENTAL], recorded) == []
+
+
+def test_a_model_without_a_recorded_fingerprint_is_not_changed(manifest):
+    assert changed_models(manifest, [INCREMENTAL, TABLE], {}) == []
+
+
+def test_only_incremental_models_are_changed(manifest):
+    recorded = {TABLE: "an older fingerprint"}
+    assert changed_models(manifest, [TABLE], recorded) == []
+
+
+class TestFingerprintMetadata:
+    """Fingerprints travel through the metadata of each model's materialization."""
+
+    @pytest.fixture
+    def dbt(self):
+        from weather import dbt
+
+        return dbt
+
+    @pytest.fixture
+    def model(self, dbt):
+        return next(
+            unique_id for unique_id, node in dbt.manifest_data["nodes"].items()
+            if node["resource_type"] == "model" and node["name"] == "stg_weather_current"
+        )
+
+    def materialize(self, dbt, instance, model):
+        output = dbt.with_fingerprint(Output(None, output_name="stg_weather_current", metadata={"unique_id": model}))
+        asset_key = dbt.WeatherDbtTranslator().get_asset_key(dbt.manifest_data["nodes"][model])
+        instance.report_runless_asset_event(AssetMaterialization(asset_key, metadata=output.metadata))
+
+    def recorded(self, dbt, instance, model):
+        context = SimpleNamespace(instance=instance, log=logging.getLogger(__name__))
+        return dbt.recorded_fingerprints(context, dbt.WeatherDbtTranslator(), [model])
+
+    def test_outputs_carry_the_model_fingerprint(self, dbt, model):
+        output = dbt.with_fingerprint(Output(None, output_name="stg_weather_current", metadata={"unique_id": model}))
+        assert output.metadata[FINGERPRINT_METADATA_KEY].value == model_fingerprint(dbt.manifest_data["nodes"][model])
+
+    def test_other_events_are_left_alone(self, dbt):
+        output = Output(None, output_name="other", metadata={"unique_id": "model.other_project.other"})
+        assert dbt.with_fingerprint(output) is output
+
+    def test_a_change_since_the_last_build_is_detected(self, dbt, model):
+        with DagsterInstance.ephemeral() as instance:
+            self.materialize(dbt, instance, model)
+            recorded = self.recorded(dbt, instance, model)
+
+        assert changed_models(dbt.manifest_data, [model], recorded) == []
+        manifest = copy.deepcopy(dbt.manifest_data)
+        manifest["nodes"][model]["config"]["unique_key"] = ["city", "observed_at"]
+        assert changed_models(manifest, [model], recorded) == [model]
+
+    def test_a_model_never_built_has_no_fingerprint(self, dbt, model):
+        with DagsterInstance.ephemeral() as instance:
+            assert self.recorded(dbt, instance, model) == {}
+
+
+STAGING = "model.weather_project.stg"
+MART = "model.weather_project.mart"
+OTHER = "model.weather_project.other"
+STAGING_TEST = "test.weather_project.not_null_stg_city.1"
+MART_TEST = "test.weather_project.not_null_mart_city.2"
+JOIN_TEST = "test.weather_project.assert_mart_covers_other.3"
+RETRY_MANIFEST = {
+    "nodes": {
+        STAGING: {"resource_type": "model"},
+        MART: {"resource_type": "model"},
+        OTHER: {"resource_type": "model"},
+        STAGING_TEST: {"resource_type": "test", "attached_node": STAGING, "depends_on": {"nodes": [STAGING]}},
+        MART_TEST: {"resource_type": "test", "attached_node": MART, "depends_on": {"nodes": [MART]}},
+        # A singular test is attached to no model, it is retried with every model it reads
+        JOIN_TEST: {"resource_type": "test", "depends_on": {"nodes": [MART, OTHER]}},
+    },
+}
+MODELS = [STAGING, MART, OTHER]
+
+
+def run_results(statuses):
+    return {"results": [{"unique_id": unique_id, "status": status} for unique_id, status in statuses.items()]}
+
+
+def test_failed_builds_are_recorded_per_key(tmp_path):
+    store = FailedBuildStore(tmp_path / "failed_builds.json")
+    store.record("weather_project_dbt_assets", "run-1", {STAGING: "error"})
+    store.record("weather_daily_marts[2024-01-01..2024-01-02)", "run-2", {MART: "fail"})
+
+    store.clear("weather_project_dbt_assets")
+
+    assert store.load("weather_project_dbt_assets") is None
+    assert store.load("weather_daily_marts[2024-01-01..2024-01-02)") == {"run_id": "run-2", "statuses": {MART: "fail"}}
+
+
+def test_clearing_a_key_never_recorded_writes_nothing(tmp_path):
+    store = FailedBuildStore(tmp_path / "failed_builds.json")
+    store.clear("weather_project_dbt_assets")
+    assert not (tmp_path / "failed_builds.json").exists()
+
+
+def test_models_that_failed_or_were_skipped_are_retried():
+    statuses = {STAGING: "success", MART: "error", OTHER: "skipped"}
+    assert reusable_models(RETRY_MANIFEST, MODELS, statuses) == [STAGING]
+
+
+def test_a_model_whose_test_failed_is_retried():
+    statuses = {STAGING: "success", MART: "success", OTHER: "success", STAGING_TEST: "fail", MART_TEST: "pass"}
+    assert reusable_models(RETRY_MANIFEST, MODELS, statuses) == [MART, OTHER]
+
+
+def test_a_failed_singular_test_retries_every_model_it_reads():
+    statuses = {STAGING: "success", MART: "success", OTHER: "success", JOIN_TEST: "fail"}
+    assert reusable_models(RETRY_MANIFEST, MODELS, statuses) == [STAGING]
+
+
+def test_models_missing_from_the_failed_build_are_built():
+    assert reusable_models(RETRY_MANIFEST, MODELS, {STAGING: "success", MART: "error"}) == [STAGING]
+
+
+class TestRetryRecordClearing:
+    """A retry starts from the failed build's statuses and updates them with the nodes it ran.
+
+    The failed build is cleared only once nothing is left to retry.
+    """
+
+    failed = {STAGING: "success", STAGING_TEST: "pass", MART: "error", MART_TEST: "skipped", OTHER: "success"}
+
+    def after_retry(self, ran):
+        statuses = dict(self.failed)
+        statuses.update(node_statuses(run_results(ran)))
+        return statuses
+
+    def test_cleared_when_the_retried_nodes_pass(self):
+        assert retryable_nodes(self.after_retry({MART: "success", MART_TEST: "pass"})) == []
+
+    def test_kept_when_a_retried_node_fails_again(self):
+        assert retryable_nodes(self.after_retry({MART: "success", MART_TEST: "fail"})) == [MART_TEST]
+
+    def test_kept_when_the_retried_nodes_did_not_run(self):
+        # Only the nodes that already passed ran, the failed model was left out
+        assert sorted(retryable_nodes(self.after_retry({STAGING: "success", STAGING_TEST: "pass"}))) == [MART, MART_TEST]
+
+    def test_kept_when_nothing_ran(self):
+        assert sorted(retryable_nodes(self.after_retry({}))) == [MART, MART_TEST]
@@ -0,0 +1,71 @@
+import json
+
+import pytest
+
+from weather.constants import DBT_PROJECT_DIR
+from weather.manifest_generator import generate_manifest
+
+dbt_main = pytest.importorskip("dbt.cli.main", reason="dbt-core is not installed")
+
+
+@pytest.fixture(scope="module")
+def parsed(tmp_path_factory):
+    """The manifest `dbt parse` writes for the project, on the offline duckdb target."""
+    tmp_path = tmp_path_factory.mktemp("dbt_parse")
+    result = dbt_main.dbtRunner().invoke([
+        "parse",
+        "--project-dir", DBT_PROJECT_DIR,
+        "--profiles-dir", DBT_PROJECT_DIR,
+        "--target", "duckdb",
+        "--target-path", str(tmp_path / "target"),
+        "--log-path", str(tmp_path / "logs"),
+        "--quiet",
+    ])
+    if not result.success:
+        pytest.skip(f"dbt parse failed: {result.exception!r}")
+    return json.loads((tmp_path / "target" / "manifest.json").read_text())
+
+
+@pytest.fixture(scope="module")
+def generated():
+    return generate_manifest()
+
+
+def nodes_of_type(manifest, resource_type):
+    return {
+        unique_id: node for unique_id, node in manifest["nodes"].items()
+        if node["resource_type"] == resource_type
+    }
+
+
+def test_same_models(parsed, generated):
+    assert set(nodes_of_type(generated, "model")) == set(nodes_of_type(parsed, "model"))
+
+
+def test_same_model_checksums(parsed, generated):
+    parsed_models = nodes_of_type(parsed, "model")
+    for unique_id, node in nodes_of_type(generated, "model").items():
+        assert node["checksum"] == parsed_models[unique_id]["checksum"], unique_id
+
+
+def test_same_test_ids(parsed, generated):
+    assert set(nodes_of_type(generated, "test")) == set(nodes_of_type(parsed, "test"))
+
+
+def test_tests_attach_to_the_same_models(parsed, generated):
+    parsed_tests = nodes_of_type(parsed, "test")
+    for unique_id, node in nodes_of_type(generated, "test").items():
+        assert node["attached_node"] == parsed_tests[unique_id]["attached_node"], unique_id
+        assert node["alias"] == parsed_tests[unique_id]["alias"], unique_id
+
+
+def test_same_sources(parsed, generated):
+    assert set(generated["sources"]) == set(parsed["sources"])
+
+
+def test_same_model_dependencies(parsed, generated):
+    parsed_models = nodes_of_type(parsed, "model")
+    for unique_id, node in nodes_of_type(generated, "model").items():
+        # The `palma` seed stands in for raw.PALMA on the duckdb target only
+        parsed_parents = [parent for parent in parsed_models[unique_id]["depends_on"]["nodes"] if not parent.startswith("seed.")]
+        assert sorted(node["depends_on"]["nodes"]) == sorted(parsed_parents), unique_id
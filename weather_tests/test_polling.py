@@ -0,0 +1,154 @@
+import asyncio
+import logging
+
+import pytest
+from dagster import Failure
+
+from weather import airbyte_async, polling
+from weather.airbyte_async import wait_for_job_async
+from weather.polling import PollingConfig, wait_for_job
+
+log = logging.getLogger(__name__)
+
+
+class FakeClock:
+    """Stands in for the `time` module: sleeping only moves the clock forward."""
+
+    def __init__(self):
+        self.now = 1_000_000.0
+        self.sleeps = []
+
+    def time(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+class FakeAirbyte:
+    """Answers `get_job` from a list of statuses or exceptions, then keeps repeating the last one."""
+
+    def __init__(self, clock, replies):
+        self.clock = clock
+        self.replies = list(replies)
+        self.cancelled = []
+        self.cancel_error = None
+
+    def get_job(self, job_id):
+        reply = self.replies.pop(0) if len(self.replies) > 1 else self.replies[0]
+        if isinstance(reply, Exception):
+            raise reply
+        return {"id": job_id, "status": reply, "updatedAt": self.clock.now}
+
+    def cancel_job(self, job_id):
+        self.cancelled.append(job_id)
+        if self.cancel_error is not None:
+            raise self.cancel_error
+        return {"id": job_id, "status": "cancelled"}
+
+
+class FakeAsyncAirbyte:
+    def __init__(self, airbyte):
+        self.airbyte = airbyte
+
+    async def get_job(self, job_id):
+        return self.airbyte.get_job(job_id)
+
+    async def cancel_job(self, job_id):
+        return self.airbyte.cancel_job(job_id)
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(polling, "time", clock)
+    return clock
+
+
+def config(**overrides):
+    return PollingConfig(**{"first_poll_seconds": 1.0, "backoff_factor": 2.0, "max_poll_interval_seconds": 5.0,
+                            "jitter_ratio": 0.0, **overrides})
+
+
+def test_backs_off_up_to_the_max_interval(clock):
+    airbyte = FakeAirbyte(clock, ["running"] * 5 + ["succeeded"])
+
+    job_info, stats = wait_for_job(airbyte, 7, config(), log)
+
+    assert job_info["status"] == "succeeded"
+    assert clock.sleeps == [1.0, 2.0, 4.0, 5.0, 5.0, 5.0]
+    assert stats.polls == 6
+    assert stats.waited_seconds == sum(clock.sleeps)
+
+
+def test_initial_wait_replaces_the_first_interval(clock):
+    airbyte = FakeAirbyte(clock, ["running", "succeeded"])
+
+    wait_for_job(airbyte, 7, config(), log, initial_wait_seconds=30.0)
+
+    assert clock.sleeps == [30.0, 1.0]
+
+
+def test_jitter_stays_within_its_ratio(clock):
+    airbyte = FakeAirbyte(clock, ["running"] * 20 + ["succeeded"])
+
+    wait_for_job(airbyte, 7, config(jitter_ratio=0.2, max_poll_interval_seconds=1.0, backoff_factor=1.0), log)
+
+    assert all(0.8 <= seconds <= 1.2 for seconds in clock.sleeps)
+
+
+def test_timeout_cancels_the_job(clock):
+    airbyte = FakeAirbyte(clock, ["running"])
+
+    with pytest.raises(Failure, match="did not finish within 10.0 seconds"):
+        wait_for_job(airbyte, 7, config(timeout_seconds=10.0), log)
+
+    assert airbyte.cancelled == [7]
+    # The last wait is cut short at the deadline
+    assert sum(clock.sleeps) == pytest.approx(10.0)
+
+
+def test_timeout_fails_even_when_cancelling_fails(clock):
+    airbyte = FakeAirbyte(clock, ["running"])
+    airbyte.cancel_error = RuntimeError("HTTP 500")
+
+    with pytest.raises(Failure, match="did not finish"):
+        wait_for_job(airbyte, 7, config(timeout_seconds=10.0), log)
+
+    assert airbyte.cancelled == [7]
+
+
+def test_gives_up_after_consecutive_errors(clock):
+    airbyte = FakeAirbyte(clock, [RuntimeError("HTTP 502")])
+
+    with pytest.raises(Failure, match="after 3 consecutive errors") as raised:
+        wait_for_job(airbyte, 7, config(max_consecutive_errors=3), log)
+
+    assert raised.value.metadata["poll_errors"].value == 3
+    assert airbyte.cancelled == []
+
+
+def test_a_successful_poll_resets_the_error_count(clock):
+    error = RuntimeError("HTTP 502")
+    airbyte = FakeAirbyte(clock, [error, error, "running", error, error, "succeeded"])
+
+    job_info, stats = wait_for_job(airbyte, 7, config(max_consecutive_errors=3), log)
+
+    assert job_info["status"] == "succeeded"
+    assert stats.errors == 4
+    assert stats.polls == 2
+
+
+def test_async_wait_runs_the_same_loop(clock, monkeypatch):
+    async def sleep(seconds):
+        clock.sleep(seconds)
+
+    monkeypatch.setattr(airbyte_async.asyncio, "sleep", sleep)
+    airbyte = FakeAirbyte(clock, ["running"])
+
+    with pytest.raises(Failure, match="did not finish within 10.0 seconds"):
+        asyncio.run(wait_for_job_async(FakeAsyncAirbyte(airbyte), 7, config(timeout_seconds=10.0), log))
+
+    assert airbyte.cancelled == [7]
+    assert clock.sleeps[:4] == [1.0, 2.0, 4.0, 3.0]